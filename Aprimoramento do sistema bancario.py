@@ -1,4 +1,15 @@
+import json
+import os
+import random
+import sys
 import textwrap
+import time
+from contextlib import redirect_stdout
+
+import diario
+from dinheiro import Dinheiro
+
+CAMINHO_DIARIO = "sistema_bancario.diario"
 
 def menu():    
     menu_texto = """
@@ -15,10 +26,23 @@ def menu():
 => """   
     return input(textwrap.dedent(menu_texto))
 
+class EstadoConta:
+    # Saldo, extrato e saques de uma conta; __slots__ mantém cada registro enxuto
+    __slots__ = ("saldo", "extrato", "numero_saques")
+
+    def __init__(self):
+        self.saldo = Dinheiro()
+        self.extrato = []
+        self.numero_saques = 0
+
 def depositar(saldo, valor, extrato, /):    
+    try:
+        valor = Dinheiro(valor)
+    except ValueError:
+        valor = Dinheiro()  # inf, nan: cai na mensagem de valor inválido
     if valor > 0:
         saldo += valor
-        extrato += f"Depósito:\tR$ {valor:.2f}\n"
+        extrato.append(("Depósito:\t", valor))
         print("\nDepósito realizado com sucesso!")
     else:
         print("\nOperação falhou! O valor informado é inválido.")
@@ -26,6 +50,10 @@ def depositar(saldo, valor, extrato, /):
     return saldo, extrato
 
 def sacar(*, saldo, valor, extrato, limite, numero_saques, limite_saques):  
+    try:
+        valor = Dinheiro(valor)
+    except ValueError:
+        valor = Dinheiro()  # inf, nan: cai na mensagem de valor inválido
     excedeu_saldo = valor > saldo
     excedeu_limite = valor > limite
     excedeu_saques = numero_saques >= limite_saques
@@ -38,7 +66,7 @@ def sacar(*, saldo, valor, extrato, limite, numero_saques, limite_saques):
         print("\nOperação falhou! Número máximo de saques excedido.")
     elif valor > 0:
         saldo -= valor
-        extrato += f"Saque:\t\tR$ {valor:.2f}\n"
+        extrato.append(("Saque:\t\t", valor))
         numero_saques += 1
         print("\nSaque realizado com sucesso!")
     else:
@@ -46,11 +74,25 @@ def sacar(*, saldo, valor, extrato, limite, numero_saques, limite_saques):
     
     return saldo, extrato, numero_saques
 
-def exibir_extrato(saldo, /, *, extrato):    
-    print("\n---------------- EXTRATO ----------------")
-    print("Não foram realizadas movimentações." if not extrato else extrato)
-    print(f"\nSaldo:\t\tR$ {saldo:.2f}")
-    print("-----------------------------------------")
+def paginar_extrato(extrato, tamanho_pagina=1000):
+    # O extrato é uma lista de lançamentos (só recebe append); cada página é
+    # formatada apenas quando chega a vez dela
+    for inicio in range(0, len(extrato), tamanho_pagina):
+        yield "".join(
+            f"{rotulo}R$ {valor:.2f}\n" for rotulo, valor in extrato[inicio:inicio + tamanho_pagina]
+        )
+
+def exibir_extrato(saldo, /, *, extrato, arquivo=None, tamanho_pagina=1000):    
+    arquivo = arquivo or sys.stdout
+    arquivo.write("\n---------------- EXTRATO ----------------\n")
+    if not extrato:
+        arquivo.write("Não foram realizadas movimentações.\n")
+    else:
+        for pagina in paginar_extrato(extrato, tamanho_pagina):
+            arquivo.write(pagina)
+        arquivo.write("\n")
+    arquivo.write(f"\nSaldo:\t\tR$ {saldo:.2f}\n")
+    arquivo.write("-----------------------------------------\n")
 
 def criar_usuario(usuarios):    
     cpf = input("Informe o CPF (somente número): ")
@@ -64,26 +106,55 @@ def criar_usuario(usuarios):
     data_nascimento = input("Informe a data de nascimento (dd-mm-aaaa): ")
     endereco = input("Informe o endereço (logradouro, nro - bairro - cidade/sigla estado): ")
 
-    usuarios.append({"nome": nome, "data_nascimento": data_nascimento, "cpf": cpf, "endereco": endereco})
+    cpf = normalizar_cpf(cpf)
+    usuarios[cpf] = {"nome": nome, "data_nascimento": data_nascimento, "cpf": cpf, "endereco": endereco}
     print("\nUsuário criado com sucesso!")
+    return usuarios[cpf]
+
+def normalizar_cpf(cpf):
+    # "111.222.333-44" e "11122233344" viram a mesma chave
+    return "".join(filter(str.isdigit, cpf))
 
 def filtrar_usuario(cpf, usuarios):   
-    usuarios_filtrados = [usuario for usuario in usuarios if usuario["cpf"] == cpf]
-    return usuarios_filtrados[0] if usuarios_filtrados else None
+    # usuarios é um dicionário indexado pelo CPF normalizado: busca O(1)
+    return usuarios.get(normalizar_cpf(cpf))
+
+def importar_usuarios(registros, usuarios):
+    # Cadastro em massa; CPFs já existentes são ignorados
+    importados = 0
+    for registro in registros:
+        cpf = normalizar_cpf(registro["cpf"])
+        if cpf not in usuarios:
+            usuarios[cpf] = {**registro, "cpf": cpf}
+            importados += 1
+    return importados
 
-def criar_conta(agencia, numero_conta, usuarios, contas):   
+def indexar_contas(contas):
+    # Índice secundário: CPF do titular -> contas do titular
+    contas_por_usuario = {}
+    for conta in contas:
+        contas_por_usuario.setdefault(conta["usuario"]["cpf"], []).append(conta)
+    return contas_por_usuario
+
+def criar_conta(agencia, numero_conta, usuarios, contas, contas_por_usuario):   
     cpf = input("Informe o CPF do usuário: ")
     usuario = filtrar_usuario(cpf, usuarios)
 
     if usuario:
-        contas.append({"agencia": agencia, "numero_conta": numero_conta, "usuario": usuario})
+        conta = {"agencia": agencia, "numero_conta": numero_conta, "usuario": usuario}
+        contas.append(conta)
+        contas_por_usuario.setdefault(usuario["cpf"], []).append(conta)
         print("\nConta criada com sucesso!")
         return True
     
     print("\nUsuário não encontrado, fluxo de criação de conta encerrado!")
     return False
 
-def listar_contas(contas):    
+def listar_contas(contas, cpf=None, contas_por_usuario=None):    
+    if cpf:
+        # Somente as contas do titular, direto pelo índice
+        contas = contas_por_usuario.get(normalizar_cpf(cpf), [])
+
     if not contas:
         print("\nNenhuma conta cadastrada.")
         return
@@ -99,62 +170,220 @@ def listar_contas(contas):
         print("-----------------------------------------")
 
 
+def selecionar_conta(estados):
+    # estados é um dicionário numero_conta -> EstadoConta: acesso O(1)
+    try:
+        numero_conta = int(input("Informe o número da conta: "))
+    except ValueError:
+        numero_conta = None
+
+    estado = estados.get(numero_conta)
+    if estado is None:
+        print("\nConta não encontrada!")
+    return numero_conta, estado
+
+def restaurar_do_diario(caminho, agencia, usuarios, contas, contas_por_usuario, estados):
+    # Relê o diário e refaz usuários, contas, saldos e extratos; saques de hoje voltam a contar no limite.
+    # Cada usuário é gravado antes das contas dele, então já existe quando a abertura é relida
+    hoje = time.localtime()[:3]
+    for registro in diario.reproduzir(caminho):
+        if registro.tipo == diario.USUARIO:
+            importar_usuarios([json.loads(registro.texto)], usuarios)
+            continue
+
+        numero_conta = int(registro.conta)
+        valor = Dinheiro.de_centavos(registro.centavos)
+        if registro.tipo == diario.ABERTURA:
+            usuario = usuarios.get(registro.texto)
+            if usuario and numero_conta not in estados:
+                conta = {"agencia": agencia, "numero_conta": numero_conta, "usuario": usuario}
+                contas.append(conta)
+                contas_por_usuario.setdefault(usuario["cpf"], []).append(conta)
+            estados.setdefault(numero_conta, EstadoConta())
+            continue
+
+        estado = estados.setdefault(numero_conta, EstadoConta())
+        if registro.tipo == diario.DEPOSITO:
+            estado.saldo += valor
+            estado.extrato.append(("Depósito:\t", valor))
+        elif registro.tipo == diario.SAQUE:
+            estado.saldo -= valor
+            estado.extrato.append(("Saque:\t\t", valor))
+            if time.localtime(registro.instante / 1e9)[:3] == hoje:
+                estado.numero_saques += 1
+
 def main():    
     LIMITE_SAQUES = 3
     AGENCIA = "0001"
     
-    usuarios = [
+    usuarios = {}
+    importar_usuarios([
         {"nome": "Elara Vance", "data_nascimento": "01-01-1700", "cpf": "11122233344", "endereco": "Torre-Biblioteca de Ébano, Vale das Estrelas Cadentes"},
         {"nome": "Jax", "data_nascimento": "25-07-2045", "cpf": "55566677788", "endereco": "Setor 3, Docas do Porto Digital - Recife/PE - 2077"},
         {"nome": "Isadora Montenegro", "data_nascimento": "15-03-1905", "cpf": "99988877766", "endereco": "Livraria Montenegro, Rua da Aurora - Recife/PE - 1932"}
-    ]
+    ], usuarios)
     
     contas = [
-        {"agencia": AGENCIA, "numero_conta": 1, "usuario": usuarios[0]}, 
-        {"agencia": AGENCIA, "numero_conta": 2, "usuario": usuarios[1]},
-        {"agencia": AGENCIA, "numero_conta": 3, "usuario": usuarios[2]}  
+        {"agencia": AGENCIA, "numero_conta": 1, "usuario": usuarios["11122233344"]}, 
+        {"agencia": AGENCIA, "numero_conta": 2, "usuario": usuarios["55566677788"]},
+        {"agencia": AGENCIA, "numero_conta": 3, "usuario": usuarios["99988877766"]}  
     ]
+    contas_por_usuario = indexar_contas(contas)
+    estados = {conta["numero_conta"]: EstadoConta() for conta in contas}
+    restaurar_do_diario(CAMINHO_DIARIO, AGENCIA, usuarios, contas, contas_por_usuario, estados)
+    # Toda operação bem-sucedida é gravada (e sincronizada) no diário antes de mudar a conta
+    registro = diario.Diario(CAMINHO_DIARIO)
     
-    saldo = 0 
-    limite = 500
-    extrato = ""
-    numero_saques = 0
+    limite = Dinheiro(500)
     while True:
         opcao = menu()
 
         if opcao == "d":
-            valor = float(input("Informe o valor do depósito: "))
-            saldo, extrato = depositar(saldo, valor, extrato)
+            numero_conta, estado = selecionar_conta(estados)
+            if estado:
+                valor = float(input("Informe o valor do depósito: "))
+                # O lançamento vai para um extrato à parte e só entra na conta depois de gravado
+                saldo, lancamentos = depositar(estado.saldo, valor, [])
+                if saldo != estado.saldo:
+                    registro.registrar(diario.DEPOSITO, numero_conta, (saldo - estado.saldo).centavos)
+                estado.saldo = saldo
+                estado.extrato.extend(lancamentos)
 
         elif opcao == "s":
-            valor = float(input("Informe o valor do saque: "))
-            saldo, extrato, numero_saques = sacar(
-                saldo=saldo,
-                valor=valor,
-                extrato=extrato,
-                limite=limite,
-                numero_saques=numero_saques,
-                limite_saques=LIMITE_SAQUES,
-            )
+            numero_conta, estado = selecionar_conta(estados)
+            if estado:
+                valor = float(input("Informe o valor do saque: "))
+                saldo, lancamentos, numero_saques = sacar(
+                    saldo=estado.saldo,
+                    valor=valor,
+                    extrato=[],
+                    limite=limite,
+                    numero_saques=estado.numero_saques,
+                    limite_saques=LIMITE_SAQUES,
+                )
+                if saldo != estado.saldo:
+                    registro.registrar(diario.SAQUE, numero_conta, (estado.saldo - saldo).centavos)
+                estado.saldo, estado.numero_saques = saldo, numero_saques
+                estado.extrato.extend(lancamentos)
 
         elif opcao == "e":
-            exibir_extrato(saldo, extrato=extrato)
+            _, estado = selecionar_conta(estados)
+            if estado:
+                exibir_extrato(estado.saldo, extrato=estado.extrato)
 
         elif opcao == "nu":
-            criar_usuario(usuarios)
+            usuario = criar_usuario(usuarios)
+            if usuario:
+                registro.registrar(diario.USUARIO, usuario["cpf"], 0, json.dumps(usuario, ensure_ascii=False))
 
         elif opcao == "nc":
-            numero_conta = len(contas) + 1
-            criar_conta(AGENCIA, numero_conta, usuarios, contas)
+            numero_conta = len(estados) + 1
+            if criar_conta(AGENCIA, numero_conta, usuarios, contas, contas_por_usuario):
+                estados[numero_conta] = EstadoConta()
+                registro.registrar(diario.ABERTURA, numero_conta, 0, contas[-1]["usuario"]["cpf"])
 
         elif opcao == "lc":
-            listar_contas(contas)
+            cpf = input("Informe o CPF do titular (vazio para todas): ")
+            listar_contas(contas, cpf, contas_por_usuario)
 
         elif opcao == "q":
             print("\nSaindo do sistema... Obrigado por usar nosso banco!\n")
+            registro.fechar()
             break
 
         else:
             print("\nOperação inválida, por favor selecione novamente a operação desejada.")
-                     
-main()
\ No newline at end of file
+
+def benchmark_cadastro():
+    # Importa 1.000.000 de usuários e abre uma conta para cada um pelo índice
+    quantidade = 1_000_000
+    registros = (
+        {"nome": f"Cliente {i}", "data_nascimento": "01-01-2000", "cpf": f"{i:011d}", "endereco": "-"}
+        for i in range(quantidade)
+    )
+    usuarios = {}
+    inicio = time.perf_counter()
+    importar_usuarios(registros, usuarios)
+    print(f"importar {quantidade:,} usuários:\t{time.perf_counter() - inicio:.2f} s")
+
+    contas = []
+    contas_por_usuario = {}
+    inicio = time.perf_counter()
+    for numero_conta in range(1, quantidade + 1):
+        cpf = f"{numero_conta - 1:011d}"
+        if numero_conta % 2:
+            cpf = f"{cpf[:3]}.{cpf[3:6]}.{cpf[6:9]}-{cpf[9:]}"  # metade no formato com pontuação
+        usuario = filtrar_usuario(cpf, usuarios)
+        if usuario:
+            conta = {"agencia": "0001", "numero_conta": numero_conta, "usuario": usuario}
+            contas.append(conta)
+            contas_por_usuario.setdefault(usuario["cpf"], []).append(conta)
+    print(f"abrir {len(contas):,} contas:\t{time.perf_counter() - inicio:.2f} s")
+
+def benchmark_extrato():
+    # 100.000 operações em uma conta: extrato em texto (+=) contra a lista de lançamentos
+    quantidade = 100_000
+    valor = Dinheiro("12.34")
+
+    def depositar_texto(saldo, valor, extrato, /):
+        saldo += valor
+        extrato += f"Depósito:\tR$ {valor:.2f}\n"
+        return saldo, extrato
+
+    saldo, extrato = Dinheiro(), ""
+    inicio = time.perf_counter()
+    for _ in range(quantidade):
+        saldo, extrato = depositar_texto(saldo, valor, extrato)
+    print(f"extrato em texto:\t{time.perf_counter() - inicio:.2f} s")
+
+    saldo, extrato = Dinheiro(), []
+    with open(os.devnull, "w") as nulo, redirect_stdout(nulo):
+        inicio = time.perf_counter()
+        for _ in range(quantidade):
+            saldo, extrato = depositar(saldo, valor, extrato)
+        decorrido = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        exibir_extrato(saldo, extrato=extrato, arquivo=nulo)
+        exibicao = time.perf_counter() - inicio
+    print(f"extrato em lista:\t{decorrido:.2f} s (exibição em páginas: {exibicao:.2f} s)")
+
+def benchmark_carga():
+    # 100.000 contas e 1.000.000 de operações mistas em contas sorteadas
+    quantidade_contas = 100_000
+    quantidade_operacoes = 1_000_000
+    limite = Dinheiro(500)
+    gerador = random.Random(0)
+    estados = {numero_conta: EstadoConta() for numero_conta in range(1, quantidade_contas + 1)}
+    operacoes = [
+        (gerador.randint(1, quantidade_contas), gerador.random())
+        for _ in range(quantidade_operacoes)
+    ]
+    valor = Dinheiro(50)
+
+    with open(os.devnull, "w") as nulo, redirect_stdout(nulo):
+        inicio = time.perf_counter()
+        for numero_conta, sorteio in operacoes:
+            estado = estados[numero_conta]
+            if sorteio < 0.6:
+                estado.saldo, estado.extrato = depositar(estado.saldo, valor, estado.extrato)
+            elif sorteio < 0.99:
+                estado.saldo, estado.extrato, estado.numero_saques = sacar(
+                    saldo=estado.saldo,
+                    valor=valor,
+                    extrato=estado.extrato,
+                    limite=limite,
+                    numero_saques=estado.numero_saques,
+                    limite_saques=3,
+                )
+            else:
+                exibir_extrato(estado.saldo, extrato=estado.extrato, arquivo=nulo)
+        decorrido = time.perf_counter() - inicio
+    print(f"{quantidade_operacoes:,} operações em {quantidade_contas:,} contas:\t{quantidade_operacoes / decorrido:,.0f} op/s")
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["benchmark"]:
+        benchmark_cadastro()
+        benchmark_extrato()
+        benchmark_carga()
+    else:
+        main()
\ No newline at end of file
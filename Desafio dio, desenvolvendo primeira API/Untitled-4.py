@@ -1,26 +1,53 @@
 routers/atleta.py
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+import json
+import re
+import time
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import select
-from starlette.responses import JSONResponse
-from fastapi_pagination import Page, paginate
-from typing import Optional, List
+from sqlalchemy import false, func, literal_column, select, tuple_
+from sqlalchemy.dialects.sqlite import insert
+from starlette.responses import JSONResponse, StreamingResponse
+from pydantic import ValidationError
+from typing import Any, Literal, Optional, List
 
-from database import get_db
-from models import Atleta
-from schemas import AtletaCreate, AtletaResponse
+from database import AsyncSessionLocal, get_db, get_db_leitura
+from models import Atleta, atletas_fts
+from schemas import AtletaCreate, PaginaAtletas, ResultadoBulk
 
 router = APIRouter(prefix="/atletas", tags=["Atletas"])
 
+# Acima deste offset o banco teria que percorrer e descartar linhas demais;
+# para páginas mais profundas o cliente deve seguir o proximo_cursor
+OFFSET_MAXIMO = 10_000
+# Por quantos segundos uma contagem exata é reaproveitada entre requisições
+VALIDADE_CONTAGEM = 60
+# Buscas por nome com até esta quantidade de resultados vêm ordenadas por
+# relevância; acima disso (ex.: "silva") calcular e ordenar a relevância de
+# todos custaria caro demais, e elas vêm na ordem de cadastro
+LIMITE_RELEVANCIA = 10_000
+# Cargas em lote: quantas linhas validar e inserir de cada vez, e o máximo
+# aceito no corpo JSON de /bulk (cargas maiores vão por /bulk/ndjson, em fluxo)
+TAMANHO_LOTE_BULK = 1_000
+LIMITE_BULK_JSON = 10_000
+# Maior linha aceita em /bulk/ndjson, em bytes: uma linha maior é descartada
+# sem ser guardada inteira e volta como inválida
+TAMANHO_MAXIMO_LINHA = 64 * 1024
+LINHA_LONGA = object()  # marca, no lugar dos dados, uma linha descartada por tamanho
+_contagens = {}
+
 @router.post("/", status_code=201)
-async def create_atleta(atleta_data: AtletaCreate, db: Session = Depends(get_db)):
+async def create_atleta(atleta_data: AtletaCreate, db: AsyncSession = Depends(get_db)):
     try:
         new_atleta = Atleta(nome=atleta_data.nome, cpf=atleta_data.cpf)
         db.add(new_atleta)
-        db.commit()
-        db.refresh(new_atleta)
+        await db.commit()
+        await db.refresh(new_atleta)
+        # As contagens guardadas deixaram de valer
+        _contagens.clear()
         return new_atleta
     except IntegrityError:
         # Manipula a exceção quando o CPF já existe
@@ -29,21 +56,273 @@ async def create_atleta(atleta_data: AtletaCreate, db: Session = Depends(get_db)
             content={"mensagem": f"Já existe um atleta cadastrado com o cpf: {atleta_data.cpf}"}
         )
 
-@router.get("/", response_model=Page[AtletaResponse])
+def validar_linha(numero: int, dados) -> tuple:
+    """
+    Valida uma linha de uma carga em lote.
+
+    Args:
+        numero (int): O número da linha na carga, a partir de 1.
+        dados: O objeto já decodificado ou, vindo de NDJSON, o texto JSON da linha
+            (LINHA_LONGA se ela passou de TAMANHO_MAXIMO_LINHA).
+
+    Returns:
+        tuple: (AtletaCreate, None) ou, se a linha for inválida, (None, o resultado da linha).
+    """
+    if dados is LINHA_LONGA:
+        return None, {"linha": numero, "status": "invalido", "erro": f"linha maior que {TAMANHO_MAXIMO_LINHA} bytes"}
+    try:
+        if isinstance(dados, bytes):
+            return AtletaCreate.model_validate_json(dados), None
+        return AtletaCreate.model_validate(dados), None
+    except ValidationError as erro:
+        detalhe = erro.errors()[0]
+        campo = ".".join(str(parte) for parte in detalhe["loc"])
+        return None, {"linha": numero, "status": "invalido", "erro": f"{campo}: {detalhe['msg']}" if campo else detalhe["msg"]}
+
+async def inserir_lote(db: AsyncSession, lote: list) -> list:
+    """
+    Insere um lote de atletas válidos de uma vez (INSERT ... ON CONFLICT (cpf) DO NOTHING
+    RETURNING, em um único comando com várias linhas) e confirma a transação.
+
+    Args:
+        db (AsyncSession): A sessão do banco.
+        lote (list): Pares (número da linha, AtletaCreate).
+
+    Returns:
+        list: O resultado de cada linha, na mesma ordem: criado (com o id) ou duplicado.
+    """
+    created_at = datetime.utcnow()
+    comando = insert(Atleta).on_conflict_do_nothing(index_elements=["cpf"]).returning(Atleta.id, Atleta.cpf)
+    inseridos = await db.execute(comando, [{"nome": atleta.nome, "cpf": atleta.cpf, "created_at": created_at} for _, atleta in lote])
+    criados = {cpf: id_ for id_, cpf in inseridos}
+    await db.commit()
+    if criados:
+        _contagens.clear()
+    resultados = []
+    for numero, atleta in lote:
+        # pop: se o cpf se repete dentro do lote, só a primeira ocorrência foi criada
+        id_ = criados.pop(atleta.cpf, None)
+        if id_ is None:
+            resultados.append({"linha": numero, "cpf": atleta.cpf, "status": "duplicado"})
+        else:
+            resultados.append({"linha": numero, "cpf": atleta.cpf, "status": "criado", "id": id_})
+    return resultados
+
+async def processar_carga(db: AsyncSession, linhas):
+    """
+    Valida e insere as linhas de uma carga em lotes de TAMANHO_LOTE_BULK.
+    Só um lote fica em memória por vez.
+
+    Args:
+        db (AsyncSession): A sessão do banco.
+        linhas (AsyncIterable[tuple]): Pares (número da linha, dados da linha).
+
+    Yields:
+        list: Os resultados de cada lote, na ordem das linhas.
+    """
+    pendentes, lote = [], []
+    async for numero, dados in linhas:
+        atleta, resultado = validar_linha(numero, dados)
+        # As linhas válidas guardam lugar (None) até o lote ser inserido
+        pendentes.append(resultado)
+        if atleta is not None:
+            lote.append((numero, atleta))
+        if len(pendentes) == TAMANHO_LOTE_BULK:
+            yield await _resolver_lote(db, pendentes, lote)
+            pendentes, lote = [], []
+    if pendentes:
+        yield await _resolver_lote(db, pendentes, lote)
+
+async def _resolver_lote(db: AsyncSession, pendentes: list, lote: list) -> list:
+    inseridos = iter(await inserir_lote(db, lote) if lote else ())
+    return [resultado or next(inseridos) for resultado in pendentes]
+
+async def linhas_ndjson(request: Request, tamanho_maximo: int = TAMANHO_MAXIMO_LINHA):
+    """
+    Lê o corpo da requisição em fluxo e gera (número da linha, texto JSON) de
+    cada linha não vazia. Uma linha com mais de tamanho_maximo bytes vem como
+    (número, LINHA_LONGA): o que passa do limite é descartado enquanto chega,
+    então a memória usada não depende do tamanho das linhas.
+    """
+    resto = b""
+    numero = 0
+    descartando = False  # o começo da linha atual já passou do limite e foi descartado
+    async for pedaco in request.stream():
+        linhas = (resto + pedaco).split(b"\n")
+        resto = linhas.pop()
+        for linha in linhas:
+            numero += 1
+            if descartando or len(linha) > tamanho_maximo:
+                descartando = False
+                yield numero, LINHA_LONGA
+            elif linha.strip():
+                yield numero, linha
+        if len(resto) > tamanho_maximo:
+            descartando, resto = True, b""
+    if descartando:
+        yield numero + 1, LINHA_LONGA
+    elif resto.strip():
+        yield numero + 1, resto
+
+class RespostaNdjson(StreamingResponse):
+    """
+    Resposta NDJSON em fluxo gerada enquanto o corpo da requisição ainda é lido.
+    A StreamingResponse escuta a desconexão do cliente consumindo as mensagens
+    da requisição, o que roubaria o corpo do gerador; aqui uma desconexão
+    aparece como erro ao ler o corpo ou ao enviar a resposta.
+    """
+    media_type = "application/x-ndjson"
+
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+def resumir_carga(resultados: list, contagem: dict):
+    """Soma os status de um lote de resultados na contagem da carga."""
+    for resultado in resultados:
+        contagem[resultado["status"]] += 1
+
+@router.post("/bulk", response_model=ResultadoBulk, response_model_exclude_none=True)
+async def create_atletas_bulk(
+    atletas: List[Any] = Body(..., max_length=LIMITE_BULK_JSON, description="Lista de atletas (nome e cpf)"),
+    db: AsyncSession = Depends(get_db)
+):
+    async def linhas():
+        for numero, dados in enumerate(atletas, 1):
+            yield numero, dados
+
+    contagem = {"criado": 0, "duplicado": 0, "invalido": 0}
+    resultados = []
+    async for lote in processar_carga(db, linhas()):
+        resumir_carga(lote, contagem)
+        resultados.extend(lote)
+    return {"criados": contagem["criado"], "duplicados": contagem["duplicado"], "invalidos": contagem["invalido"], "linhas": resultados}
+
+@router.post("/bulk/ndjson")
+async def create_atletas_bulk_ndjson(request: Request):
+    """
+    Carga em fluxo, de qualquer tamanho: o corpo traz um atleta JSON por linha
+    e a resposta, também NDJSON, traz o resultado de cada linha à medida que
+    os lotes são inseridos, terminando com uma linha de resumo.
+    """
+    async def respostas():
+        contagem = {"criado": 0, "duplicado": 0, "invalido": 0}
+        # A sessão é aberta aqui porque a resposta continua depois que o endpoint retorna
+        async with AsyncSessionLocal() as db:
+            async for lote in processar_carga(db, linhas_ndjson(request)):
+                resumir_carga(lote, contagem)
+                yield "".join(json.dumps(resultado, ensure_ascii=False) + "\n" for resultado in lote)
+        yield json.dumps({"criados": contagem["criado"], "duplicados": contagem["duplicado"], "invalidos": contagem["invalido"]}) + "\n"
+
+    return RespostaNdjson(respostas())
+
+def codificar_cursor(atleta: Atleta) -> str:
+    """Monta o cursor opaco que aponta para logo depois deste atleta na ordem (created_at, id)."""
+    texto = f"{atleta.created_at.isoformat()}|{atleta.id}"
+    return urlsafe_b64encode(texto.encode()).decode().rstrip("=")
+
+def decodificar_cursor(cursor: str) -> tuple:
+    """Devolve o (created_at, id) guardado no cursor."""
+    try:
+        texto = urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, id_ = texto.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(id_)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Cursor inválido.")
+
+def termos_de_busca(nome: str) -> str:
+    """
+    Converte o texto digitado em uma consulta FTS5: cada palavra vira um
+    prefixo entre aspas ("silv" acha "Silva" e "Silveira") e todas precisam aparecer.
+    """
+    return " ".join(f'"{palavra}"*' for palavra in re.findall(r"\w+", nome))
+
+async def contar_atletas(db: AsyncSession, consulta, filtrada: bool, chave: tuple, contagem: str) -> tuple:
+    """
+    Conta os atletas devolvidos pela consulta.
+
+    Args:
+        db (AsyncSession): A sessão do banco.
+        consulta (Select): Uma consulta com uma linha por atleta, sem ordem nem limite.
+        filtrada (bool): Se a consulta tem algum filtro.
+        chave (tuple): Identifica os filtros no cache de contagens.
+        contagem (str): "exata" (reaproveitada por VALIDADE_CONTAGEM segundos),
+            "estimada" (MAX(id), sem percorrer a tabela) ou "nenhuma".
+
+    Returns:
+        tuple: (total ou None, se o total é uma estimativa).
+    """
+    if contagem == "nenhuma":
+        return None, False
+    if contagem == "estimada" and not filtrada:
+        # Os ids são sequenciais e a API não remove atletas, então o maior id
+        # é o total; vem direto do fim do índice da chave primária
+        return (await db.execute(select(func.max(Atleta.id)))).scalar() or 0, True
+    agora = time.monotonic()
+    guardada = _contagens.get(chave)
+    if guardada is not None and agora - guardada[1] < VALIDADE_CONTAGEM:
+        return guardada[0], False
+    total = (await db.execute(select(func.count()).select_from(consulta.subquery()))).scalar_one()
+    if len(_contagens) >= 1024:
+        _contagens.clear()
+    _contagens[chave] = (total, agora)
+    return total, False
+
+@router.get("/", response_model=PaginaAtletas)
 async def get_all_atletas(
-    nome: Optional[str] = Query(None, description="Filtrar por nome do atleta"),
+    nome: Optional[str] = Query(None, description="Buscar pelo nome do atleta (palavras ou começos de palavras, sem diferenciar acentos)"),
     cpf: Optional[str] = Query(None, description="Filtrar por CPF do atleta"),
-    db: Session = Depends(get_db)
+    limit: int = Query(50, ge=1, le=500, description="Quantos atletas por página"),
+    offset: int = Query(0, ge=0, le=OFFSET_MAXIMO, description="Quantos atletas pular (páginas iniciais)"),
+    cursor: Optional[str] = Query(None, description="O proximo_cursor da página anterior (qualquer profundidade)"),
+    contagem: Literal["exata", "estimada", "nenhuma"] = Query("exata", description="Como calcular o total"),
+    db: AsyncSession = Depends(get_db_leitura)
 ):
+    if nome and cursor:
+        raise HTTPException(status_code=400, detail="A busca por nome é paginada por offset, não por cursor.")
     query = select(Atleta)
-    
+    # Listagem na ordem do índice (created_at, id)
+    ordem = (Atleta.created_at, Atleta.id)
+
     # Aplica os filtros se os parâmetros de consulta forem fornecidos
-    if nome:
-        query = query.where(Atleta.nome.ilike(f"%{nome}%"))
     if cpf:
         query = query.where(Atleta.cpf == cpf)
-    
-    # Usa a função paginate da biblioteca para lidar com limite e offset
-    # A biblioteca vai extrair os parâmetros 'limit' e 'offset' da URL automaticamente
-    # e aplicar à consulta.
-    return paginate(db.execute(query).scalars().all())
\ No newline at end of file
+    contada = query
+    if nome:
+        termos = termos_de_busca(nome)
+        if not termos:
+            query = contada = query.where(false())
+        else:
+            # Busca no índice de texto, e não com ilike('%nome%'), que lê a tabela inteira
+            encontrados = select(atletas_fts.c.rowid).where(literal_column("atletas_fts").match(termos))
+            busca = encontrados.add_columns(atletas_fts.c.rank).subquery()
+            query = query.join(busca, busca.c.rowid == Atleta.id)
+            # Sem filtro por cpf, o total sai só do índice de texto
+            contada = query if cpf else encontrados
+            if (await db.execute(encontrados.offset(LIMITE_RELEVANCIA).limit(1))).first() is None:
+                # Poucos resultados: por relevância (BM25)
+                ordem = (busca.c.rank, Atleta.id)
+            else:
+                # O índice já devolve os resultados nessa ordem, sem ordenar nada
+                ordem = (busca.c.rowid,)
+    total, estimado = await contar_atletas(db, contada, bool(nome or cpf), (nome, cpf), contagem)
+
+    # A paginação é feita pelo banco: só limit + 1 linhas são lidas (a extra
+    # indica se há próxima página)
+    query = query.order_by(*ordem).limit(limit + 1)
+    if cursor:
+        # Keyset: continua depois da última linha vista, sem contar as anteriores
+        query = query.where(tuple_(Atleta.created_at, Atleta.id) > tuple_(*decodificar_cursor(cursor)))
+    elif offset:
+        query = query.offset(offset)
+    atletas = (await db.execute(query)).scalars().all()
+
+    return {
+        "items": atletas[:limit],
+        "total": total,
+        "total_estimado": estimado,
+        "limit": limit,
+        "offset": None if cursor else offset,
+        "proximo_cursor": codificar_cursor(atletas[limit - 1]) if len(atletas) > limit and not nome else None,
+    }
\ No newline at end of file
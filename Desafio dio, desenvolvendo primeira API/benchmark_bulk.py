@@ -0,0 +1,145 @@
+"""
+Benchmark de cadastro de atletas contra um servidor rodando: um POST /atletas/
+por atleta, POST /atletas/bulk em listas de 10 mil e um único POST
+/atletas/bulk/ndjson em fluxo. Mede atletas por segundo em cada modo; um
+décimo dos CPFs de cada carga repete CPFs já enviados, para exercitar o
+relatório de duplicados.
+
+Suba o servidor antes (ex.: uvicorn main:app).
+Uso: python benchmark_bulk.py [url] [atletas]  (padrão: http://127.0.0.1:8000 500000)
+"""
+import asyncio
+import json
+import sys
+import time
+import uuid
+from urllib.parse import urlsplit
+
+INDIVIDUAIS = 2_000
+LOTE_JSON = 10_000
+PEDACO_NDJSON = 1_000
+
+
+def _atletas(prefixo: str, quantidade: int):
+    """Gera os atletas da carga; cada décimo repete o CPF do atleta anterior."""
+    for numero in range(quantidade):
+        cpf = numero - 1 if numero % 10 == 9 else numero
+        yield {"nome": f"Atleta Carga {numero}", "cpf": f"{prefixo}{cpf:09d}"}
+
+
+async def _ler_resposta(leitor) -> tuple:
+    """Lê uma resposta HTTP/1.1 inteira (com Content-Length ou em chunks); retorna (status, corpo)."""
+    status = int((await leitor.readline()).split()[1])
+    cabecalhos = {}
+    while (linha := await leitor.readline()) not in (b"\r\n", b""):
+        nome, _, valor = linha.partition(b":")
+        cabecalhos[nome.strip().lower()] = valor.strip()
+    if cabecalhos.get(b"transfer-encoding") == b"chunked":
+        partes = []
+        while tamanho := int(await leitor.readline(), 16):
+            partes.append(await leitor.readexactly(tamanho))
+            await leitor.readline()
+        await leitor.readline()
+        return status, b"".join(partes)
+    return status, await leitor.readexactly(int(cabecalhos.get(b"content-length", 0)))
+
+
+async def _postar(leitor, escritor, host: str, caminho: str, corpo: bytes) -> tuple:
+    escritor.write(
+        f"POST {caminho} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(corpo)}\r\n\r\n".encode() + corpo
+    )
+    await escritor.drain()
+    return await _ler_resposta(leitor)
+
+
+async def individual(host: str, porta: int, prefixo: str, quantidade: int) -> dict:
+    """Cadastra um atleta por requisição, como antes do endpoint em lote."""
+    leitor, escritor = await asyncio.open_connection(host, porta)
+    criados = 0
+    for atleta in _atletas(prefixo, quantidade):
+        status, _ = await _postar(leitor, escritor, host, "/atletas/", json.dumps(atleta).encode())
+        criados += status == 201
+    escritor.close()
+    return {"criados": criados, "duplicados": quantidade - criados}
+
+
+async def bulk_json(host: str, porta: int, prefixo: str, quantidade: int) -> dict:
+    """Cadastra em listas de LOTE_JSON atletas por requisição."""
+    leitor, escritor = await asyncio.open_connection(host, porta)
+    total = {"criados": 0, "duplicados": 0}
+
+    async def enviar(lote):
+        _, corpo = await _postar(leitor, escritor, host, "/atletas/bulk", json.dumps(lote).encode())
+        resumo = json.loads(corpo)
+        total["criados"] += resumo["criados"]
+        total["duplicados"] += resumo["duplicados"]
+
+    lote = []
+    for atleta in _atletas(prefixo, quantidade):
+        lote.append(atleta)
+        if len(lote) == LOTE_JSON:
+            await enviar(lote)
+            lote = []
+    if lote:
+        await enviar(lote)
+    escritor.close()
+    return total
+
+
+async def bulk_ndjson(host: str, porta: int, prefixo: str, quantidade: int) -> dict:
+    """Envia todos os atletas em uma única requisição NDJSON em chunks, lendo a resposta ao mesmo tempo."""
+    leitor, escritor = await asyncio.open_connection(host, porta)
+    escritor.write(
+        f"POST /atletas/bulk/ndjson HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/x-ndjson\r\n"
+        "Transfer-Encoding: chunked\r\n\r\n".encode()
+    )
+
+    async def enviar():
+        pedaco = []
+        for atleta in _atletas(prefixo, quantidade):
+            pedaco.append(json.dumps(atleta))
+            if len(pedaco) == PEDACO_NDJSON:
+                dados = ("\n".join(pedaco) + "\n").encode()
+                escritor.write(b"%x\r\n%s\r\n" % (len(dados), dados))
+                await escritor.drain()
+                pedaco = []
+        if pedaco:
+            dados = ("\n".join(pedaco) + "\n").encode()
+            escritor.write(b"%x\r\n%s\r\n" % (len(dados), dados))
+        escritor.write(b"0\r\n\r\n")
+        await escritor.drain()
+
+    _, (status, corpo) = await asyncio.gather(enviar(), _ler_resposta(leitor))
+    escritor.close()
+    linhas = corpo.splitlines()
+    assert len(linhas) == quantidade + 1, (status, len(linhas))
+    resumo = json.loads(linhas[-1])
+    return {"criados": resumo["criados"], "duplicados": resumo["duplicados"]}
+
+
+async def medir(url: str, atletas: int):
+    endereco = urlsplit(url)
+    host, porta = endereco.hostname, endereco.port or 80
+    print("modo\tatletas\tcriados\tduplicados\tsegundos\tatletas_por_segundo")
+    for nome, modo, quantidade in (
+        ("um POST por atleta", individual, min(INDIVIDUAIS, atletas)),
+        ("bulk JSON", bulk_json, atletas),
+        ("bulk NDJSON", bulk_ndjson, atletas),
+    ):
+        prefixo = uuid.uuid4().hex[:8]
+        inicio = time.perf_counter()
+        resultado = await modo(host, porta, prefixo, quantidade)
+        decorrido = time.perf_counter() - inicio
+        print(
+            f"{nome}\t{quantidade:,}\t{resultado['criados']:,}\t{resultado['duplicados']:,}"
+            f"\t{decorrido:.1f}\t{quantidade / decorrido:,.0f}",
+            flush=True,
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(medir(
+        sys.argv[1] if len(sys.argv) > 1 else "http://127.0.0.1:8000",
+        int(sys.argv[2]) if len(sys.argv) > 2 else 500_000,
+    ))
\ No newline at end of file
@@ -0,0 +1,181 @@
+"""
+Benchmark da busca por nome de GET /atletas: ilike('%nome%') contra o índice FTS5.
+
+Roda direto no sqlite3 as mesmas consultas que o roteador gera (página de 50
+e contagem), sobre o esquema de models.py, com 1 e 10 milhões de atletas de
+nomes brasileiros sintéticos.
+
+Uso: python benchmark_busca.py [linhas]  (padrão: 10.000.000)
+"""
+import os
+import re
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+ESQUEMA = """
+CREATE TABLE atletas (
+    id INTEGER NOT NULL PRIMARY KEY,
+    nome VARCHAR,
+    cpf VARCHAR,
+    created_at DATETIME
+);
+CREATE INDEX ix_atletas_id ON atletas (id);
+CREATE INDEX ix_atletas_nome ON atletas (nome);
+CREATE UNIQUE INDEX ix_atletas_cpf ON atletas (cpf);
+CREATE INDEX ix_atletas_created_at_id ON atletas (created_at, id);
+"""
+# Os comandos de models.DDL_BUSCA usados aqui
+DDL_BUSCA = (
+    """CREATE VIRTUAL TABLE IF NOT EXISTS atletas_fts USING fts5(
+        nome, content='atletas', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS atletas_fts_insert AFTER INSERT ON atletas BEGIN
+        INSERT INTO atletas_fts (rowid, nome) VALUES (new.id, new.nome);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS atletas_fts_delete AFTER DELETE ON atletas BEGIN
+        INSERT INTO atletas_fts (atletas_fts, rowid, nome) VALUES ('delete', old.id, old.nome);
+    END""",
+)
+PRIMEIROS = (
+    "João", "Maria", "José", "Ana", "Antônio", "Francisca", "Luís", "Antônia", "Paulo", "Adriana",
+    "Carlos", "Juliana", "Lucas", "Márcia", "Pedro", "Fernanda", "Rafael", "Patrícia", "Tiago", "Aline",
+    "Gabriel", "Letícia", "Mateus", "Bárbara", "André", "Conceição", "Sebastião", "Vitória", "Caio", "Fábio",
+)
+SOBRENOMES = (
+    "Silva", "Santos", "Oliveira", "Souza", "Rodrigues", "Ferreira", "Alves", "Pereira", "Lima", "Gomes",
+    "Costa", "Ribeiro", "Martins", "Carvalho", "Araújo", "Melo", "Barbosa", "Cardoso", "Rocha", "Dias",
+    "Nascimento", "Andrade", "Moreira", "Nunes", "Marques", "Machado", "Mendes", "Freitas", "Conceição", "Brandão",
+    "Silveira", "Simões", "Gonçalves", "Falcão", "Sá", "Magalhães", "Peixoto", "Assunção", "Guimarães", "Leão",
+)
+# Sílabas dos sobrenomes raros (20^3 = 8.000 combinações)
+SILABAS = ("ba", "ca", "da", "fe", "gu", "ja", "la", "mo", "na", "pi", "que", "ra", "su", "ta", "vi", "xa", "zé", "tã", "lú", "rô")
+
+PAGINA_ILIKE = (
+    "SELECT atletas.id, atletas.nome, atletas.cpf, atletas.created_at FROM atletas "
+    "WHERE lower(atletas.nome) LIKE lower(?) ORDER BY atletas.created_at, atletas.id LIMIT 51 OFFSET 0"
+)
+CONTAGEM_ILIKE = "SELECT count(*) FROM (SELECT atletas.id FROM atletas WHERE lower(atletas.nome) LIKE lower(?))"
+# As consultas do roteador: a sondagem de LIMITE_RELEVANCIA decide entre a página por relevância e por rowid
+LIMITE_RELEVANCIA = 10_000
+SONDAGEM_FTS = "SELECT atletas_fts.rowid FROM atletas_fts WHERE atletas_fts MATCH ? LIMIT 1 OFFSET ?"
+PAGINA_FTS = (
+    "SELECT atletas.id, atletas.nome, atletas.cpf, atletas.created_at FROM atletas JOIN "
+    "(SELECT atletas_fts.rowid AS rowid, atletas_fts.rank AS rank FROM atletas_fts WHERE atletas_fts MATCH ?) AS anon_1 "
+    "ON anon_1.rowid = atletas.id ORDER BY {ordem} LIMIT 51 OFFSET 0"
+)
+CONTAGEM_FTS = "SELECT count(*) FROM (SELECT atletas_fts.rowid AS rowid FROM atletas_fts WHERE atletas_fts MATCH ?)"
+
+
+def _termos(texto: str) -> str:
+    # Igual a termos_de_busca do roteador
+    return " ".join(f'"{palavra}"*' for palavra in re.findall(r"\w+", texto))
+
+
+def _pagina_fts(conexao: sqlite3.Connection, termos: str) -> list:
+    if conexao.execute(SONDAGEM_FTS, (termos, LIMITE_RELEVANCIA)).fetchone() is None:
+        return conexao.execute(PAGINA_FTS.format(ordem="anon_1.rank, atletas.id"), (termos,)).fetchall()
+    return conexao.execute(PAGINA_FTS.format(ordem="anon_1.rowid"), (termos,)).fetchall()
+
+
+def povoar(conexao: sqlite3.Connection, de: int, ate: int):
+    """Insere os atletas de id de+1 até ate com nomes do tipo "Primeiro Sobrenome Sobrenome Raro"."""
+    conexao.execute(
+        f"""
+        WITH RECURSIVE n(i) AS (SELECT ? UNION ALL SELECT i + 1 FROM n WHERE i < ?)
+        INSERT INTO atletas (id, nome, cpf, created_at)
+        SELECT n.i,
+               p.nome || ' ' || s1.nome || ' ' || s2.nome || ' ' || upper(substr(r.nome, 1, 1)) || substr(r.nome, 2),
+               printf('%011d', n.i),
+               strftime('%Y-%m-%d %H:%M:%S', 1600000000 + n.i, 'unixepoch') || '.000000'
+        FROM n
+        JOIN primeiros p ON p.i = n.i * 2654435761 % 1000003 % {len(PRIMEIROS)}
+        JOIN sobrenomes s1 ON s1.i = n.i * 2654435761 % 1000003 / {len(PRIMEIROS)} % {len(SOBRENOMES)}
+        JOIN sobrenomes s2 ON s2.i = n.i * 2654435761 % 1000003 / {len(PRIMEIROS) * len(SOBRENOMES)} % {len(SOBRENOMES)}
+        JOIN raros r ON r.i = n.i * 48271 % {len(SILABAS) ** 3}
+        """,
+        (de + 1, ate),
+    )
+    conexao.commit()
+
+
+def medir(funcao, repeticoes: int = 3) -> float:
+    """Retorna a mediana, em milissegundos, de repeticoes execuções."""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tempos)
+
+
+def _inserir_individualmente(conexao: sqlite3.Connection, tamanho: int, quantidade: int = 10_000) -> float:
+    """Insere quantidade atletas um a um, apaga-os de novo e retorna as inserções por segundo."""
+    inicio = time.perf_counter()
+    for deslocamento in range(1, quantidade + 1):
+        conexao.execute(
+            "INSERT INTO atletas (id, nome, cpf, created_at) VALUES (?, ?, ?, ?)",
+            (tamanho + deslocamento, f"Novo Atleta Conceição {deslocamento}", f"n{deslocamento}", "2030-01-01 00:00:00.000000"),
+        )
+    conexao.commit()
+    por_segundo = quantidade / (time.perf_counter() - inicio)
+    conexao.execute("DELETE FROM atletas WHERE id > ?", (tamanho,))
+    conexao.commit()
+    return por_segundo
+
+
+def benchmark(linhas: int = 10_000_000):
+    """Mede, a 1 milhão e a linhas atletas, a página e a contagem de cada busca nos dois modos."""
+    buscas = ("silva", "joao silv", "conceicao", "Maria Souza Lima", "lúmoxa")
+    tamanhos = [tamanho for tamanho in (1_000_000,) if tamanho < linhas] + [linhas]
+    print("linhas\tbusca\tmodo\tresultados\tpagina_ms\tcontagem_ms")
+    with tempfile.TemporaryDirectory() as diretorio:
+        conexao = sqlite3.connect(os.path.join(diretorio, "atletas.db"))
+        conexao.executescript(ESQUEMA)
+        conexao.execute("PRAGMA cache_size = -262144")
+        conexao.execute("CREATE TEMP TABLE primeiros (i INTEGER PRIMARY KEY, nome TEXT)")
+        conexao.execute("CREATE TEMP TABLE sobrenomes (i INTEGER PRIMARY KEY, nome TEXT)")
+        conexao.execute("CREATE TEMP TABLE raros (i INTEGER PRIMARY KEY, nome TEXT)")
+        conexao.executemany("INSERT INTO primeiros VALUES (?, ?)", enumerate(PRIMEIROS))
+        conexao.executemany("INSERT INTO sobrenomes VALUES (?, ?)", enumerate(SOBRENOMES))
+        conexao.executemany(
+            "INSERT INTO raros VALUES (?, ?)",
+            enumerate(a + b + c for a in SILABAS for b in SILABAS for c in SILABAS),
+        )
+        povoadas = 0
+        for tamanho in tamanhos:
+            # Como criar_busca num banco que já tinha atletas: cria e reconstrói o índice
+            conexao.execute("DROP TRIGGER IF EXISTS atletas_fts_delete")
+            conexao.execute("DROP TABLE IF EXISTS atletas_fts")
+            povoar(conexao, povoadas, tamanho)
+            povoadas = tamanho
+            inicio = time.perf_counter()
+            for comando in DDL_BUSCA:
+                conexao.execute(comando)
+            conexao.execute("INSERT INTO atletas_fts (atletas_fts) VALUES ('rebuild')")
+            conexao.commit()
+            print(f"# {tamanho:,}: construção do índice em {time.perf_counter() - inicio:.1f} s", flush=True)
+
+            for busca in buscas:
+                padrao, termos = f"%{busca}%", _termos(busca)
+                for modo, pagina, contagem in (
+                    ("ilike", lambda: conexao.execute(PAGINA_ILIKE, (padrao,)).fetchall(),
+                     lambda: conexao.execute(CONTAGEM_ILIKE, (padrao,)).fetchone()[0]),
+                    ("fts5", lambda: _pagina_fts(conexao, termos),
+                     lambda: conexao.execute(CONTAGEM_FTS, (termos,)).fetchone()[0]),
+                ):
+                    print(f"{tamanho:,}\t{busca}\t{modo}\t{contagem():,}\t{medir(pagina):.1f}\t{medir(contagem):.1f}", flush=True)
+
+            # Custo na escrita: inserções individuais com e sem o gatilho do índice de texto
+            com_gatilho = _inserir_individualmente(conexao, tamanho)
+            conexao.execute("DROP TRIGGER atletas_fts_insert")
+            sem_gatilho = _inserir_individualmente(conexao, tamanho)
+            print(f"# {tamanho:,}: inserções por segundo sem / com o gatilho: {sem_gatilho:,.0f} / {com_gatilho:,.0f}", flush=True)
+        conexao.close()
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000)
\ No newline at end of file
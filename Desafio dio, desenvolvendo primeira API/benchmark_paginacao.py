@@ -0,0 +1,129 @@
+"""
+Benchmark da paginação de GET /atletas em tabelas de 10 mil a 10 milhões de atletas.
+
+Roda direto no sqlite3 as mesmas consultas que o roteador gera, sobre o
+mesmo esquema e índices de models.py, e compara a abordagem antiga (ler a
+tabela inteira e fatiar na memória) com LIMIT/OFFSET, keyset e as contagens.
+
+Uso: python benchmark_paginacao.py [linhas]  (padrão: 10.000.000)
+"""
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+POR_PAGINA = 50
+OFFSET_MAXIMO = 10_000
+# A abordagem antiga só é medida até aqui: acima disso leva minutos e gigabytes
+LIMITE_CARGA_TOTAL = 1_000_000
+
+ESQUEMA = """
+CREATE TABLE atletas (
+    id INTEGER NOT NULL PRIMARY KEY,
+    nome VARCHAR,
+    cpf VARCHAR,
+    created_at DATETIME
+);
+CREATE INDEX ix_atletas_id ON atletas (id);
+CREATE INDEX ix_atletas_nome ON atletas (nome);
+CREATE UNIQUE INDEX ix_atletas_cpf ON atletas (cpf);
+CREATE INDEX ix_atletas_created_at_id ON atletas (created_at, id);
+"""
+COLUNAS = "atletas.id, atletas.nome, atletas.cpf, atletas.created_at"
+ORDEM = "ORDER BY atletas.created_at, atletas.id"
+CONSULTA_OFFSET = f"SELECT {COLUNAS} FROM atletas {ORDEM} LIMIT ? OFFSET ?"
+CONSULTA_KEYSET = f"SELECT {COLUNAS} FROM atletas WHERE (atletas.created_at, atletas.id) > (?, ?) {ORDEM} LIMIT ?"
+CONSULTA_TUDO = f"SELECT {COLUNAS} FROM atletas"
+
+
+def povoar(conexao: sqlite3.Connection, de: int, ate: int):
+    """Insere os atletas de id de+1 até ate, um por segundo de created_at (no formato do SQLAlchemy)."""
+    conexao.execute(
+        """
+        WITH RECURSIVE n(i) AS (SELECT ? UNION ALL SELECT i + 1 FROM n WHERE i < ?)
+        INSERT INTO atletas (id, nome, cpf, created_at)
+        SELECT i, 'Atleta ' || i, printf('%011d', i),
+               strftime('%Y-%m-%d %H:%M:%S', 1600000000 + i, 'unixepoch') || '.000000'
+        FROM n
+        """,
+        (de + 1, ate),
+    )
+    conexao.commit()
+
+
+def medir(funcao, repeticoes: int = 5) -> float:
+    """Retorna a mediana, em milissegundos, de repeticoes execuções."""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tempos)
+
+
+def pico_memoria(funcao) -> float:
+    """Retorna o pico de memória alocada pelo Python durante a chamada, em MB."""
+    tracemalloc.start()
+    funcao()
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return pico / 2**20
+
+
+def benchmark(linhas: int = 10_000_000):
+    """
+    Povoa a tabela em degraus (10 mil, 100 mil, 1 milhão, 10 milhões...) e,
+    em cada tamanho, mede a latência de uma página de POR_PAGINA atletas.
+    """
+    tamanhos = [tamanho for tamanho in (10_000, 100_000, 1_000_000, 10_000_000) if tamanho < linhas] + [linhas]
+    print(
+        "linhas\tcarga_total_ms\tcarga_total_mb\toffset_0_ms\toffset_10k_ms\toffset_meio_ms"
+        "\tkeyset_meio_ms\tkeyset_fim_ms\tkeyset_mb\tcount_exato_ms\tcount_estimado_ms"
+    )
+    with tempfile.TemporaryDirectory() as diretorio:
+        conexao = sqlite3.connect(os.path.join(diretorio, "atletas.db"))
+        conexao.executescript(ESQUEMA)
+        conexao.execute("PRAGMA cache_size = -262144")
+        povoadas = 0
+        for tamanho in tamanhos:
+            povoar(conexao, povoadas, tamanho)
+            povoadas = tamanho
+
+            def pagina_offset(offset):
+                return conexao.execute(CONSULTA_OFFSET, (POR_PAGINA + 1, offset)).fetchall()
+
+            def carga_total():
+                return conexao.execute(CONSULTA_TUDO).fetchall()[:POR_PAGINA]
+
+            # O cursor é o (created_at, id) da última linha da página anterior
+            cursor_meio = conexao.execute("SELECT created_at, id FROM atletas WHERE id = ?", (tamanho // 2,)).fetchone()
+            cursor_fim = conexao.execute("SELECT created_at, id FROM atletas WHERE id = ?", (tamanho - POR_PAGINA,)).fetchone()
+            keyset_meio = lambda: conexao.execute(CONSULTA_KEYSET, (*cursor_meio, POR_PAGINA + 1)).fetchall()
+            keyset_fim = lambda: conexao.execute(CONSULTA_KEYSET, (*cursor_fim, POR_PAGINA + 1)).fetchall()
+            assert len(keyset_meio()) == POR_PAGINA + 1
+
+            if tamanho <= LIMITE_CARGA_TOTAL:
+                carga_ms = f"{medir(carga_total, 3):.1f}"
+                carga_mb = f"{pico_memoria(carga_total):.1f}"
+            else:
+                carga_ms = carga_mb = "-"
+            print(
+                f"{tamanho:,}\t{carga_ms}\t{carga_mb}"
+                f"\t{medir(lambda: pagina_offset(0)):.2f}"
+                f"\t{medir(lambda: pagina_offset(min(OFFSET_MAXIMO, tamanho - POR_PAGINA))):.2f}"
+                f"\t{medir(lambda: pagina_offset(tamanho // 2), 3):.2f}"
+                f"\t{medir(keyset_meio):.2f}"
+                f"\t{medir(keyset_fim):.2f}"
+                f"\t{pico_memoria(keyset_meio):.3f}"
+                f"\t{medir(lambda: conexao.execute('SELECT count(*) FROM atletas').fetchone(), 3):.1f}"
+                f"\t{medir(lambda: conexao.execute('SELECT max(atletas.id) FROM atletas').fetchone()):.3f}",
+                flush=True,
+            )
+        conexao.close()
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000)
\ No newline at end of file
@@ -0,0 +1,183 @@
+"""
+Benchmark de leituras e escritas misturadas no SQLite: o perfil padrão (diário
+de rollback, synchronous=FULL, um pool só) contra o perfil de produção de
+database.py (WAL, os pragmas de config.py e o pool de leitura separado).
+
+Cada perfil roda em um processo próprio, com as variáveis de ambiente de
+config.py, e passa pelos motores de database.py: leitores concorrentes pedem
+páginas por cursor e atletas por CPF com AsyncSessionLeitura (o pool de
+get_db_leitura); um escritor cadastra um atleta por sessão com
+AsyncSessionLocal (o pool de escrita, de POOL_ESCRITA conexões), com os
+gatilhos do índice de texto. Mede operações por segundo e latências p50/p99
+de cada lado, incluindo a espera por uma conexão do pool.
+
+Uso: python benchmark_sqlite.py [linhas] [leitores] [segundos]  (padrão: 1.000.000 4 10)
+"""
+import asyncio
+import os
+import random
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ESQUEMA = """
+CREATE TABLE atletas (
+    id INTEGER NOT NULL PRIMARY KEY,
+    nome VARCHAR,
+    cpf VARCHAR,
+    created_at DATETIME
+);
+CREATE INDEX ix_atletas_id ON atletas (id);
+CREATE INDEX ix_atletas_nome ON atletas (nome);
+CREATE UNIQUE INDEX ix_atletas_cpf ON atletas (cpf);
+CREATE INDEX ix_atletas_created_at_id ON atletas (created_at, id);
+CREATE VIRTUAL TABLE atletas_fts USING fts5(
+    nome, content='atletas', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+);
+CREATE TRIGGER atletas_fts_insert AFTER INSERT ON atletas BEGIN
+    INSERT INTO atletas_fts (rowid, nome) VALUES (new.id, new.nome);
+END;
+"""
+
+# As variáveis de config.py de cada perfil. O padrão usa os valores de fábrica do SQLite
+# (só o tempo de espera por trava igual ao de produção, para comparar os modos) e um pool
+# único do tamanho padrão do SQLAlchemy, para leituras e escritas
+PERFIS = (
+    ("padrão", {
+        "SQLITE_JOURNAL_MODE": "delete",
+        "SQLITE_SYNCHRONOUS": "full",
+        "SQLITE_CACHE_SIZE": "-2000",
+        "SQLITE_MMAP_SIZE": "0",
+        "SQLITE_TEMP_STORE": "default",
+        "POOL_ESCRITA": "5",
+        "LEITURA_SEPARADA": "False",
+    }),
+    ("produção", {}),
+)
+
+# As consultas do roteador: uma página por cursor e a busca por CPF
+PAGINA = (
+    "SELECT atletas.id, atletas.nome, atletas.cpf, atletas.created_at FROM atletas "
+    "WHERE (atletas.created_at, atletas.id) > (:momento, :id) ORDER BY atletas.created_at, atletas.id LIMIT 51"
+)
+POR_CPF = "SELECT atletas.id, atletas.nome, atletas.cpf, atletas.created_at FROM atletas WHERE atletas.cpf = :cpf"
+INSERCAO = "INSERT INTO atletas (nome, cpf, created_at) VALUES (:nome, :cpf, :created_at)"
+
+
+def povoar(caminho: str, linhas: int):
+    conexao = sqlite3.connect(caminho)
+    conexao.executescript(ESQUEMA)
+    conexao.execute(
+        """
+        WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < ?)
+        INSERT INTO atletas (id, nome, cpf, created_at)
+        SELECT n.i, 'Atleta ' || n.i || ' Silva', printf('%011d', n.i),
+               strftime('%Y-%m-%d %H:%M:%S', 1600000000 + n.i, 'unixepoch') || '.000000'
+        FROM n
+        """,
+        (linhas,),
+    )
+    conexao.commit()
+    conexao.close()
+
+
+def _resumo(latencias: list, segundos: float) -> str:
+    percentis = statistics.quantiles(latencias, n=100) if len(latencias) > 1 else [float("nan")] * 99
+    return f"{len(latencias) / segundos:,.0f}\t{percentis[49] * 1000:.2f}\t{percentis[98] * 1000:.2f}"
+
+
+async def medir(linhas: int, leitores: int, segundos: float) -> str:
+    """
+    Roda leitores tarefas de leitura e uma de escrita sobre o banco de config.py por segundos.
+
+    Args:
+        linhas (int): Quantos atletas o banco tem (para sortear as leituras).
+        leitores (int): Quantas tarefas de leitura concorrentes.
+        segundos (float): Por quanto tempo medir.
+
+    Returns:
+        str: Leituras e escritas por segundo, p50 e p99 em ms e quantos erros, separados por tabulação.
+    """
+    # Importado aqui: config.py lê as variáveis de ambiente do perfil ao ser carregado
+    from sqlalchemy import exc, text
+
+    import database
+
+    consulta_pagina, consulta_cpf, insercao = text(PAGINA), text(POR_CPF), text(INSERCAO)
+    latencias_leitura, latencias_escrita, erros = [], [], []
+    fim = time.perf_counter() + segundos
+
+    async def ler(semente: int):
+        sorteio = random.Random(semente)
+        while time.perf_counter() < fim:
+            numero = sorteio.randint(1, linhas)
+            inicio = time.perf_counter()
+            try:
+                async with database.AsyncSessionLeitura() as db:
+                    if numero % 2:
+                        momento = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(1600000000 + numero)) + ".000000"
+                        (await db.execute(consulta_pagina, {"momento": momento, "id": numero})).all()
+                    else:
+                        (await db.execute(consulta_cpf, {"cpf": f"{numero:011d}"})).all()
+            except (exc.OperationalError, exc.TimeoutError) as erro:
+                erros.append(str(erro))
+                continue
+            latencias_leitura.append(time.perf_counter() - inicio)
+
+    async def escrever():
+        numero = 0
+        while time.perf_counter() < fim:
+            numero += 1
+            inicio = time.perf_counter()
+            try:
+                async with database.AsyncSessionLocal() as db:
+                    await db.execute(insercao, {
+                        "nome": f"Novo Atleta {numero}",
+                        "cpf": f"n{numero:010d}",
+                        "created_at": "2030-01-01 00:00:00.000000",
+                    })
+                    await db.commit()
+            except (exc.OperationalError, exc.TimeoutError) as erro:
+                erros.append(str(erro))
+                continue
+            latencias_escrita.append(time.perf_counter() - inicio)
+
+    await asyncio.gather(escrever(), *(ler(semente) for semente in range(leitores)))
+    await database.async_engine.dispose()
+    if database.AsyncSessionLeitura is not database.AsyncSessionLocal:
+        await database.async_engine_leitura.dispose()
+    return f"{_resumo(latencias_leitura, segundos)}\t{_resumo(latencias_escrita, segundos)}\t{len(erros)}"
+
+
+def benchmark(linhas: int = 1_000_000, leitores: int = 4, segundos: float = 10):
+    with tempfile.TemporaryDirectory() as diretorio:
+        base = os.path.join(diretorio, "base.db")
+        povoar(base, linhas)
+        print(f"# {linhas:,} atletas, {leitores} leitores e 1 escritor por {segundos:g} s", flush=True)
+        print("perfil\tleituras_por_segundo\tleitura_p50_ms\tleitura_p99_ms\tescritas_por_segundo\tescrita_p50_ms\tescrita_p99_ms\terros")
+        for nome, variaveis in PERFIS:
+            # Cada perfil parte de uma cópia do mesmo banco, em um processo com as suas configurações
+            caminho = os.path.join(diretorio, f"{nome}.db")
+            shutil.copy(base, caminho)
+            ambiente = dict(os.environ, DATABASE_ARQUIVO=caminho, DATABASE_ARQUIVO_LEITURA=caminho, **variaveis)
+            resultado = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--perfil", str(linhas), str(leitores), str(segundos)],
+                env=ambiente, capture_output=True, text=True, check=True,
+            )
+            print(f"{nome}\t{resultado.stdout.strip()}", flush=True)
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--perfil"]:
+        print(asyncio.run(medir(int(sys.argv[2]), int(sys.argv[3]), float(sys.argv[4]))))
+    else:
+        benchmark(
+            int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000,
+            int(sys.argv[2]) if len(sys.argv) > 2 else 4,
+            float(sys.argv[3]) if len(sys.argv) > 3 else 10,
+        )
\ No newline at end of file
@@ -0,0 +1,23 @@
+from decouple import config
+
+class Settings:
+    # O arquivo do banco e o lido pelo pool de leitura (o mesmo, ou uma réplica do primeiro)
+    DATABASE_ARQUIVO: str = config("DATABASE_ARQUIVO", default="./sql_app.db")
+    DATABASE_ARQUIVO_LEITURA: str = config("DATABASE_ARQUIVO_LEITURA", default=DATABASE_ARQUIVO)
+
+    # Pragmas aplicados em cada conexão aberta
+    SQLITE_JOURNAL_MODE: str = config("SQLITE_JOURNAL_MODE", default="wal")
+    SQLITE_SYNCHRONOUS: str = config("SQLITE_SYNCHRONOUS", default="normal")
+    SQLITE_CACHE_SIZE: int = config("SQLITE_CACHE_SIZE", default=-65_536, cast=int)  # negativo: em KiB
+    SQLITE_MMAP_SIZE: int = config("SQLITE_MMAP_SIZE", default=268_435_456, cast=int)
+    SQLITE_TEMP_STORE: str = config("SQLITE_TEMP_STORE", default="memory")
+    SQLITE_BUSY_TIMEOUT: int = config("SQLITE_BUSY_TIMEOUT", default=5_000, cast=int)  # ms
+
+    # Pools de conexões: o SQLite aceita um escritor por vez, então o de escrita é pequeno
+    POOL_ESCRITA: int = config("POOL_ESCRITA", default=1, cast=int)
+    POOL_LEITURA: int = config("POOL_LEITURA", default=4, cast=int)
+    POOL_TIMEOUT: int = config("POOL_TIMEOUT", default=30, cast=int)
+    # Se False, as leituras usam o pool de escrita
+    LEITURA_SEPARADA: bool = config("LEITURA_SEPARADA", default=True, cast=bool)
+
+settings = Settings()
\ No newline at end of file
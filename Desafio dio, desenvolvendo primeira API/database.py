@@ -1,17 +1,82 @@
-database.py
-
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./sql_app.db"
+from config import settings
+
+SQLALCHEMY_DATABASE_URL = f"sqlite:///{settings.DATABASE_ARQUIVO}"
+# O mesmo banco, acessado pelo driver assíncrono (aiosqlite)
+SQLALCHEMY_ASYNC_DATABASE_URL = f"sqlite+aiosqlite:///{settings.DATABASE_ARQUIVO}"
+SQLALCHEMY_ASYNC_DATABASE_URL_LEITURA = f"sqlite+aiosqlite:///{settings.DATABASE_ARQUIVO_LEITURA}"
+
+def pragmas(somente_leitura: bool = False) -> list:
+    """
+    Monta os pragmas do perfil configurado em settings.
+
+    Args:
+        somente_leitura (bool): Se a conexão é do pool de leitura (não muda o modo
+            do diário e recusa escritas).
+
+    Returns:
+        list: Os comandos PRAGMA, na ordem em que devem ser executados.
+    """
+    comandos = [
+        f"PRAGMA busy_timeout = {settings.SQLITE_BUSY_TIMEOUT}",
+        f"PRAGMA synchronous = {settings.SQLITE_SYNCHRONOUS}",
+        f"PRAGMA cache_size = {settings.SQLITE_CACHE_SIZE}",
+        f"PRAGMA mmap_size = {settings.SQLITE_MMAP_SIZE}",
+        f"PRAGMA temp_store = {settings.SQLITE_TEMP_STORE}",
+    ]
+    if somente_leitura:
+        return comandos + ["PRAGMA query_only = ON"]
+    # O modo WAL fica gravado no arquivo; com ele, leitores não bloqueiam o escritor nem o contrário
+    return [f"PRAGMA journal_mode = {settings.SQLITE_JOURNAL_MODE}"] + comandos
 
+def configurar_conexoes(engine, somente_leitura: bool = False):
+    """Aplica os pragmas a cada conexão que o motor abrir."""
+    comandos = pragmas(somente_leitura)
+
+    @event.listens_for(engine, "connect")
+    def aplicar_pragmas(conexao, _):
+        cursor = conexao.cursor()
+        for comando in comandos:
+            cursor.execute(comando)
+        cursor.close()
+
+# Motor síncrono: usado só na inicialização (criação das tabelas e do índice de texto)
 engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+configurar_conexoes(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
-    try:
+# Motores assíncronos: usados pelos endpoints, que aguardam o banco sem travar o loop de eventos.
+# As conexões ficam abertas nos pools; quem espera por uma aguarda sem bloquear.
+async_engine = create_async_engine(
+    SQLALCHEMY_ASYNC_DATABASE_URL,
+    pool_size=settings.POOL_ESCRITA,
+    max_overflow=0,
+    pool_timeout=settings.POOL_TIMEOUT,
+)
+configurar_conexoes(async_engine.sync_engine)
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+if settings.LEITURA_SEPARADA:
+    async_engine_leitura = create_async_engine(
+        SQLALCHEMY_ASYNC_DATABASE_URL_LEITURA,
+        pool_size=settings.POOL_LEITURA,
+        max_overflow=0,
+        pool_timeout=settings.POOL_TIMEOUT,
+    )
+    configurar_conexoes(async_engine_leitura.sync_engine, somente_leitura=True)
+    AsyncSessionLeitura = async_sessionmaker(async_engine_leitura, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+else:
+    AsyncSessionLeitura = AsyncSessionLocal
+
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
\ No newline at end of file
+
+async def get_db_leitura():
+    """Sessão para endpoints que só leem: usa o pool de leitura."""
+    async with AsyncSessionLeitura() as db:
+        yield db
\ No newline at end of file
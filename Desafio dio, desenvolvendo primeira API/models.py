@@ -1,6 +1,6 @@
 models.py
 
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, Float, Index, MetaData, Table, text
 from database import Base
 import datetime
 
@@ -12,6 +12,57 @@ class Atleta(Base):
     cpf = Column(String, unique=True, index=True)
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
 
+    # Ordem da paginação: permite LIMIT/OFFSET e keyset sem ordenar a tabela
+    __table_args__ = (Index("ix_atletas_created_at_id", "created_at", "id"),)
+
+# Índice de texto (SQLite FTS5) sobre atletas.nome, mantido por gatilhos.
+# O tokenizador unicode61 ignora maiúsculas e acentos ("joao" acha "João")
+# e os índices de prefixo de 2 e 3 letras aceleram buscas como "si*".
+# Fica fora do Base.metadata: quem o cria é criar_busca.
+atletas_fts = Table(
+    "atletas_fts",
+    MetaData(),
+    Column("rowid", Integer),
+    Column("nome", String),
+    Column("rank", Float),
+)
+
+DDL_BUSCA = (
+    """CREATE VIRTUAL TABLE IF NOT EXISTS atletas_fts USING fts5(
+        nome, content='atletas', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS atletas_fts_insert AFTER INSERT ON atletas BEGIN
+        INSERT INTO atletas_fts (rowid, nome) VALUES (new.id, new.nome);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS atletas_fts_delete AFTER DELETE ON atletas BEGIN
+        INSERT INTO atletas_fts (atletas_fts, rowid, nome) VALUES ('delete', old.id, old.nome);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS atletas_fts_update AFTER UPDATE OF nome ON atletas BEGIN
+        INSERT INTO atletas_fts (atletas_fts, rowid, nome) VALUES ('delete', old.id, old.nome);
+        INSERT INTO atletas_fts (rowid, nome) VALUES (new.id, new.nome);
+    END""",
+)
+
+def criar_busca(engine):
+    """Cria o índice de texto e os gatilhos; num banco que já tinha atletas, indexa os existentes."""
+    with engine.begin() as conexao:
+        existia = conexao.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'atletas_fts'")).first()
+        for comando in DDL_BUSCA:
+            conexao.exec_driver_sql(comando)
+        if not existia:
+            conexao.exec_driver_sql("INSERT INTO atletas_fts (atletas_fts) VALUES ('rebuild')")
+
+def criar_indices(engine):
+    """
+    Cria os índices de __table_args__ que faltarem: create_all só os cria
+    junto com tabelas novas, não em tabelas que já existiam.
+    """
+    with engine.begin() as conexao:
+        conexao.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_atletas_created_at_id ON atletas (created_at, id)")
+
 # Crie as tabelas no banco de dados
 from database import engine
-Base.metadata.create_all(bind=engine)
\ No newline at end of file
+Base.metadata.create_all(bind=engine)
+criar_indices(engine)
+criar_busca(engine)
\ No newline at end of file
@@ -2,7 +2,7 @@ schemas.py
 
 
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 
 class AtletaCreate(BaseModel):
     nome: str
@@ -13,4 +13,25 @@ class AtletaResponse(BaseModel):
     cpf: str
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class PaginaAtletas(BaseModel):
+    items: List[AtletaResponse]
+    total: Optional[int] = None
+    total_estimado: bool = False
+    limit: int
+    offset: Optional[int] = None
+    proximo_cursor: Optional[str] = None
+
+class ResultadoLinhaBulk(BaseModel):
+    linha: int
+    status: str
+    cpf: Optional[str] = None
+    id: Optional[int] = None
+    erro: Optional[str] = None
+
+class ResultadoBulk(BaseModel):
+    criados: int
+    duplicados: int
+    invalidos: int
+    linhas: List[ResultadoLinhaBulk]
\ No newline at end of file
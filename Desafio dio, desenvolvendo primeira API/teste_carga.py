@@ -0,0 +1,112 @@
+"""
+Teste de carga da API de atletas: clientes concorrentes fazendo requisições
+sem parar, cada um em sua conexão keep-alive, medindo requisições por
+segundo e as latências p50/p99 em cada nível de concorrência.
+
+Suba o servidor antes (ex.: uvicorn main:app) com o banco já povoado.
+O cliente é HTTP/1.1 direto sobre asyncio, para pesar pouco ao lado do servidor.
+
+Uso: python teste_carga.py [url] [clientes,clientes,...] [segundos]
+     (padrão: http://127.0.0.1:8000 100,250,500,1000 10)
+"""
+import asyncio
+import statistics
+import sys
+import time
+from urllib.parse import urlsplit
+
+# Mistura de requisições: páginas da listagem, buscas por nome e por CPF
+CAMINHOS = (
+    "/atletas/?limit=50&contagem=estimada",
+    "/atletas/?limit=50&offset=5000&contagem=estimada",
+    "/atletas/?nome=silva&limit=20",
+    "/atletas/?limit=50&contagem=estimada",
+    "/atletas/?cpf=00000012345",
+    "/atletas/?nome=maria%20souza&limit=20&contagem=nenhuma",
+)
+# Uma requisição sem resposta depois disso conta como erro e fecha a conexão
+TEMPO_LIMITE = 30
+
+
+async def _requisitar(leitor, escritor, pedido: bytes) -> int:
+    """Envia um pedido já montado e lê a resposta inteira; retorna o status."""
+    escritor.write(pedido)
+    await escritor.drain()
+    status = int((await leitor.readline()).split()[1])
+    tamanho = 0
+    while (linha := await leitor.readline()) not in (b"\r\n", b""):
+        nome, _, valor = linha.partition(b":")
+        if nome.lower() == b"content-length":
+            tamanho = int(valor)
+    await leitor.readexactly(tamanho)
+    return status
+
+
+async def _cliente(numero: int, host: str, porta: int, fim: float, latencias: list, erros: list):
+    leitor, escritor = await asyncio.open_connection(host, porta)
+    pedidos = [f"GET {caminho} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode() for caminho in CAMINHOS]
+    indice = numero
+    try:
+        while time.perf_counter() < fim:
+            inicio = time.perf_counter()
+            try:
+                status = await asyncio.wait_for(_requisitar(leitor, escritor, pedidos[indice % len(pedidos)]), TEMPO_LIMITE)
+            except asyncio.TimeoutError:
+                erros.append("tempo esgotado")
+                return
+            latencias.append(time.perf_counter() - inicio)
+            if status != 200:
+                erros.append(status)
+            indice += 1
+    finally:
+        escritor.close()
+
+
+async def medir(url: str, clientes: int, segundos: float) -> dict:
+    """
+    Roda clientes conexões concorrentes contra a API por segundos.
+
+    Args:
+        url (str): O endereço do servidor, ex.: http://127.0.0.1:8000.
+        clientes (int): Quantas conexões simultâneas.
+        segundos (float): Por quanto tempo fazer requisições.
+
+    Returns:
+        dict: Requisições por segundo, latências p50, p99 e máxima em ms e quantos erros
+            (respostas diferentes de 200 ou sem resposta em TEMPO_LIMITE segundos).
+    """
+    endereco = urlsplit(url)
+    latencias, erros = [], []
+    inicio = time.perf_counter()
+    fim = inicio + segundos
+    await asyncio.gather(*(
+        _cliente(numero, endereco.hostname, endereco.port or 80, fim, latencias, erros)
+        for numero in range(clientes)
+    ))
+    decorrido = time.perf_counter() - inicio
+    percentis = statistics.quantiles(latencias, n=100) if len(latencias) > 1 else [float("nan")] * 99
+    return {
+        "requisicoes_por_segundo": len(latencias) / decorrido,
+        "p50_ms": percentis[49] * 1000,
+        "p99_ms": percentis[98] * 1000,
+        "maximo_ms": max(latencias, default=float("nan")) * 1000,
+        "erros": len(erros),
+    }
+
+
+def main():
+    url = sys.argv[1] if len(sys.argv) > 1 else "http://127.0.0.1:8000"
+    niveis = [int(nivel) for nivel in sys.argv[2].split(",")] if len(sys.argv) > 2 else [100, 250, 500, 1000]
+    segundos = float(sys.argv[3]) if len(sys.argv) > 3 else 10
+    print("clientes\trequisicoes_por_segundo\tp50_ms\tp99_ms\tmaximo_ms\terros")
+    for clientes in niveis:
+        resultado = asyncio.run(medir(url, clientes, segundos))
+        print(
+            f"{clientes}\t{resultado['requisicoes_por_segundo']:,.0f}\t{resultado['p50_ms']:.1f}"
+            f"\t{resultado['p99_ms']:.1f}\t{resultado['maximo_ms']:.1f}\t{resultado['erros']}",
+            flush=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
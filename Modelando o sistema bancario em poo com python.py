@@ -1,12 +1,158 @@
+import itertools
+import os
+import sys
+import threading
+import time
 from abc import ABC, abstractmethod, abstractproperty
-from datetime import datetime
-from enum import Enum
+from array import array
+from collections.abc import Sequence
+from contextlib import redirect_stdout
+from datetime import date, datetime, timedelta
+from enum import Enum, IntEnum
+from io import StringIO
+from typing import TYPE_CHECKING
+
+import diario
+from dinheiro import Dinheiro
+
+if TYPE_CHECKING:
+    # Só para as anotações: os módulos de apoio são importados nas funções que os usam
+    import instantaneo
+    import instrumentacao
+    import particoes
+    import servico
 
 
 # 1. ENUM para Tipos de Transação
 class TipoTransacao(Enum):
     DEPOSITO = "Depósito"
     SAQUE = "Saque"
+    TRANSFERENCIA_ENVIADA = "Transferência enviada"
+    TRANSFERENCIA_RECEBIDA = "Transferência recebida"
+
+
+# Código numérico de cada tipo, usado pelo histórico colunar
+TIPOS_TRANSACAO = tuple(TipoTransacao)
+CODIGO_TIPO = {tipo: codigo for codigo, tipo in enumerate(TIPOS_TRANSACAO)}
+# Efeito de cada código no saldo (1 credita, -1 debita), usado pelas análises (analise.py)
+SINAL_CODIGO = tuple(
+    -1 if tipo in (TipoTransacao.SAQUE, TipoTransacao.TRANSFERENCIA_ENVIADA) else 1
+    for tipo in TIPOS_TRANSACAO
+)
+
+# Correspondência entre os tipos de transação e os tipos de registro do diário
+CODIGO_DIARIO = {
+    TipoTransacao.DEPOSITO: diario.DEPOSITO,
+    TipoTransacao.SAQUE: diario.SAQUE,
+    TipoTransacao.TRANSFERENCIA_ENVIADA: diario.TRANSFERENCIA_ENVIADA,
+    TipoTransacao.TRANSFERENCIA_RECEBIDA: diario.TRANSFERENCIA_RECEBIDA,
+}
+TIPO_DO_DIARIO = {codigo: tipo for tipo, codigo in CODIGO_DIARIO.items()}
+
+
+# 2. ENUM para o resultado de uma operação
+class ResultadoOperacao(IntEnum):
+    SUCESSO = 0
+    SALDO_INSUFICIENTE = 1
+    LIMITE_EXCEDIDO = 2
+    SAQUES_EXCEDIDOS = 3
+    VALOR_INVALIDO = 4
+    CONTA_INEXISTENTE = 5
+
+
+# 3. Saídas de eventos: para onde vão os resultados das operações
+def formatar_evento(conta, tipo: TipoTransacao, resultado: ResultadoOperacao, valor: Dinheiro) -> str:
+    """
+    Monta a mensagem exibida ao usuário para o resultado de uma operação.
+
+    Args:
+        conta (Conta): A conta onde a operação foi feita.
+        tipo (TipoTransacao): O tipo da operação.
+        resultado (ResultadoOperacao): O resultado da operação.
+        valor (Dinheiro): O valor da operação.
+
+    Returns:
+        str: A mensagem, já com as quebras de linha usadas no console.
+    """
+    if resultado == ResultadoOperacao.SUCESSO and tipo is TipoTransacao.TRANSFERENCIA_ENVIADA:
+        return "\n✅ Transferência realizada com sucesso! ✅\n"
+    if resultado == ResultadoOperacao.SUCESSO:
+        return f"\n✅ {tipo.value} realizado com sucesso! ✅\n"
+    if resultado == ResultadoOperacao.SALDO_INSUFICIENTE:
+        return "\n❌ Operação falhou! Saldo insuficiente. ❌\n"
+    if resultado == ResultadoOperacao.LIMITE_EXCEDIDO:
+        return f"\n❌ Operação falhou! O valor do saque (R$ {valor:.2f}) excede o limite de R$ {conta.limite:.2f}. ❌\n"
+    if resultado == ResultadoOperacao.SAQUES_EXCEDIDOS:
+        return f"\n❌ Operação falhou! Número máximo de saques ({conta.limite_saques}) excedido. ❌\n"
+    return "\n❌ Operação falhou! O valor informado é inválido. ❌\n"
+
+
+class SaidaEventos(ABC):
+    """
+    Classe abstrata base para os destinos dos resultados das operações.
+    As contas emitem um evento por operação; a saída decide o que fazer com ele.
+    """
+    @abstractmethod
+    def emitir(self, conta, tipo: TipoTransacao, resultado: ResultadoOperacao, valor: Dinheiro):
+        """
+        Recebe o resultado de uma operação.
+
+        Args:
+            conta (Conta): A conta onde a operação foi feita.
+            tipo (TipoTransacao): O tipo da operação.
+            resultado (ResultadoOperacao): O resultado da operação.
+            valor (Dinheiro): O valor da operação.
+        """
+        pass
+
+
+class SaidaConsole(SaidaEventos):
+    """
+    Imprime cada resultado no console assim que ele acontece.
+    """
+    def emitir(self, conta, tipo: TipoTransacao, resultado: ResultadoOperacao, valor: Dinheiro):
+        """Imprime a mensagem do resultado."""
+        sys.stdout.write(formatar_evento(conta, tipo, resultado, valor))
+
+
+class SaidaBuffer(SaidaEventos):
+    """
+    Acumula os resultados e os escreve de uma vez, em bloco.
+    As mensagens só são formatadas no momento da descarga.
+    """
+    def __init__(self, arquivo=None, capacidade: int = 4096):
+        """
+        Inicializa uma nova saída com buffer.
+
+        Args:
+            arquivo (TextIO): Onde as mensagens serão escritas. Por padrão, sys.stdout.
+            capacidade (int): Quantos eventos acumular antes de descarregar.
+        """
+        self._arquivo = arquivo
+        self._capacidade = capacidade
+        self._eventos = []
+
+    def emitir(self, conta, tipo: TipoTransacao, resultado: ResultadoOperacao, valor: Dinheiro):
+        """Guarda o evento, descarregando o buffer quando ele enche."""
+        self._eventos.append((conta, tipo, resultado, valor))
+        if len(self._eventos) >= self._capacidade:
+            self.descarregar()
+
+    def descarregar(self):
+        """Escreve todos os eventos acumulados de uma só vez."""
+        eventos, self._eventos = self._eventos, []
+        if eventos:
+            arquivo = self._arquivo or sys.stdout
+            arquivo.write("".join([formatar_evento(*evento) for evento in eventos]))
+
+
+class SaidaNula(SaidaEventos):
+    """
+    Descarta os resultados. Usada quando só o valor de retorno importa.
+    """
+    def emitir(self, conta, tipo: TipoTransacao, resultado: ResultadoOperacao, valor: Dinheiro):
+        """Não faz nada."""
+        pass
 
 
 class Cliente:
@@ -14,6 +160,8 @@ class Cliente:
     Representa um cliente do banco.
     Um cliente possui um endereço e uma lista de contas.
     """
+    __slots__ = ("endereco", "contas")
+
     def __init__(self, endereco: str):
         self.endereco = endereco
         self.contas = []
@@ -42,6 +190,8 @@ class PessoaFisica(Cliente):
     """
     Representa uma pessoa física, que é um tipo de cliente.
     """
+    __slots__ = ("nome", "data_nascimento", "cpf")
+
     def __init__(self, nome: str, data_nascimento: str, cpf: str, endereco: str):
         """
         Inicializa uma nova instância de PessoaFisica.
@@ -58,11 +208,59 @@ class PessoaFisica(Cliente):
         self.cpf = cpf
 
 
+# Valores imutáveis compartilhados por todas as contas em vez de uma cópia por instância
+AGENCIA_PADRAO = sys.intern("0001")
+_SALDO_ZERADO = Dinheiro()
+
+
+class ProdutoConta:
+    """
+    Configuração de um produto de conta corrente: limite por saque e número
+    de saques por dia. Há uma única instância por configuração, compartilhada
+    por todas as contas que a usam; para mudar a configuração de uma conta,
+    troca-se o produto em vez de alterá-lo.
+    """
+    __slots__ = ("limite", "limite_saques")
+    _instancias = {}
+
+    def __new__(cls, limite: float = 500, limite_saques: int = 3):
+        """
+        Retorna o produto com a configuração informada, criando-o se necessário.
+
+        Args:
+            limite (float): O limite máximo por saque.
+            limite_saques (int): O número máximo de saques permitidos por dia.
+        """
+        limite = Dinheiro(limite)
+        chave = (limite.centavos, limite_saques)
+        produto = cls._instancias.get(chave)
+        if produto is None:
+            produto = object.__new__(cls)
+            produto.limite = limite
+            produto.limite_saques = limite_saques
+            produto = cls._instancias.setdefault(chave, produto)
+        return produto
+
+    def __repr__(self) -> str:
+        return f"ProdutoConta(limite={self.limite!r}, limite_saques={self.limite_saques})"
+
+
 class Conta:
     """
     Classe base para representar uma conta bancária.
     Gerencia saldo, número, agência, cliente e histórico de transações.
+    Cada conta tem sua própria trava, que serializa as alterações; o saldo
+    pode ser lido a qualquer momento sem travar.
     """
+    # Campos fixos em slots; o __dict__ só é alocado se saida ou diario forem trocados na conta
+    __slots__ = ("_saldo", "_numero", "_agencia", "_cliente", "_historico", "_trava", "__dict__")
+    # Implementação de histórico criada no primeiro uso do histórico de cada conta (ex.: HistoricoColunar)
+    classe_historico = None
+    # Destino dos resultados das operações; pode ser trocado por conta
+    saida = SaidaConsole()
+    # Diário em disco (diario.Diario) onde as operações aceitas são gravadas
+    diario = None
+
     def __init__(self, numero: int, cliente: Cliente):
         """
         Inicializa uma nova instância de Conta.
@@ -71,28 +269,30 @@ class Conta:
             numero (int): O número da conta.
             cliente (Cliente): O cliente associado a esta conta.
         """
-        self._saldo = 0
+        self._saldo = _SALDO_ZERADO
         self._numero = numero
-        self._agencia = "0001"
+        self._agencia = AGENCIA_PADRAO
         self._cliente = cliente
-        self._historico = Historico()
+        self._historico = None  # criado no primeiro uso: contas sem movimento não pagam por ele
+        self._trava = threading.RLock()
 
     @classmethod
-    def nova_conta(cls, cliente: Cliente, numero: int):
+    def nova_conta(cls, cliente: Cliente, numero: int, **configuracao):
         """
         Cria uma nova instância de conta.
 
         Args:
             cliente (Cliente): O cliente para associar à conta.
             numero (int): O número da nova conta.
+            **configuracao: Parâmetros próprios da classe (ex.: limite e limite_saques).
 
         Returns:
             Conta: Uma nova instância da classe Conta.
         """
-        return cls(numero, cliente)
+        return cls(numero, cliente, **configuracao)
 
     @property
-    def saldo(self) -> float:
+    def saldo(self) -> Dinheiro:
         """Retorna o saldo atual da conta."""
         return self._saldo
 
@@ -114,55 +314,157 @@ class Conta:
     @property
     def historico(self):
         """Retorna o histórico de transações da conta."""
-        return self._historico
+        historico = self._historico
+        if historico is None:
+            with self._trava:
+                if self._historico is None:
+                    self._historico = (self.classe_historico or Historico)()
+                historico = self._historico
+        return historico
 
-    def sacar(self, valor: float) -> bool:
+    @property
+    def trava(self) -> threading.RLock:
+        """Retorna a trava que serializa as alterações da conta."""
+        return self._trava
+
+    def sacar(self, valor) -> bool:
         """
-        Realiza um saque na conta.
+        Realiza um saque na conta. O saque aceito entra no histórico e passa
+        a contar no limite diário de saques.
 
         Args:
-            valor (float): O valor a ser sacado.
+            valor (Dinheiro | float): O valor a ser sacado.
 
         Returns:
             bool: True se o saque for bem-sucedido, False caso contrário.
         """
-        saldo = self.saldo
-        excedeu_saldo = valor > saldo
+        valor = Dinheiro(valor)
+        with self._trava:
+            # Contador diário mantido pelo histórico: O(1), independe do tamanho do histórico
+            resultado = self._validar_saque(
+                valor, self._saldo, self.historico.contagem_do_dia(TipoTransacao.SAQUE)
+            )
+            if resultado == ResultadoOperacao.SUCESSO:
+                # Diário antes do saldo: se a gravação falhar, a conta fica como estava
+                self._gravar_no_diario(TipoTransacao.SAQUE, valor)
+                self._saldo -= valor
+                # Sob a mesma trava: o saque já conta no limite diário do próximo
+                self.historico.adicionar_lancamento(TipoTransacao.SAQUE, valor)
+        self._emitir(TipoTransacao.SAQUE, resultado, valor)
+        return resultado == ResultadoOperacao.SUCESSO
+
+    def depositar(self, valor) -> bool:
+        """
+        Realiza um depósito na conta. O depósito aceito entra no histórico.
 
-        if excedeu_saldo:
-            print("\n❌ Operação falhou! Saldo insuficiente. ❌")
-        elif valor <= 0:
-            print("\n❌ Operação falhou! O valor informado é inválido. ❌")
-        else:
-            self._saldo -= valor
-            print("\n✅ Saque realizado com sucesso! ✅")
-            return True
-        return False
+        Args:
+            valor (Dinheiro | float): O valor a ser depositado.
 
-    def depositar(self, valor: float) -> bool:
+        Returns:
+            bool: True se o depósito for bem-sucedido, False caso contrário.
+        """
+        valor = Dinheiro(valor)
+        resultado = self._validar_deposito(valor)
+        if resultado == ResultadoOperacao.SUCESSO:
+            with self._trava:
+                self._gravar_no_diario(TipoTransacao.DEPOSITO, valor)
+                self._saldo += valor
+                self.historico.adicionar_lancamento(TipoTransacao.DEPOSITO, valor)
+        self._emitir(TipoTransacao.DEPOSITO, resultado, valor)
+        return resultado == ResultadoOperacao.SUCESSO
+
+    def _emitir(self, tipo: TipoTransacao, resultado: ResultadoOperacao, valor: Dinheiro):
+        """Envia o resultado de uma operação para a saída da conta."""
+        self.saida.emitir(self, tipo, resultado, valor)
+
+    def _gravar_no_diario(self, tipo: TipoTransacao, valor: Dinheiro):
+        """
+        Grava a operação no diário em disco, se a conta tiver um. Chamado antes
+        de alterar a conta, que só muda se a gravação der certo.
         """
-        Realiza um depósito na conta.
+        if self.diario is not None:
+            self.diario.registrar(CODIGO_DIARIO[tipo], self._numero, valor.centavos)
+
+    def _validar_saque(self, valor: Dinheiro, saldo: Dinheiro, saques_no_dia: int) -> ResultadoOperacao:
+        """
+        Aplica as regras de saque sem alterar a conta.
 
         Args:
-            valor (float): O valor a ser depositado.
+            valor (Dinheiro): O valor a ser sacado.
+            saldo (Dinheiro): O saldo considerado na validação.
+            saques_no_dia (int): Quantos saques já foram feitos no dia.
 
         Returns:
-            bool: True se o depósito for bem-sucedido, False caso contrário.
+            ResultadoOperacao: SUCESSO ou o motivo da recusa.
         """
+        if valor > saldo:
+            return ResultadoOperacao.SALDO_INSUFICIENTE
+        if valor <= 0:
+            return ResultadoOperacao.VALOR_INVALIDO
+        return ResultadoOperacao.SUCESSO
+
+    def _validar_deposito(self, valor: Dinheiro) -> ResultadoOperacao:
+        """Aplica as regras de depósito sem alterar a conta."""
         if valor > 0:
-            self._saldo += valor
-            print("\n✅ Depósito realizado com sucesso! ✅")
-            return True
-        else:
-            print("\n❌ Operação falhou! O valor informado é inválido. ❌")
-            return False
+            return ResultadoOperacao.SUCESSO
+        return ResultadoOperacao.VALOR_INVALIDO
+
+    def aplicar_lote(self, transacoes) -> array:
+        """
+        Aplica um lote de transações em uma única passada, sem saída no console.
+        Cada transação é validada contra o saldo e os limites resultantes das
+        anteriores; as recusadas são ignoradas e as aceitas vão para o
+        histórico de uma só vez. Se o diário falhar no meio do lote, a conta
+        fica só com as transações já gravadas e o erro sobe.
+
+        Args:
+            transacoes (Iterable[Transacao]): Saques e depósitos, em ordem.
+
+        Returns:
+            array: Um ResultadoOperacao (array 'b') por transação, na mesma ordem.
+        """
+        resultados = array("b")
+        aceitas = []
+        sucesso = ResultadoOperacao.SUCESSO
+
+        with self._trava:
+            saldo = self._saldo
+            saques_no_dia = self.historico.contagem_do_dia(TipoTransacao.SAQUE)
+            try:
+                for transacao in transacoes:
+                    valor = transacao.valor
+                    saque = transacao.tipo is TipoTransacao.SAQUE
+                    if saque:
+                        resultado = self._validar_saque(valor, saldo, saques_no_dia)
+                    elif transacao.tipo is TipoTransacao.DEPOSITO:
+                        resultado = self._validar_deposito(valor)
+                    else:
+                        # Transferências envolvem outra conta e não entram no lote
+                        resultado = ResultadoOperacao.VALOR_INVALIDO
+                    resultados.append(resultado)
+                    if resultado == sucesso:
+                        # Diário antes do saldo: só conta o que foi gravado
+                        self._gravar_no_diario(transacao.tipo, valor)
+                        aceitas.append(transacao)
+                        if saque:
+                            saldo -= valor
+                            saques_no_dia += 1
+                        else:
+                            saldo += valor
+            finally:
+                self._saldo = saldo
+                self.historico.adicionar_transacoes(aceitas)
+        return resultados
 
 
 class ContaCorrente(Conta):
     """
     Representa uma conta corrente, um tipo específico de conta.
-    Possui limite de saque e limite de número de saques diários.
+    Possui limite de saque e limite de número de saques diários, guardados
+    em um ProdutoConta compartilhado com as demais contas de mesma configuração.
     """
+    __slots__ = ("_produto",)
+
     def __init__(self, numero: int, cliente: Cliente, limite: float = 500, limite_saques: int = 3):
         """
         Inicializa uma nova instância de ContaCorrente.
@@ -174,34 +476,39 @@ class ContaCorrente(Conta):
             limite_saques (int): O número máximo de saques permitidos por dia.
         """
         super().__init__(numero, cliente)
-        self.limite = limite
-        self.limite_saques = limite_saques
-
-    def sacar(self, valor: float) -> bool:
-        """
-        Realiza um saque na conta corrente, considerando limites e número de saques.
+        self._produto = ProdutoConta(limite, limite_saques)
 
-        Args:
-            valor (float): O valor a ser sacado.
+    @property
+    def produto(self) -> "ProdutoConta":
+        """Retorna a configuração (compartilhada) da conta."""
+        return self._produto
 
-        Returns:
-            bool: True se o saque for bem-sucedido, False caso contrário.
-        """
-        # Uso do Enum para filtrar transações de saque
-        numero_saques = len(
-            [transacao for transacao in self.historico.transacoes if transacao["tipo"] == TipoTransacao.SAQUE.value]
-        )
+    @property
+    def limite(self) -> Dinheiro:
+        """Retorna o limite máximo por saque."""
+        return self._produto.limite
 
-        excedeu_limite = valor > self.limite
-        excedeu_saques = numero_saques >= self.limite_saques
+    @limite.setter
+    def limite(self, limite: float):
+        self._produto = ProdutoConta(limite, self._produto.limite_saques)
 
-        if excedeu_limite:
-            print(f"\n❌ Operação falhou! O valor do saque (R$ {valor:.2f}) excede o limite de R$ {self.limite:.2f}. ❌")
-        elif excedeu_saques:
-            print(f"\n❌ Operação falhou! Número máximo de saques ({self.limite_saques}) excedido. ❌")
-        else:
-            return super().sacar(valor)
-        return False
+    @property
+    def limite_saques(self) -> int:
+        """Retorna o número máximo de saques permitidos por dia."""
+        return self._produto.limite_saques
+
+    @limite_saques.setter
+    def limite_saques(self, limite_saques: int):
+        self._produto = ProdutoConta(self._produto.limite, limite_saques)
+
+    def _validar_saque(self, valor: Dinheiro, saldo: Dinheiro, saques_no_dia: int) -> ResultadoOperacao:
+        """Acrescenta às regras da conta o limite por saque e o limite de saques diários."""
+        produto = self._produto
+        if valor > produto.limite:
+            return ResultadoOperacao.LIMITE_EXCEDIDO
+        if saques_no_dia >= produto.limite_saques:
+            return ResultadoOperacao.SAQUES_EXCEDIDOS
+        return super()._validar_saque(valor, saldo, saques_no_dia)
 
     def __str__(self) -> str:
         """
@@ -218,16 +525,74 @@ class ContaCorrente(Conta):
 class Historico:
     """
     Gerencia o histórico de transações de uma conta.
+    Mantém contagens e somas por tipo de transação, atualizadas a cada
+    inclusão, além de uma janela com os totais do dia corrente.
     """
+    __slots__ = ("_transacoes", "_contagem", "_soma", "_dia", "_contagem_dia", "_soma_dia")
+
     def __init__(self):
         """Inicializa um novo histórico de transações."""
         self._transacoes = []
+        self._contagem = dict.fromkeys(TipoTransacao, 0)
+        self._soma = dict.fromkeys(TipoTransacao, Dinheiro())
+        self._dia = None
+        self._contagem_dia = dict.fromkeys(TipoTransacao, 0)
+        self._soma_dia = dict.fromkeys(TipoTransacao, Dinheiro())
 
     @property
     def transacoes(self) -> list:
         """Retorna a lista de transações."""
         return self._transacoes
 
+    def contagem(self, tipo: TipoTransacao) -> int:
+        """Retorna quantas transações do tipo informado foram registradas."""
+        return self._contagem[tipo]
+
+    def soma(self, tipo: TipoTransacao) -> Dinheiro:
+        """Retorna a soma dos valores das transações do tipo informado."""
+        return self._soma[tipo]
+
+    def contagem_do_dia(self, tipo: TipoTransacao, dia: date = None) -> int:
+        """
+        Retorna quantas transações do tipo informado ocorreram no dia.
+
+        Args:
+            tipo (TipoTransacao): O tipo de transação.
+            dia (date): O dia consultado. Por padrão, o dia de hoje.
+        """
+        if (dia or date.today()) != self._dia:
+            return 0
+        return self._contagem_dia[tipo]
+
+    def soma_do_dia(self, tipo: TipoTransacao, dia: date = None) -> Dinheiro:
+        """
+        Retorna a soma dos valores do tipo informado no dia.
+
+        Args:
+            tipo (TipoTransacao): O tipo de transação.
+            dia (date): O dia consultado. Por padrão, o dia de hoje.
+        """
+        if (dia or date.today()) != self._dia:
+            return Dinheiro()
+        return self._soma_dia[tipo]
+
+    def janela_do_dia(self, tipo: TipoTransacao) -> tuple:
+        """
+        Retorna (dia, contagem, soma) do tipo informado no último dia com
+        transações, ou (None, 0, Dinheiro()) se não houve nenhuma.
+        """
+        return self._dia, self._contagem_dia[tipo], self._soma_dia[tipo]
+
+    def retomar_janela_do_dia(self, dia: date, tipo: TipoTransacao, contagem: int, soma: Dinheiro):
+        """
+        Restaura a contagem e a soma do tipo no dia sem as transações, como
+        ao abrir um instantâneo, que não guarda o histórico.
+        """
+        if dia != self._dia:
+            self._virar_dia(dia)
+        self._contagem_dia[tipo] = contagem
+        self._soma_dia[tipo] = soma
+
     def adicionar_transacao(self, transacao):
         """
         Adiciona uma transação ao histórico.
@@ -235,23 +600,209 @@ class Historico:
         Args:
             transacao (Transacao): A transação a ser adicionada.
         """
-        self._transacoes.append(
-            {
-                "tipo": transacao.tipo.value,  # Acessa o valor do Enum
-                "valor": transacao.valor,
-                "data": datetime.now().strftime("%d-%m-%Y %H:%M:%S"),
-            }
+        self.adicionar_lancamento(transacao.tipo, transacao.valor)
+
+    def adicionar_lancamento(self, tipo: TipoTransacao, valor: Dinheiro, vinculo: int = None, instante: int = None):
+        """
+        Adiciona ao histórico um lançamento avulso, sem objeto Transacao.
+
+        Args:
+            tipo (TipoTransacao): O tipo do lançamento.
+            valor (Dinheiro): O valor do lançamento.
+            vinculo (int): Identificador que liga os dois lados de uma transferência.
+            instante (int): Quando ocorreu, em ns desde a época. Por padrão, agora.
+        """
+        agora = datetime.now() if instante is None else datetime.fromtimestamp(instante / 1e9)
+        transacao = {
+            "tipo": tipo.value,  # Acessa o valor do Enum
+            "valor": valor,
+            "data": agora.strftime("%d-%m-%Y %H:%M:%S"),
+        }
+        if vinculo is not None:
+            transacao["transferencia"] = vinculo
+        self._transacoes.append(transacao)
+        self._contabilizar(tipo, valor, agora.date())
+
+    def adicionar_transacoes(self, transacoes):
+        """
+        Adiciona várias transações de uma vez, todas com o mesmo horário.
+
+        Args:
+            transacoes (list[Transacao]): As transações a serem adicionadas.
+        """
+        agora = datetime.now()
+        data = agora.strftime("%d-%m-%Y %H:%M:%S")
+        dia = agora.date()
+        self._transacoes.extend(
+            {"tipo": transacao.tipo.value, "valor": transacao.valor, "data": data}
+            for transacao in transacoes
+        )
+        for transacao in transacoes:
+            self._contabilizar(transacao.tipo, transacao.valor, dia)
+
+    def colunas(self, inicio: int = 0, fim: int = None) -> tuple:
+        """
+        Exporta as transações das posições inicio a fim (exclusive) em colunas
+        tipadas, no mesmo formato do HistoricoColunar (para analise.py e exportacao.py).
+
+        Args:
+            inicio (int): A posição da primeira transação exportada.
+            fim (int): A posição onde parar; None vai até o fim.
+
+        Returns:
+            tuple: (códigos de tipo array('B'), centavos array('q'), instantes em ns array('q')).
+        """
+        transacoes = self._transacoes[inicio:fim]
+        instantes = {}  # as datas se repetem muito; cada uma é convertida uma vez
+        for transacao in transacoes:
+            data = transacao["data"]
+            if data not in instantes:
+                instantes[data] = int(datetime.strptime(data, "%d-%m-%Y %H:%M:%S").timestamp()) * 1_000_000_000
+        return (
+            array("B", (CODIGO_TIPO[TipoTransacao(transacao["tipo"])] for transacao in transacoes)),
+            array("q", (transacao["valor"].centavos for transacao in transacoes)),
+            array("q", (instantes[transacao["data"]] for transacao in transacoes)),
         )
 
+    def _contabilizar(self, tipo: TipoTransacao, valor: Dinheiro, dia: date):
+        """Atualiza os totais gerais e a janela do dia com uma nova transação."""
+        self._contagem[tipo] += 1
+        self._soma[tipo] += valor
+        if dia != self._dia:
+            self._virar_dia(dia)
+        self._contagem_dia[tipo] += 1
+        self._soma_dia[tipo] += valor
+
+    def _virar_dia(self, dia: date):
+        """Virada de dia: a janela recomeça do zero."""
+        self._dia = dia
+        self._contagem_dia = dict.fromkeys(TipoTransacao, 0)
+        self._soma_dia = dict.fromkeys(TipoTransacao, Dinheiro())
+
+
+class HistoricoColunar(Historico):
+    """
+    Histórico armazenado em colunas tipadas em vez de uma lista de dicionários.
+    Guarda o código do tipo (array 'B'), o valor em centavos (array 'q') e o
+    instante em nanossegundos desde a época (array 'q'). As datas só são
+    formatadas quando alguém lê as transações.
+    """
+    __slots__ = (
+        "_tipos", "_centavos", "_instantes", "_vinculos",
+        "_inicio_dia_ns", "_fim_dia_ns", "_dia_atual",
+    )
+
+    def __init__(self):
+        """Inicializa um novo histórico colunar vazio."""
+        super().__init__()
+        self._transacoes = None
+        self._tipos = array("B")
+        self._centavos = array("q")
+        self._instantes = array("q")
+        self._vinculos = {}  # esparso: posição -> id da transferência
+        self._inicio_dia_ns = 0
+        self._fim_dia_ns = 0
+        self._dia_atual = None
+
+    @property
+    def transacoes(self) -> Sequence:
+        """Retorna uma visão somente leitura das transações, montada sob demanda."""
+        return _VisaoTransacoes(self)
+
+    def adicionar_transacao(self, transacao):
+        """
+        Adiciona uma transação ao histórico.
+
+        Args:
+            transacao (Transacao): A transação a ser adicionada.
+        """
+        self.adicionar_lancamento(transacao.tipo, transacao.valor)
+
+    def adicionar_lancamento(self, tipo: TipoTransacao, valor: Dinheiro, vinculo: int = None, instante: int = None):
+        """
+        Adiciona ao histórico um lançamento avulso, sem objeto Transacao.
+
+        Args:
+            tipo (TipoTransacao): O tipo do lançamento.
+            valor (Dinheiro): O valor do lançamento.
+            vinculo (int): Identificador que liga os dois lados de uma transferência.
+            instante (int): Quando ocorreu, em ns desde a época. Por padrão, agora.
+        """
+        if instante is None:
+            instante = time.time_ns()
+        if vinculo is not None:
+            self._vinculos[len(self._tipos)] = vinculo
+        self._tipos.append(CODIGO_TIPO[tipo])
+        self._centavos.append(valor.centavos)
+        self._instantes.append(instante)
+        self._contabilizar(tipo, valor, self._dia_do_instante(instante))
+
+    def adicionar_transacoes(self, transacoes):
+        """
+        Adiciona várias transações de uma vez, todas com o mesmo instante.
+
+        Args:
+            transacoes (list[Transacao]): As transações a serem adicionadas.
+        """
+        instante = time.time_ns()
+        dia = self._dia_do_instante(instante)
+        self._tipos.extend(CODIGO_TIPO[transacao.tipo] for transacao in transacoes)
+        self._centavos.extend(transacao.valor.centavos for transacao in transacoes)
+        self._instantes.extend(array("q", [instante]) * len(transacoes))
+        for transacao in transacoes:
+            self._contabilizar(transacao.tipo, transacao.valor, dia)
+
+    def colunas(self, inicio: int = 0, fim: int = None) -> tuple:
+        """Copia as colunas das posições inicio a fim (ver Historico.colunas)."""
+        return self._tipos[inicio:fim], self._centavos[inicio:fim], self._instantes[inicio:fim]
+
+    def _dia_do_instante(self, instante: int) -> date:
+        """Converte um instante em dia, recalculando apenas na virada do dia."""
+        if not self._inicio_dia_ns <= instante < self._fim_dia_ns:
+            dia = datetime.fromtimestamp(instante / 1e9).date()
+            inicio = datetime(dia.year, dia.month, dia.day)
+            self._dia_atual = dia
+            self._inicio_dia_ns = int(inicio.timestamp()) * 1_000_000_000
+            self._fim_dia_ns = int((inicio + timedelta(days=1)).timestamp()) * 1_000_000_000
+        return self._dia_atual
+
+
+class _VisaoTransacoes(Sequence):
+    """Visão preguiçosa das colunas de um HistoricoColunar no formato de dicionários."""
+    def __init__(self, historico: HistoricoColunar):
+        self._historico = historico
+
+    def __len__(self) -> int:
+        return len(self._historico._tipos)
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [self[i] for i in range(*indice.indices(len(self)))]
+        historico = self._historico
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError("índice fora do histórico")
+        transacao = {
+            "tipo": TIPOS_TRANSACAO[historico._tipos[indice]].value,
+            "valor": Dinheiro.de_centavos(historico._centavos[indice]),
+            "data": datetime.fromtimestamp(historico._instantes[indice] / 1e9).strftime("%d-%m-%Y %H:%M:%S"),
+        }
+        if indice in historico._vinculos:
+            transacao["transferencia"] = historico._vinculos[indice]
+        return transacao
+
 
 class Transacao(ABC):
     """
     Classe abstrata base para todas as transações.
     Define a interface para transações (valor e registro).
     """
+    __slots__ = ()
+
     @property
     @abstractproperty
-    def valor(self) -> float:
+    def valor(self) -> Dinheiro:
         """Retorna o valor da transação."""
         pass
 
@@ -276,6 +827,9 @@ class Saque(Transacao):
     """
     Representa uma transação de saque.
     """
+    __slots__ = ("_valor",)
+    _tipo = TipoTransacao.SAQUE  # o mesmo membro do Enum para todas as instâncias
+
     def __init__(self, valor: float):
         """
         Inicializa uma nova transação de saque.
@@ -283,11 +837,10 @@ class Saque(Transacao):
         Args:
             valor (float): O valor do saque.
         """
-        self._valor = valor
-        self._tipo = TipoTransacao.SAQUE
+        self._valor = Dinheiro(valor)
 
     @property
-    def valor(self) -> float:
+    def valor(self) -> Dinheiro:
         """Retorna o valor do saque."""
         return self._valor
 
@@ -303,16 +856,17 @@ class Saque(Transacao):
         Args:
             conta (Conta): A conta onde o saque será registrado.
         """
-        sucesso_transacao = conta.sacar(self.valor)
-
-        if sucesso_transacao:
-            conta.historico.adicionar_transacao(self)
+        # O saque entra no histórico dentro de sacar, sob a trava da conta
+        conta.sacar(self.valor)
 
 
 class Deposito(Transacao):
     """
     Representa uma transação de depósito.
     """
+    __slots__ = ("_valor",)
+    _tipo = TipoTransacao.DEPOSITO
+
     def __init__(self, valor: float):
         """
         Inicializa uma nova transação de depósito.
@@ -320,11 +874,10 @@ class Deposito(Transacao):
         Args:
             valor (float): O valor do depósito.
         """
-        self._valor = valor
-        self._tipo = TipoTransacao.DEPOSITO
+        self._valor = Dinheiro(valor)
 
     @property
-    def valor(self) -> float:
+    def valor(self) -> Dinheiro:
         """Retorna o valor do depósito."""
         return self._valor
 
@@ -340,10 +893,529 @@ class Deposito(Transacao):
         Args:
             conta (Conta): A conta onde o depósito será registrado.
         """
-        sucesso_transacao = conta.depositar(self.valor)
+        conta.depositar(self.valor)
+
+
+class Transferencia(Transacao):
+    """
+    Representa uma transferência entre duas contas.
+    O débito na origem e o crédito no destino acontecem como uma única
+    operação, e cada histórico recebe um lançamento ligado ao outro pelo
+    id da transferência.
+    """
+    __slots__ = ("_valor", "_destino", "_id")
+    _tipo = TipoTransacao.TRANSFERENCIA_ENVIADA
+    _ids = itertools.count(1)
+
+    def __init__(self, valor: float, destino: Conta):
+        """
+        Inicializa uma nova transferência.
+
+        Args:
+            valor (float): O valor a ser transferido.
+            destino (Conta): A conta que recebe o valor.
+        """
+        self._valor = Dinheiro(valor)
+        self._destino = destino
+        self._id = next(Transferencia._ids)
+
+    @property
+    def valor(self) -> Dinheiro:
+        """Retorna o valor da transferência."""
+        return self._valor
+
+    @property
+    def tipo(self) -> TipoTransacao:
+        """Retorna o tipo da transação (Transferência enviada)."""
+        return self._tipo
+
+    @property
+    def destino(self) -> Conta:
+        """Retorna a conta de destino."""
+        return self._destino
+
+    @property
+    def id(self) -> int:
+        """Retorna o identificador que liga os dois lançamentos da transferência."""
+        return self._id
+
+    def registrar(self, conta: Conta):
+        """
+        Registra a transferência, debitando a conta informada e creditando o destino.
+
+        Args:
+            conta (Conta): A conta de origem.
+        """
+        destino = self._destino
+        valor = self._valor
+        if conta is destino:
+            conta._emitir(self._tipo, ResultadoOperacao.VALOR_INVALIDO, valor)
+            return
+
+        # As travas são sempre tomadas na mesma ordem, o que evita impasse
+        # entre transferências cruzadas (A -> B e B -> A ao mesmo tempo)
+        primeira, segunda = sorted((conta, destino), key=_ordem_travamento)
+        with primeira.trava, segunda.trava:
+            # Transferências seguem apenas as regras da Conta (saldo e valor),
+            # não o limite por saque nem a contagem de saques da ContaCorrente
+            resultado = Conta._validar_saque(conta, valor, conta.saldo, 0)
+            if resultado == ResultadoOperacao.SUCESSO:
+                # Diário antes dos saldos: se a gravação falhar, nenhuma das contas muda
+                _gravar_transferencia(conta, destino, valor)
+                conta._saldo -= valor
+                destino._saldo += valor
+                conta.historico.adicionar_lancamento(TipoTransacao.TRANSFERENCIA_ENVIADA, valor, self._id)
+                destino.historico.adicionar_lancamento(TipoTransacao.TRANSFERENCIA_RECEBIDA, valor, self._id)
+        conta._emitir(self._tipo, resultado, valor)
+
+
+def _gravar_transferencia(origem: Conta, destino: Conta, valor: Dinheiro):
+    """
+    Grava os dois lados de uma transferência. Se as contas usam o mesmo
+    diário, os dois registros entram juntos (ou nenhum deles); com diários
+    diferentes, uma falha no segundo deixa gravado só o primeiro.
+    """
+    if origem.diario is not destino.diario:
+        origem._gravar_no_diario(TipoTransacao.TRANSFERENCIA_ENVIADA, valor)
+        destino._gravar_no_diario(TipoTransacao.TRANSFERENCIA_RECEBIDA, valor)
+    elif origem.diario is not None:
+        origem.diario.registrar_varios([
+            (CODIGO_DIARIO[TipoTransacao.TRANSFERENCIA_ENVIADA], origem.numero, valor.centavos),
+            (CODIGO_DIARIO[TipoTransacao.TRANSFERENCIA_RECEBIDA], destino.numero, valor.centavos),
+        ])
+
+
+def _ordem_travamento(conta: Conta) -> tuple:
+    """Chave que define a ordem global em que as travas das contas são tomadas."""
+    return (conta.agencia, conta.numero, id(conta))
+
+
+def restaurar_do_diario(contas, caminho: str) -> int:
+    """
+    Reconstrói saldos e históricos relendo um diário em disco.
+    Registros de contas que não estão na lista são ignorados.
+
+    Args:
+        contas (Iterable[Conta]): As contas a restaurar, recém-criadas.
+        caminho (str): O arquivo do diário.
+
+    Returns:
+        int: Quantos registros foram aplicados.
+    """
+    por_numero = {str(conta.numero): conta for conta in contas}
+    aplicados = 0
+    for registro in diario.reproduzir(caminho):
+        conta = por_numero.get(registro.conta)
+        tipo = TIPO_DO_DIARIO.get(registro.tipo)
+        if conta is None or tipo is None:
+            continue
+        _aplicar_lancamento(conta, tipo, Dinheiro.de_centavos(registro.centavos), registro.instante)
+        aplicados += 1
+    return aplicados
+
+
+def exportar_extratos(contas, caminho: str, formato: str = "csv", tamanho_lote: int = None) -> int:
+    """
+    Exporta o histórico de uma ou mais contas para um arquivo, em lotes de
+    tamanho fixo: a memória usada não cresce com o tamanho dos históricos.
+
+    Args:
+        contas (Iterable[Conta]): As contas a exportar (ex.: [conta] ou o livro inteiro).
+        caminho (str): O arquivo de saída.
+        formato (str): "csv", "jsonl" ou "colunar" (ver exportacao.ler_colunar).
+        tamanho_lote (int): Quantas linhas formatar e escrever por vez. Por padrão, exportacao.TAMANHO_LOTE.
+
+    Returns:
+        int: Quantas linhas foram exportadas.
+    """
+    import exportacao
+
+    nomes_tipo = [tipo.value for tipo in TIPOS_TRANSACAO]
+    if tamanho_lote is None:
+        tamanho_lote = exportacao.TAMANHO_LOTE
+    return exportacao.exportar(exportacao.lotes_das_contas(contas, tamanho_lote), caminho, formato, nomes_tipo)
+
+
+def _aplicar_lancamento(conta: Conta, tipo: TipoTransacao, valor: Dinheiro, instante: int):
+    """Refaz na conta um lançamento lido do diário: saldo e histórico, sem validar nem emitir."""
+    with conta.trava:
+        if tipo in (TipoTransacao.DEPOSITO, TipoTransacao.TRANSFERENCIA_RECEBIDA):
+            conta._saldo += valor
+        else:
+            conta._saldo -= valor
+        conta.historico.adicionar_lancamento(tipo, valor, instante=instante)
+
+
+def processar_lote(lancamentos) -> array:
+    """
+    Processa lançamentos de várias contas em lote, sem saída no console.
+    Os lançamentos são agrupados por conta e aplicados com Conta.aplicar_lote.
+
+    Args:
+        lancamentos (Iterable[tuple[Conta, Transacao]]): Pares (conta, transação).
+
+    Returns:
+        array: Um ResultadoOperacao (array 'b') por lançamento, na ordem recebida.
+    """
+    lotes = {}
+    total = 0
+    for conta, transacao in lancamentos:
+        lote = lotes.get(id(conta))
+        if lote is None:
+            lote = lotes[id(conta)] = (conta, [], [])
+        lote[1].append(total)
+        lote[2].append(transacao)
+        total += 1
+
+    resultados = array("b", bytes(total))
+    for conta, posicoes, transacoes in lotes.values():
+        for posicao, resultado in zip(posicoes, conta.aplicar_lote(transacoes)):
+            resultados[posicao] = resultado
+    return resultados
+
+
+# --- Instantâneo em disco para partida rápida (instantaneo.py) ---
+# Efeito de cada registro do diário no saldo, para os saldos do instantâneo antes de criar as contas
+_SINAL_DIARIO = {
+    codigo: 1 if tipo in (TipoTransacao.DEPOSITO, TipoTransacao.TRANSFERENCIA_RECEBIDA) else -1
+    for codigo, tipo in TIPO_DO_DIARIO.items()
+}
+
+
+class _ModeloInstantaneo:
+    """
+    Modelo do instantâneo (instantaneo.ModeloInstantaneo): contas do modelo
+    (Conta ou ContaCorrente e PessoaFisica), com a janela de saques do dia.
+    """
+    sinais = _SINAL_DIARIO
+
+    def saques_do_dia(self, conta: Conta) -> tuple:
+        if conta._historico is None:  # sem movimento: não cria o histórico só para gravar
+            return None, 0, 0
+        dia, saques, soma = conta._historico.janela_do_dia(TipoTransacao.SAQUE)
+        return dia, saques, soma.centavos
+
+    def materializar(self, dados_cliente: dict, dados_contas: list) -> list:
+        """Cria o cliente e as contas dele a partir dos dados lidos do instantâneo."""
+        cliente = PessoaFisica(**dados_cliente)
+        contas = []
+        for dados in dados_contas:
+            if dados["corrente"]:
+                conta = ContaCorrente(
+                    dados["numero"],
+                    cliente,
+                    limite=Dinheiro.de_centavos(dados["limite"]),
+                    limite_saques=dados["limite_saques"],
+                )
+            else:
+                conta = Conta(dados["numero"], cliente)
+            conta._saldo = Dinheiro.de_centavos(dados["centavos"])
+            conta._agencia = sys.intern(dados["agencia"])
+            if dados["dia_saques"]:
+                conta.historico.retomar_janela_do_dia(
+                    date.fromordinal(dados["dia_saques"]),
+                    TipoTransacao.SAQUE,
+                    dados["saques_no_dia"],
+                    Dinheiro.de_centavos(dados["centavos_sacados_no_dia"]),
+                )
+            cliente.adicionar_conta(conta)
+            contas.append(conta)
+        return contas
+
+    def aplicar(self, conta: Conta, codigo: int, centavos: int, instante: int):
+        _aplicar_lancamento(conta, TIPO_DO_DIARIO[codigo], Dinheiro.de_centavos(centavos), instante)
+
+
+def salvar_instantaneo(contas, caminho: str, posicao_diario: int = 0) -> int:
+    """
+    Grava as contas do modelo em um instantâneo (ver instantaneo.salvar).
+    O histórico não vai junto, só a janela de saques do dia, para que o
+    limite diário continue valendo em abrir_instantaneo.
+
+    Returns:
+        int: Quantas contas foram gravadas.
+    """
+    import instantaneo
+
+    return instantaneo.salvar(_ModeloInstantaneo(), contas, caminho, posicao_diario)
+
+
+def abrir_instantaneo(caminho: str, caminho_diario: str = None) -> "instantaneo.Instantaneo":
+    """
+    Abre um instantâneo salvo por salvar_instantaneo, criando as contas do
+    modelo (Conta ou ContaCorrente e PessoaFisica) só quando acessadas.
+
+    Args:
+        caminho (str): O arquivo do instantâneo.
+        caminho_diario (str): O diário que continuou sendo gravado depois do instantâneo.
+
+    Returns:
+        instantaneo.Instantaneo: O livro aberto; feche com fechar() ou em um bloco with.
+    """
+    import instantaneo
+
+    return instantaneo.Instantaneo(caminho, _ModeloInstantaneo(), caminho_diario)
+
+
+# --- Livro-razão particionado entre processos (particoes.py) ---
+# Lançamentos aceitos pelo livro particionado: transferências seguem o protocolo em duas fases
+_CLASSE_LANCAMENTO = {CODIGO_TIPO[TipoTransacao.SAQUE]: Saque, CODIGO_TIPO[TipoTransacao.DEPOSITO]: Deposito}
+
+
+class _Particao:
+    """
+    Estado de uma partição do livro-razão, mantido dentro do processo trabalhador.
+    Guarda apenas as contas cujo número pertence à partição.
+    """
+    def __init__(self, limite: Dinheiro, limite_saques: int):
+        self._limite = limite
+        self._limite_saques = limite_saques
+        self._cliente = Cliente(endereco="")
+        self._saida = SaidaNula()
+        self._contas = {}
+        self._reservas = {}
+
+    def abrir(self, numeros) -> int:
+        """
+        Abre as contas informadas e retorna quantas foram abertas.
+        Se algum número já existir (ou se repetir), nenhuma conta é aberta.
+        """
+        novos = set()
+        for numero in numeros:
+            if numero in self._contas or numero in novos:
+                raise ValueError(f"Já existe uma conta com o número {numero}.")
+            novos.add(numero)
+        for numero in numeros:
+            conta = ContaCorrente(numero, self._cliente, self._limite, self._limite_saques)
+            conta.saida = self._saida
+            self._contas[numero] = conta
+        return len(numeros)
+
+    def lote(self, numeros: array, tipos: array, centavos: array) -> array:
+        """Aplica um lote de lançamentos, recebido em colunas, e devolve os resultados."""
+        resultados = array("b", bytes(len(numeros)))
+        posicoes = []
+        lancamentos = []
+        for posicao, numero, codigo, valor in zip(itertools.count(), numeros, tipos, centavos):
+            conta = self._contas.get(numero)
+            if conta is None:
+                resultados[posicao] = ResultadoOperacao.CONTA_INEXISTENTE
+                continue
+            posicoes.append(posicao)
+            lancamentos.append((conta, _CLASSE_LANCAMENTO[codigo](Dinheiro.de_centavos(valor))))
+        for posicao, resultado in zip(posicoes, processar_lote(lancamentos)):
+            resultados[posicao] = resultado
+        return resultados
+
+    def saldos(self) -> dict:
+        """Retorna o saldo, em centavos, de cada conta da partição."""
+        return {numero: conta.saldo.centavos for numero, conta in self._contas.items()}
+
+    def preparar(self, id_transferencia: int, numero: int, centavos: int) -> ResultadoOperacao:
+        """Fase 1 na origem: valida o débito e separa o valor em uma reserva."""
+        conta = self._contas.get(numero)
+        if conta is None:
+            return ResultadoOperacao.CONTA_INEXISTENTE
+        valor = Dinheiro.de_centavos(centavos)
+        with conta.trava:
+            resultado = Conta._validar_saque(conta, valor, conta.saldo, 0)
+            if resultado == ResultadoOperacao.SUCESSO:
+                conta._saldo -= valor
+                self._reservas[id_transferencia] = (conta, valor)
+        return resultado
+
+    def creditar(self, id_transferencia: int, numero: int, centavos: int) -> ResultadoOperacao:
+        """Fase 2 no destino: credita o valor e registra a transferência recebida."""
+        conta = self._contas.get(numero)
+        if conta is None:
+            return ResultadoOperacao.CONTA_INEXISTENTE
+        valor = Dinheiro.de_centavos(centavos)
+        with conta.trava:
+            conta._saldo += valor
+            conta.historico.adicionar_lancamento(TipoTransacao.TRANSFERENCIA_RECEBIDA, valor, id_transferencia)
+        return ResultadoOperacao.SUCESSO
+
+    def confirmar(self, id_transferencia: int) -> ResultadoOperacao:
+        """
+        Encerra a reserva na origem e registra a transferência enviada.
+        Uma reserva desconhecida (ou já encerrada) não muda nada e devolve CONTA_INEXISTENTE.
+        """
+        reserva = self._reservas.pop(id_transferencia, None)
+        if reserva is None:
+            return ResultadoOperacao.CONTA_INEXISTENTE
+        conta, valor = reserva
+        conta.historico.adicionar_lancamento(TipoTransacao.TRANSFERENCIA_ENVIADA, valor, id_transferencia)
+        return ResultadoOperacao.SUCESSO
+
+    def abortar(self, id_transferencia: int) -> ResultadoOperacao:
+        """
+        Devolve à conta de origem o valor reservado.
+        Uma reserva desconhecida (ou já encerrada) não muda nada e devolve CONTA_INEXISTENTE.
+        """
+        reserva = self._reservas.pop(id_transferencia, None)
+        if reserva is None:
+            return ResultadoOperacao.CONTA_INEXISTENTE
+        conta, valor = reserva
+        with conta.trava:
+            conta._saldo += valor
+        return ResultadoOperacao.SUCESSO
+
+    def estornar(self, id_transferencia: int, numero: int, centavos: int) -> ResultadoOperacao:
+        """
+        Desfaz no destino um crédito cuja origem não pôde ser confirmada. O
+        estorno entra no histórico como transferência enviada, ligada ao mesmo id.
+        """
+        conta = self._contas.get(numero)
+        if conta is None:
+            return ResultadoOperacao.CONTA_INEXISTENTE
+        valor = Dinheiro.de_centavos(centavos)
+        with conta.trava:
+            conta._saldo -= valor
+            conta.historico.adicionar_lancamento(TipoTransacao.TRANSFERENCIA_ENVIADA, valor, id_transferencia)
+        return ResultadoOperacao.SUCESSO
+
+    def transferir(self, id_transferencia: int, origem: int, destino: int, centavos: int) -> ResultadoOperacao:
+        """Transferência entre duas contas desta partição: as três fases numa só chamada."""
+        if destino not in self._contas:
+            return ResultadoOperacao.CONTA_INEXISTENTE
+        resultado = self.preparar(id_transferencia, origem, centavos)
+        if resultado != ResultadoOperacao.SUCESSO:
+            return resultado
+        self.creditar(id_transferencia, destino, centavos)
+        return self.confirmar(id_transferencia)
+
+
+class _ModeloParticionado:
+    """
+    Modelo do livro particionado (particoes.ModeloParticao): partições de
+    contas correntes com os limites informados, que aceitam saques e depósitos.
+    """
+    def __init__(self, limite: Dinheiro, limite_saques: int):
+        self.limite = limite
+        self.limite_saques = limite_saques
+
+    def nova_particao(self) -> _Particao:
+        return _Particao(self.limite, self.limite_saques)
+
+    def codificar(self, transacao: Transacao) -> tuple:
+        """Converte um saque ou depósito em (código do tipo, centavos); outros tipos lançam ValueError."""
+        codigo = CODIGO_TIPO[transacao.tipo]
+        if codigo not in _CLASSE_LANCAMENTO:
+            raise ValueError(f"O livro particionado só processa saques e depósitos, não {transacao.tipo.value}.")
+        return codigo, transacao.valor.centavos
+
+
+def novo_livro_particionado(quantidade: int = None, limite: float = 500, limite_saques: int = 3) -> "particoes.LivroRazaoParticionado":
+    """
+    Cria o livro-razão particionado de contas correntes: cada processo
+    trabalhador guarda uma _Particao. Os resultados são ResultadoOperacao.
+
+    Args:
+        quantidade (int): Quantidade de partições. Por padrão, os.cpu_count().
+        limite (float): O limite por saque das contas abertas.
+        limite_saques (int): O número máximo de saques diários das contas abertas.
+
+    Returns:
+        particoes.LivroRazaoParticionado: O livro; encerre com encerrar() ou em um bloco with.
+    """
+    import particoes
+
+    return particoes.LivroRazaoParticionado(_ModeloParticionado(Dinheiro(limite), limite_saques), quantidade)
+
+
+# --- Serviço assíncrono sobre o modelo de contas (servico.py) ---
+class _ModeloServico:
+    """
+    Modelo do serviço assíncrono (servico.ModeloServico): abre contas de uma
+    classe e registra as operações como transações. É também a saída das
+    contas abertas: guarda o resultado da última operação (lido logo depois
+    dela, no mesmo passo do laço de eventos) e repassa o evento à saída escolhida.
+    """
+    conta_inexistente = ResultadoOperacao.CONTA_INEXISTENTE
+
+    def __init__(self, classe_conta: type, saida: SaidaEventos, configuracao: dict):
+        self._classe_conta = classe_conta
+        self._saida = saida
+        self._configuracao = configuracao
+        self._ultimo = None
+
+    def emitir(self, conta: Conta, tipo: TipoTransacao, resultado: ResultadoOperacao, valor: Dinheiro):
+        self._ultimo = resultado
+        self._saida.emitir(conta, tipo, resultado, valor)
+
+    def nova_conta(self, cliente: Cliente, numero: int) -> Conta:
+        conta = self._classe_conta.nova_conta(cliente, numero, **self._configuracao)
+        conta.saida = self
+        cliente.adicionar_conta(conta)
+        return conta
+
+    def _registrar(self, conta: Conta, transacao: Transacao) -> ResultadoOperacao:
+        self._ultimo = None
+        transacao.registrar(conta)
+        return self._ultimo
+
+    def depositar(self, conta: Conta, valor) -> ResultadoOperacao:
+        return self._registrar(conta, Deposito(valor))
+
+    def sacar(self, conta: Conta, valor) -> ResultadoOperacao:
+        return self._registrar(conta, Saque(valor))
+
+    def transferir(self, origem: Conta, destino: Conta, valor) -> ResultadoOperacao:
+        return self._registrar(origem, Transferencia(valor, destino))
+
+
+def novo_servico(classe_conta=ContaCorrente, saida: SaidaEventos = None, tamanho_fila: int = 1_000, **configuracao) -> "servico.ServicoBancario":
+    """
+    Cria o serviço assíncrono sobre as contas do modelo, sem contas.
 
-        if sucesso_transacao:
-            conta.historico.adicionar_transacao(self)
+    Args:
+        classe_conta (type): A classe das contas abertas (ex.: ContaCorrente).
+        saida (SaidaEventos): Para onde vão os eventos das operações. Por padrão, SaidaNula.
+        tamanho_fila (int): Pedidos pendentes por conta antes de quem pede aguardar.
+        **configuracao: Parâmetros repassados a cada conta aberta (ex.: limite).
+
+    Returns:
+        servico.ServicoBancario: O serviço; as operações devolvem ResultadoOperacao.
+    """
+    import servico
+
+    modelo = _ModeloServico(classe_conta, saida or SaidaNula(), configuracao)
+    return servico.ServicoBancario(modelo, tamanho_fila)
+
+
+# --- Instrumentação das operações ---
+def _motivo_recusa(conta: Conta, tipo: TipoTransacao, resultado: ResultadoOperacao, valor: Dinheiro):
+    """Chave do contador de recusas: (tipo da operação, motivo); sucessos não contam."""
+    if resultado != ResultadoOperacao.SUCESSO:
+        return (tipo.name, resultado.name)
+    return None
+
+
+def nova_instrumentacao(**opcoes) -> "instrumentacao.Instrumentacao":
+    """
+    Cria a instrumentação (desligada) dos caminhos quentes do modelo: latência
+    de cada operação e contagem das recusas por motivo. Ligue com ativar()
+    ou em um bloco with; desligada, não acrescenta custo algum.
+
+    Args:
+        **opcoes: Repassadas a instrumentacao.Instrumentacao (ex.: amostragem, perfilador).
+
+    Returns:
+        instrumentacao.Instrumentacao: A instrumentação pronta para ativar.
+    """
+    import instrumentacao
+
+    return instrumentacao.Instrumentacao([
+        (Cliente, "realizar_transacao"),
+        (Saque, "registrar"),
+        (Deposito, "registrar"),
+        (Transferencia, "registrar"),
+        (Conta, "sacar"),
+        (Conta, "depositar"),
+        (Historico, "adicionar_lancamento"),
+        (HistoricoColunar, "adicionar_lancamento"),
+        (Conta, "_emitir", _motivo_recusa),
+    ], **opcoes)
 
 
 # --- Função principal para demonstrar o uso do sistema bancário ---
@@ -438,6 +1510,409 @@ def main():
     print("\n--- FIM DA SIMULAÇÃO ---")
 
 
+# --- Benchmarks ---
+def benchmark_limite_saques():
+    """
+    Mede a latência de um saque recusado pelo limite diário de saques
+    em contas com históricos de 10 a 1.000.000 de transações.
+    """
+    print("transacoes_previas\tus_por_saque")
+    repeticoes = 10_000
+    for tamanho in (10, 1_000, 100_000, 1_000_000):
+        cliente = PessoaFisica("Benchmark", "01-01-2000", "000.000.000-00", "-")
+        conta = ContaCorrente(numero=1, cliente=cliente)
+        saque = Saque(1.00)
+        for _ in range(tamanho):
+            conta.historico.adicionar_transacao(saque)
+
+        with redirect_stdout(StringIO()):
+            inicio = time.perf_counter()
+            for _ in range(repeticoes):
+                conta.sacar(1.00)
+            decorrido = time.perf_counter() - inicio
+        print(f"{tamanho}\t{decorrido / repeticoes * 1e6:.3f}")
+
+
+def benchmark_memoria_historico():
+    """
+    Compara, com tracemalloc, a memória ocupada por 1.000.000 de transações
+    no Historico (lista de dicionários) e no HistoricoColunar.
+    """
+    import tracemalloc
+
+    quantidade = 1_000_000
+    transacoes = (Deposito(150.25), Saque(42.10))
+    print("historico\tbytes_por_transacao\tsegundos")
+    for classe in (Historico, HistoricoColunar):
+        tracemalloc.start()
+        inicio = time.perf_counter()
+        historico = classe()
+        for i in range(quantidade):
+            historico.adicionar_transacao(transacoes[i & 1])
+        decorrido = time.perf_counter() - inicio
+        memoria, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{classe.__name__}\t{memoria / quantidade:.1f}\t{decorrido:.2f}")
+        del historico
+
+
+def benchmark_lote():
+    """
+    Compara 1.000.000 de lançamentos em 1.000 contas feitos um a um com
+    Cliente.realizar_transacao e de uma vez com processar_lote.
+    """
+    quantidade = 1_000_000
+    cliente = PessoaFisica("Benchmark", "01-01-2000", "000.000.000-00", "-")
+    transacoes = (Deposito(100.00), Saque(50.00), Saque(80.00))
+    print("modo\tlancamentos_por_segundo")
+
+    contas = [ContaCorrente(numero=i, cliente=cliente) for i in range(1_000)]
+    with redirect_stdout(StringIO()):
+        inicio = time.perf_counter()
+        for i in range(quantidade):
+            cliente.realizar_transacao(contas[i % 1_000], transacoes[i % 3])
+        decorrido = time.perf_counter() - inicio
+    print(f"individual\t{quantidade / decorrido:,.0f}")
+
+    contas = [ContaCorrente(numero=i, cliente=cliente) for i in range(1_000)]
+    lancamentos = [(contas[i % 1_000], transacoes[i % 3]) for i in range(quantidade)]
+    inicio = time.perf_counter()
+    processar_lote(lancamentos)
+    decorrido = time.perf_counter() - inicio
+    print(f"lote\t{quantidade / decorrido:,.0f}")
+
+
+def benchmark_saidas():
+    """
+    Mede operações por segundo (depósito + saque) com cada saída de eventos.
+    O console é redirecionado para os.devnull.
+    """
+    quantidade = 500_000
+    cliente = PessoaFisica("Benchmark", "01-01-2000", "000.000.000-00", "-")
+    print("saida\toperacoes_por_segundo")
+    with open(os.devnull, "w") as nulo, redirect_stdout(nulo):
+        for saida in (SaidaConsole(), SaidaBuffer(nulo), SaidaNula()):
+            conta = Conta(numero=1, cliente=cliente)
+            conta.saida = saida
+            inicio = time.perf_counter()
+            for _ in range(quantidade):
+                conta.depositar(10.00)
+                conta.sacar(10.00)
+            if isinstance(saida, SaidaBuffer):
+                saida.descarregar()
+            decorrido = time.perf_counter() - inicio
+            sys.__stdout__.write(f"{type(saida).__name__}\t{2 * quantidade / decorrido:,.0f}\n")
+
+
+def benchmark_concorrencia():
+    """
+    Teste de estresse com um pool de threads: N trabalhadores fazem saques e
+    depósitos aleatórios em M contas. Mede a vazão e confere, ao final, que
+    nenhum saldo ficou negativo e que cada saldo bate com o histórico.
+    """
+    import random
+    from concurrent.futures import ThreadPoolExecutor
+
+    trabalhadores = 8
+    operacoes_por_trabalhador = 25_000
+    cliente = PessoaFisica("Benchmark", "01-01-2000", "000.000.000-00", "-")
+    transacoes = (Deposito(10.00), Saque(7.00), Saque(15.00))
+    intervalo_original = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # força trocas de thread frequentes
+
+    print("contas\toperacoes_por_segundo\tviolacoes")
+    try:
+        for quantidade_contas in (1, 10, 100, 1_000):
+            contas = [
+                ContaCorrente(numero=i, cliente=cliente, limite_saques=10**9)
+                for i in range(quantidade_contas)
+            ]
+            for conta in contas:
+                conta.saida = SaidaNula()
+
+            def trabalhar(semente):
+                gerador = random.Random(semente)
+                for _ in range(operacoes_por_trabalhador):
+                    gerador.choice(transacoes).registrar(gerador.choice(contas))
+
+            inicio = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=trabalhadores) as executor:
+                list(executor.map(trabalhar, range(trabalhadores)))
+            decorrido = time.perf_counter() - inicio
+
+            violacoes = 0
+            for conta in contas:
+                historico = conta.historico
+                esperado = historico.soma(TipoTransacao.DEPOSITO) - historico.soma(TipoTransacao.SAQUE)
+                if conta.saldo < 0 or conta.saldo != esperado:
+                    violacoes += 1
+            total = trabalhadores * operacoes_por_trabalhador
+            print(f"{quantidade_contas}\t{total / decorrido:,.0f}\t{violacoes}")
+    finally:
+        sys.setswitchinterval(intervalo_original)
+
+
+def benchmark_particoes():
+    """
+    Mede lançamentos por segundo no livro-razão particionado com 1 a N
+    partições, sobre 1.000.000 de contas e 1.000.000 de lançamentos sintéticos.
+    """
+    import random
+
+    quantidade_contas = 1_000_000
+    quantidade_lancamentos = 1_000_000
+    gerador = random.Random(0)
+    transacoes = (Deposito(100.00), Deposito(20.00), Saque(50.00))
+    lancamentos = [
+        (gerador.randrange(quantidade_contas), gerador.choice(transacoes))
+        for _ in range(quantidade_lancamentos)
+    ]
+    print("particoes\tlancamentos_por_segundo")
+    for quantidade in sorted({1, 2, os.cpu_count() or 1}):
+        with novo_livro_particionado(quantidade) as livro:
+            livro.abrir_contas(range(quantidade_contas))
+            inicio = time.perf_counter()
+            livro.processar(lancamentos)
+            decorrido = time.perf_counter() - inicio
+        print(f"{quantidade}\t{quantidade_lancamentos / decorrido:,.0f}")
+
+
+def benchmark_transferencias():
+    """
+    Mede transferências por segundo com 8 threads transferindo entre pares
+    aleatórios de poucas contas (alta disputa). Confere ao final que o total
+    de dinheiro não mudou e que nenhum saldo ficou negativo.
+    """
+    import random
+    from concurrent.futures import ThreadPoolExecutor
+
+    trabalhadores = 8
+    transferencias_por_trabalhador = 20_000
+    cliente = PessoaFisica("Benchmark", "01-01-2000", "000.000.000-00", "-")
+    intervalo_original = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # força trocas de thread frequentes
+
+    print("contas\ttransferencias_por_segundo\ttotal_preservado")
+    try:
+        for quantidade_contas in (2, 10, 100):
+            contas = [Conta(numero=i, cliente=cliente) for i in range(quantidade_contas)]
+            for conta in contas:
+                conta.saida = SaidaNula()
+                conta.depositar(1_000.00)
+            total_inicial = sum((conta.saldo for conta in contas), Dinheiro())
+
+            def trabalhar(semente):
+                gerador = random.Random(semente)
+                for _ in range(transferencias_por_trabalhador):
+                    origem, destino = gerador.sample(contas, 2)
+                    Transferencia(gerador.randint(1, 300), destino).registrar(origem)
+
+            inicio = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=trabalhadores) as executor:
+                list(executor.map(trabalhar, range(trabalhadores)))
+            decorrido = time.perf_counter() - inicio
+
+            total_final = sum((conta.saldo for conta in contas), Dinheiro())
+            preservado = total_final == total_inicial and all(conta.saldo >= 0 for conta in contas)
+            total = trabalhadores * transferencias_por_trabalhador
+            print(f"{quantidade_contas}\t{total / decorrido:,.0f}\t{preservado}")
+    finally:
+        sys.setswitchinterval(intervalo_original)
+
+
+def benchmark_instantaneo(quantidade: int = 1_000_000, cauda: int = 100_000):
+    """
+    Compara a partida de um livro com 1.000.000 de contas refeito a partir da
+    lista de dicionários (JSON) com a abertura do instantâneo via mmap mais
+    a cauda de 100.000 registros do diário.
+    """
+    import json
+    import random
+    import tempfile
+
+    gerador = random.Random(0)
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho_dicionarios = os.path.join(diretorio, "contas.json")
+        caminho_instantaneo = os.path.join(diretorio, "contas.instantaneo")
+        caminho_diario = os.path.join(diretorio, "contas.diario")
+        with open(caminho_dicionarios, "w") as arquivo:
+            json.dump([
+                {
+                    "agencia": "0001",
+                    "numero_conta": numero,
+                    "saldo": gerador.randrange(1_000_000) / 100,
+                    "usuario": {"nome": f"Cliente {numero}", "data_nascimento": "01-01-2000", "cpf": f"{numero:011d}", "endereco": "-"},
+                }
+                for numero in range(quantidade)
+            ], arquivo)
+
+        print("partida\tsegundos")
+        inicio = time.perf_counter()
+        with open(caminho_dicionarios) as arquivo:
+            registros = json.load(arquivo)
+        contas = []
+        for registro in registros:
+            cliente = PessoaFisica(**registro["usuario"])
+            conta = ContaCorrente(registro["numero_conta"], cliente)
+            conta._saldo = Dinheiro(registro["saldo"])
+            cliente.adicionar_conta(conta)
+            contas.append(conta)
+        print(f"lista de dicionarios\t{time.perf_counter() - inicio:.2f}")
+
+        with diario.Diario(caminho_diario, lote_fsync=1024, sincronizar=False) as registro_diario:
+            registro_diario.registrar(diario.DEPOSITO, 0, 100)
+            posicao_instantaneo = registro_diario.posicao()
+            salvar_instantaneo(contas, caminho_instantaneo, posicao_instantaneo)
+            for _ in range(cauda):
+                registro_diario.registrar(diario.DEPOSITO, gerador.randrange(quantidade), 1_000)
+        esperado = {conta.numero: conta.saldo for conta in contas}
+        for registro in diario.reproduzir(caminho_diario, posicao_instantaneo):
+            esperado[int(registro.conta)] += Dinheiro.de_centavos(registro.centavos)
+        del registros, contas
+
+        inicio = time.perf_counter()
+        livro = abrir_instantaneo(caminho_instantaneo, caminho_diario)
+        amostra = [gerador.randrange(quantidade) for _ in range(1_000)]
+        saldos = [livro.saldo(numero) for numero in amostra]
+        print(f"instantaneo + diario\t{time.perf_counter() - inicio:.2f}")
+        assert saldos == [esperado[numero] for numero in amostra]
+        assert all(livro.conta(numero).saldo == esperado[numero] for numero in amostra)
+        livro.fechar()
+
+
+def benchmark_memoria_contas(quantidade: int = 1_000_000):
+    """
+    Mede, com tracemalloc, os bytes por conta de 1.000.000 de ContaCorrente,
+    cada uma com seu cliente PessoaFisica.
+    """
+    import tracemalloc
+
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    contas = []
+    for numero in range(quantidade):
+        cliente = PessoaFisica(f"Cliente {numero}", "01-01-2000", f"{numero:011d}", "-")
+        conta = ContaCorrente.nova_conta(cliente=cliente, numero=numero)
+        cliente.adicionar_conta(conta)
+        contas.append(conta)
+    decorrido = time.perf_counter() - inicio
+    memoria, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print("contas\tbytes_por_conta\tsegundos")
+    print(f"{quantidade}\t{memoria / quantidade:.1f}\t{decorrido:.2f}")
+
+
+def benchmark_servico(contas: int = 10_000, operacoes: int = 200_000):
+    """
+    Gerador de carga para o servico.ServicoBancario: 1.000, 10.000 e 50.000 clientes
+    concorrentes no mesmo laço de eventos fazem depósitos, saques e
+    transferências aleatórios. Reporta operações por segundo e as latências
+    p50 e p99 de cada operação.
+    """
+    import asyncio
+    import random
+
+    async def carga(clientes: int):
+        banco = novo_servico(limite_saques=10**9)
+        titular = PessoaFisica("Benchmark", "01-01-2000", "000.000.000-00", "-")
+        numeros = [await banco.abrir_conta(titular) for _ in range(contas)]
+        for numero in numeros:
+            await banco.depositar(numero, 1_000)
+        latencias = array("d")
+
+        async def cliente(semente: int, quantidade: int):
+            gerador = random.Random(semente)
+            for _ in range(quantidade):
+                origem = gerador.choice(numeros)
+                sorteio = gerador.random()
+                inicio = time.perf_counter()
+                if sorteio < 0.4:
+                    await banco.depositar(origem, 10)
+                elif sorteio < 0.8:
+                    await banco.sacar(origem, 10)
+                else:
+                    await banco.transferir(origem, gerador.choice(numeros), 10)
+                latencias.append(time.perf_counter() - inicio)
+
+        inicio = time.perf_counter()
+        await asyncio.gather(*(cliente(semente, operacoes // clientes) for semente in range(clientes)))
+        decorrido = time.perf_counter() - inicio
+        await banco.encerrar()
+        ordenadas = sorted(latencias)
+        p50 = ordenadas[len(ordenadas) // 2]
+        p99 = ordenadas[int(len(ordenadas) * 0.99)]
+        print(f"{clientes}\t{len(latencias) / decorrido:,.0f}\t{p50 * 1e3:.2f}\t{p99 * 1e3:.2f}")
+
+    print("clientes\toperacoes_por_segundo\tp50_ms\tp99_ms")
+    for clientes in (1_000, 10_000, 50_000):
+        asyncio.run(carga(clientes))
+
+
+def benchmark_instrumentacao(operacoes: int = 300_000):
+    """
+    Mede depósitos e saques por segundo via Cliente.realizar_transacao com a
+    instrumentação nunca ligada, ligada, ligada com amostragem do cProfile
+    (1 em 1.000) e desligada de novo. Cada modo vale o melhor de 3 medições.
+    """
+    import cProfile
+
+    cliente = PessoaFisica("Benchmark", "01-01-2000", "000.000.000-00", "-")
+    transacoes = (Deposito(100.00), Saque(50.00), Saque(80.00), Saque(0))
+    metricas = nova_instrumentacao()
+    amostrada = nova_instrumentacao(amostragem=1_000, perfilador=cProfile.Profile())
+
+    def medir():
+        melhor = 0
+        for _ in range(3):
+            contas = [ContaCorrente(numero=i, cliente=cliente) for i in range(1_000)]
+            for conta in contas:
+                conta.saida = SaidaNula()
+            inicio = time.perf_counter()
+            for i in range(operacoes):
+                cliente.realizar_transacao(contas[i % 1_000], transacoes[i % 4])
+            melhor = max(melhor, operacoes / (time.perf_counter() - inicio))
+        return melhor
+
+    referencia = medir()
+    print("instrumentacao\toperacoes_por_segundo\tcusto")
+    print(f"nunca ligada\t{referencia:,.0f}\t-")
+    for nome, antes, depois in (
+        ("ligada", metricas.ativar, metricas.desativar),
+        ("ligada + amostragem", amostrada.ativar, amostrada.desativar),
+        ("desligada de novo", lambda: None, lambda: None),
+    ):
+        antes()
+        por_segundo = medir()
+        depois()
+        print(f"{nome}\t{por_segundo:,.0f}\t{referencia / por_segundo - 1:+.1%}")
+
+    resumo = metricas.instantaneo()
+    print("operacao\tchamadas\tp50_ns\tp99_ns")
+    for rotulo, numeros in resumo["operacoes"].items():
+        print(f"{rotulo}\t{numeros['chamadas']}\t{numeros['p50_ns']}\t{numeros['p99_ns']}")
+    print("recusas:", resumo["eventos"])
+
+
+BENCHMARKS = {
+    "limite_saques": benchmark_limite_saques,
+    "memoria_historico": benchmark_memoria_historico,
+    "lote": benchmark_lote,
+    "saidas": benchmark_saidas,
+    "concorrencia": benchmark_concorrencia,
+    "particoes": benchmark_particoes,
+    "transferencias": benchmark_transferencias,
+    "instantaneo": benchmark_instantaneo,
+    "memoria_contas": benchmark_memoria_contas,
+    "servico": benchmark_servico,
+    "instrumentacao": benchmark_instrumentacao,
+}
+
+
 # Garante que a função main() seja chamada apenas quando o script for executado diretamente
+# Uso: python "Modelando o sistema bancario em poo com python.py" [benchmark <nome>]
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if sys.argv[1:2] == ["benchmark"]:
+        for nome in sys.argv[2:] or BENCHMARKS:
+            BENCHMARKS[nome]()
+    else:
+        main()
\ No newline at end of file
@@ -1,46 +1,125 @@
+import bisect
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import diario
+from dinheiro import Dinheiro
+
+# Fuso em que o dia do limite de saques começa e termina
+NOME_FUSO_HORARIO = "America/Sao_Paulo"
+CAMINHO_DIARIO = "contas_dio.diario"
+
+
+@lru_cache(maxsize=None)
+def fuso_horario_padrao():
+    # Criado no primeiro uso: no Windows, ZoneInfo só acha o fuso com o pacote tzdata.
+    # Sem ele, usa o deslocamento fixo de Brasília (sem horário de verão desde 2019)
+    try:
+        return ZoneInfo(NOME_FUSO_HORARIO)
+    except ZoneInfoNotFoundError:
+        return timezone(timedelta(hours=-3), "BRT")
+
+
 class ContaBancaria:
-    def __init__(self, numero_conta, titular, saldo_inicial=0):
+    __slots__ = (
+        "numero_conta", "titular", "saldo", "extrato", "_relogio", "_fuso_horario",
+        "_saques_no_dia", "_inicio_do_dia", "_fim_do_dia", "_trava",
+    )
+    diario = None  # diario.Diario que recebe cada operação bem-sucedida (opcional)
+    # Limites iguais para todas as contas: guardados uma vez na classe, não em cada conta
+    LIMITE_SAQUES_DIARIOS = 3
+    LIMITE_VALOR_SAQUE = Dinheiro(500)
+
+    def __init__(self, numero_conta, titular, saldo_inicial=0, relogio=time.time, fuso_horario=None):
+        # relogio: função que retorna o instante atual em segundos (injetável em testes)
         self.numero_conta = numero_conta
         self.titular = titular
-        self.saldo = saldo_inicial
+        self.saldo = Dinheiro(saldo_inicial)
         self.extrato = [] 
-        self.saques_diarios = 0 
-        self.LIMITE_SAQUES_DIARIOS = 3 
-        self.LIMITE_VALOR_SAQUE = 500 
+        self._relogio = relogio
+        self._fuso_horario = fuso_horario
+        self._saques_no_dia = 0
+        self._inicio_do_dia = self._fim_do_dia = 0.0
+        self._trava = threading.Lock()  # serializa as alterações; o saldo é lido sem travar
+
+    @property
+    def saques_diarios(self):
+        # Só leitura: fora da janela do dia guardada, nenhum saque foi feito hoje
+        if self._inicio_do_dia <= self._relogio() < self._fim_do_dia:
+            return self._saques_no_dia
+        return 0
+
+    def _virar_dia(self, agora):
+        # Chamado sob a trava: o contador zera na primeira operação depois da meia-noite,
+        # sem timer; fora da virada do dia, a verificação é uma comparação de números
+        if not self._inicio_do_dia <= agora < self._fim_do_dia:
+            inicio = datetime.fromtimestamp(agora, self._fuso_horario or fuso_horario_padrao()).replace(
+                hour=0, minute=0, second=0, microsecond=0
+            )
+            fim = inicio + timedelta(days=1)  # aritmética de parede: dias de 23h/25h no horário de verão
+            self._inicio_do_dia = inicio.timestamp()
+            self._fim_do_dia = fim.timestamp()
+            self._saques_no_dia = 0
 
     def depositar(self, valor):
+        valor = Dinheiro(valor)
         if valor > 0:
-            self.saldo += valor
-            self.extrato.append(f"Depósito de R${valor:.2f}")
+            with self._trava:
+                # Grava no diário antes de mudar a conta: se a gravação falhar, nada muda
+                if self.diario is not None:
+                    self.diario.registrar(diario.DEPOSITO, self.numero_conta, valor.centavos)
+                self.saldo += valor
+                self.extrato.append(f"Depósito de R${valor:.2f}")
             print(f"Depósito de R${valor:.2f} realizado com sucesso. Novo saldo: R${self.saldo:.2f}")
         else:
             print("Operação falhou! O valor do depósito deve ser positivo.")
 
     def sacar(self, valor):
+        valor = Dinheiro(valor)
         if valor <= 0:
             print("Operação falhou! O valor do saque deve ser positivo.")
             return
 
-        if self.saques_diarios >= self.LIMITE_SAQUES_DIARIOS:
-            print(f"Operação falhou! Você atingiu o limite de {self.LIMITE_SAQUES_DIARIOS} saques diários.")
-            return
+        # Verificação e débito acontecem sob a mesma trava
+        with self._trava:
+            self._virar_dia(self._relogio())
+            if self._saques_no_dia >= self.LIMITE_SAQUES_DIARIOS:
+                print(f"Operação falhou! Você atingiu o limite de {self.LIMITE_SAQUES_DIARIOS} saques diários.")
+                return
 
-        if valor > self.LIMITE_VALOR_SAQUE:
-            print(f"Operação falhou! O valor máximo por saque é de R${self.LIMITE_VALOR_SAQUE:.2f}.")
-            return
+            if valor > self.LIMITE_VALOR_SAQUE:
+                print(f"Operação falhou! O valor máximo por saque é de R${self.LIMITE_VALOR_SAQUE:.2f}.")
+                return
 
-        if self.saldo < valor:
-            print("Operação falhou! Saldo insuficiente para realizar o saque.") 
-            return
+            if self.saldo < valor:
+                print("Operação falhou! Saldo insuficiente para realizar o saque.") 
+                return
 
-    
-        self.saldo -= valor
-        self.extrato.append(f"Saque de R${valor:.2f}")
-        self.saques_diarios += 1 
+            if self.diario is not None:
+                self.diario.registrar(diario.SAQUE, self.numero_conta, valor.centavos)
+            self.saldo -= valor
+            self.extrato.append(f"Saque de R${valor:.2f}")
+            self._saques_no_dia += 1 
         print(f"Saque de R${valor:.2f} realizado com sucesso. Novo saldo: R${self.saldo:.2f}")
         print(f"Saques restantes hoje: {self.LIMITE_SAQUES_DIARIOS - self.saques_diarios}")
 
 
+    def reaplicar_saque(self, valor, instante):
+        # Refaz um saque lido do diário, sem validar nem gravar de novo; instante em segundos.
+        # Um saque feito hoje volta a contar no limite diário
+        valor = Dinheiro(valor)
+        with self._trava:
+            self.saldo -= valor
+            self.extrato.append(f"Saque de R${valor:.2f}")
+            self._virar_dia(self._relogio())  # posiciona a janela do dia atual
+            if self._inicio_do_dia <= instante < self._fim_do_dia:
+                self._saques_no_dia += 1
+
     def visualizar_extrato(self):
         print("\n--- EXTRATO ---")
         if not self.extrato:
@@ -54,11 +133,69 @@ class ContaBancaria:
     def __str__(self):
         return f"Conta: {self.numero_conta} | Titular: {self.titular} | Saldo: R${self.saldo:.2f}"
 
+class RegistroAgencia:
+    """
+    Guarda as contas da agência indexadas pelo número, que deve ser único.
+    A busca por número é O(1). A listagem por intervalo ou prefixo usa uma
+    lista ordenada de números, reordenada só quando necessário.
+    """
+    def __init__(self, contas=()):
+        """Cria o registro, opcionalmente já com uma carga inicial de contas."""
+        self._por_numero = {}
+        self._numeros = []
+        self._ordenado = True
+        for conta in contas:
+            self.adicionar(conta)
+
+    def __len__(self):
+        return len(self._por_numero)
+
+    def __contains__(self, numero_conta):
+        return numero_conta in self._por_numero
+
+    def __iter__(self):
+        return self.listar_intervalo()
+
+    def adicionar(self, conta):
+        """Adiciona uma conta; lança ValueError se o número já estiver em uso."""
+        numero = conta.numero_conta
+        if numero in self._por_numero:
+            raise ValueError(f"Já existe uma conta com o número {numero}.")
+        self._por_numero[numero] = conta
+        if self._numeros and numero < self._numeros[-1]:
+            self._ordenado = False
+        self._numeros.append(numero)
+
+    def encontrar(self, numero_conta):
+        """Retorna a conta com o número informado, ou None."""
+        return self._por_numero.get(numero_conta)
+
+    def _numeros_ordenados(self):
+        if not self._ordenado:
+            self._numeros.sort()
+            self._ordenado = True
+        return self._numeros
+
+    def listar_intervalo(self, inicio=None, fim=None):
+        """Percorre, em ordem, as contas com inicio <= número < fim."""
+        numeros = self._numeros_ordenados()
+        esquerda = 0 if inicio is None else bisect.bisect_left(numeros, inicio)
+        direita = len(numeros) if fim is None else bisect.bisect_left(numeros, fim)
+        for posicao in range(esquerda, direita):
+            yield self._por_numero[numeros[posicao]]
+
+    def listar_prefixo(self, prefixo):
+        """Percorre, em ordem, as contas cujo número começa com o prefixo."""
+        if not prefixo:
+            return self.listar_intervalo()
+        return self.listar_intervalo(prefixo, prefixo + "\U0010ffff")
+
+
 def criar_conta():
     numero = input("Digite o número da conta: ")
     titular = input("Digite o nome do titular: ")
     try:
-        saldo_inicial = float(input("Digite o saldo inicial (opcional, padrão 0): ") or 0)
+        saldo_inicial = Dinheiro(input("Digite o saldo inicial (opcional, padrão 0): ") or 0)
         if saldo_inicial < 0:
             print("Saldo inicial não pode ser negativo. Definindo para 0.")
             saldo_inicial = 0
@@ -68,13 +205,30 @@ def criar_conta():
     return ContaBancaria(numero, titular, saldo_inicial)
 
 def encontrar_conta(contas, numero_conta):
-    for conta in contas:
-        if conta.numero_conta == numero_conta:
-            return conta
-    return None
+    return contas.encontrar(numero_conta)
+
+def restaurar_do_diario(caminho, contas):
+    # Relê o diário e refaz as contas; saques feitos hoje voltam a contar no limite diário
+    for registro in diario.reproduzir(caminho):
+        valor = Dinheiro.de_centavos(registro.centavos)
+        if registro.tipo == diario.ABERTURA:
+            if registro.conta not in contas:
+                contas.adicionar(ContaBancaria(registro.conta, registro.texto, valor))
+            continue
+
+        conta = contas.encontrar(registro.conta)
+        if conta is None:
+            continue
+        if registro.tipo == diario.DEPOSITO:
+            conta.saldo += valor
+            conta.extrato.append(f"Depósito de R${valor:.2f}")
+        elif registro.tipo == diario.SAQUE:
+            conta.reaplicar_saque(valor, registro.instante / 1e9)
 
 def main():
-    contas = []
+    contas = RegistroAgencia()
+    restaurar_do_diario(CAMINHO_DIARIO, contas)
+    ContaBancaria.diario = diario.Diario(CAMINHO_DIARIO, lote_fsync=1)
     while True:
         print("\n===== SISTEMA BANCÁRIO =====")
         print("1. Criar nova conta")
@@ -87,8 +241,15 @@ def main():
 
         if opcao_menu_principal == '1':
             nova_conta = criar_conta()
-            contas.append(nova_conta)
-            print(f"Conta {nova_conta.numero_conta} criada com sucesso para {nova_conta.titular}!")
+            try:
+                contas.adicionar(nova_conta)
+            except ValueError as erro:
+                print(f"Operação falhou! {erro}")
+            else:
+                ContaBancaria.diario.registrar(
+                    diario.ABERTURA, nova_conta.numero_conta, nova_conta.saldo.centavos, nova_conta.titular
+                )
+                print(f"Conta {nova_conta.numero_conta} criada com sucesso para {nova_conta.titular}!")
         elif opcao_menu_principal == '2':
             if not contas:
                 print("Nenhuma conta criada ainda. Crie uma primeiro.")
@@ -133,15 +294,46 @@ def main():
             if not contas:
                 print("Nenhuma conta criada ainda.")
             else:
+                prefixo = input("Filtrar pelo início do número da conta (vazio para todas): ")
                 print("\n--- CONTAS CADASTRADAS ---")
-                for conta in contas:
+                for conta in contas.listar_prefixo(prefixo):
                     print(conta)
                 print("--------------------------")
         elif opcao_menu_principal == '4':
             print("Saindo do sistema. Obrigado por usar nossos serviços!")
+            ContaBancaria.diario.fechar()
             break
         else:
             print("Opção inválida. Por favor, tente novamente.")
 
+def benchmark_busca():
+    """Compara a busca linear antiga com o RegistroAgencia em 1 mil, 100 mil e 1 milhão de contas."""
+    def encontrar_linear(contas, numero_conta):
+        for conta in contas:
+            if conta.numero_conta == numero_conta:
+                return conta
+        return None
+
+    gerador = random.Random(0)
+    print("contas\tlinear_us\tregistro_us")
+    for quantidade in (1_000, 100_000, 1_000_000):
+        lista = [ContaBancaria(str(numero), "Titular") for numero in range(quantidade)]
+        registro = RegistroAgencia(lista)
+        buscas = [str(gerador.randrange(quantidade)) for _ in range(200)]
+
+        inicio = time.perf_counter()
+        for numero in buscas:
+            encontrar_linear(lista, numero)
+        linear = (time.perf_counter() - inicio) / len(buscas)
+
+        inicio = time.perf_counter()
+        for numero in buscas:
+            encontrar_conta(registro, numero)
+        indexada = (time.perf_counter() - inicio) / len(buscas)
+        print(f"{quantidade}\t{linear * 1e6:.2f}\t{indexada * 1e6:.2f}")
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if sys.argv[1:2] == ["benchmark"]:
+        benchmark_busca()
+    else:
+        main()
\ No newline at end of file
@@ -0,0 +1,417 @@
+"""
+Consultas analíticas vetorizadas (NumPy) sobre os históricos das contas.
+
+Os lançamentos de todas as contas são copiados para colunas NumPy (conta,
+tipo, centavos, instante) e cada consulta é feita sobre as colunas inteiras,
+sem laços em Python. Os resultados ficam em cache: os agregados acumuláveis
+(somas por conta e tipo, totais por dia) são atualizados só com os
+lançamentos novos; os demais são recalculados quando chegam lançamentos.
+
+Uso: python analise.py [transacoes]  (executa o benchmark, padrão 50 milhões)
+"""
+import sys
+import time
+from datetime import datetime
+
+try:
+    import numpy as np
+except ImportError as erro:  # dependência só deste módulo; o resto do sistema não precisa dela
+    raise ImportError("analise.py precisa do NumPy (pip install numpy).") from erro
+
+NS_POR_DIA = 86_400 * 1_000_000_000
+
+
+class LivroAnalitico:
+    """
+    Colunas NumPy com os lançamentos de um conjunto de contas e as consultas sobre elas.
+    Os tipos são os códigos numéricos do histórico colunar (CODIGO_TIPO) e os
+    valores saem em centavos inteiros.
+    """
+    def __init__(self, sinais, fuso_segundos: int = None):
+        """
+        Cria um livro analítico vazio.
+
+        Args:
+            sinais (Sequence[int]): Para cada código de tipo, 1 se credita e -1 se debita a conta.
+            fuso_segundos (int): Deslocamento em relação ao UTC usado para separar os dias.
+                Por padrão, o deslocamento atual do fuso local.
+        """
+        if fuso_segundos is None:
+            fuso_segundos = int(datetime.now().astimezone().utcoffset().total_seconds())
+        self._sinais = np.asarray(sinais, dtype=np.int64)
+        self._fuso_ns = fuso_segundos * 1_000_000_000
+        self._numeros = []  # índice da conta -> número
+        self._indice_conta = {}  # número -> índice da conta
+        self._exportados = {}  # número -> quantos lançamentos do histórico já foram copiados
+        self._pedacos = []  # lançamentos recebidos e ainda não consolidados nas colunas
+        self._conta = np.empty(0, np.int32)
+        self._tipo = np.empty(0, np.uint8)
+        self._centavos = np.empty(0, np.int64)
+        self._instante = np.empty(0, np.int64)
+        self._cache = {}
+
+    def __len__(self) -> int:
+        return len(self._conta) + sum(len(pedaco[0]) for pedaco in self._pedacos)
+
+    # --- Carga ---
+    def atualizar(self, contas) -> int:
+        """
+        Copia das contas os lançamentos que ainda não estão no livro.
+
+        Args:
+            contas (Iterable[Conta]): As contas a acompanhar.
+
+        Returns:
+            int: Quantos lançamentos novos foram copiados.
+        """
+        copiados = 0
+        for conta in contas:
+            numero = conta.numero
+            inicio = self._exportados.get(numero, 0)
+            with conta.trava:
+                tipos, centavos, instantes = conta.historico.colunas(inicio)
+            if len(tipos):
+                self.adicionar(numero, tipos, centavos, instantes)
+                self._exportados[numero] = inicio + len(tipos)
+                copiados += len(tipos)
+        return copiados
+
+    def adicionar(self, numeros, tipos, centavos, instantes):
+        """
+        Acrescenta lançamentos em formato de colunas.
+
+        Args:
+            numeros (int | array): O número da conta de todos os lançamentos, ou um por lançamento.
+            tipos (array): Os códigos de tipo.
+            centavos (array): Os valores em centavos.
+            instantes (array): Os instantes, em ns desde a época.
+        """
+        tipos = np.asarray(tipos, dtype=np.uint8)
+        if np.ndim(numeros) == 0:
+            contas = np.full(len(tipos), self._indice_da_conta(numeros), np.int32)
+        else:
+            unicos, posicoes = np.unique(np.asarray(numeros), return_inverse=True)
+            indices = np.fromiter((self._indice_da_conta(numero) for numero in unicos.tolist()), np.int32, len(unicos))
+            contas = indices[posicoes]
+        self._pedacos.append((
+            contas,
+            tipos,
+            np.asarray(centavos, dtype=np.int64),
+            np.asarray(instantes, dtype=np.int64),
+        ))
+
+    def _indice_da_conta(self, numero) -> int:
+        indice = self._indice_conta.get(numero)
+        if indice is None:
+            indice = self._indice_conta[numero] = len(self._numeros)
+            self._numeros.append(numero)
+        return indice
+
+    def _consolidar(self) -> int:
+        """Junta às colunas os lançamentos pendentes e retorna o total de linhas."""
+        if self._pedacos:
+            colunas = (self._conta, self._tipo, self._centavos, self._instante)
+            self._conta, self._tipo, self._centavos, self._instante = (
+                np.concatenate([coluna, *(pedaco[posicao] for pedaco in self._pedacos)])
+                for posicao, coluna in enumerate(colunas)
+            )
+            self._pedacos.clear()
+        return len(self._conta)
+
+    # --- Cache ---
+    def _acumulado(self, nome: str, calcular, combinar):
+        """
+        Resultado acumulável: na chegada de lançamentos novos, calcula só sobre
+        eles e combina com o resultado guardado.
+        """
+        linhas = self._consolidar()
+        guardado = self._cache.get(nome)
+        if guardado is None:
+            resultado = calcular(slice(0, linhas))
+        elif guardado[0] < linhas:
+            resultado = combinar(guardado[1], calcular(slice(guardado[0], linhas)))
+        else:
+            return guardado[1]
+        self._cache[nome] = (linhas, resultado)
+        return resultado
+
+    def _recalculado(self, chave, calcular):
+        """Resultado que vale enquanto não chegarem lançamentos novos."""
+        linhas = self._consolidar()
+        guardado = self._cache.get(chave)
+        if guardado is None or guardado[0] != linhas:
+            guardado = self._cache[chave] = (linhas, calcular())
+        return guardado[1]
+
+    # --- Agregados acumuláveis ---
+    def _por_conta_tipo(self):
+        tipos = len(self._sinais)
+
+        def calcular(fatia):
+            chaves = self._conta[fatia].astype(np.int64) * tipos + self._tipo[fatia]
+            tamanho = len(self._numeros) * tipos
+            contagens = np.bincount(chaves, minlength=tamanho)
+            # Soma em float64: exata enquanto cada total ficar abaixo de 2**53 centavos
+            somas = np.bincount(chaves, weights=self._centavos[fatia], minlength=tamanho)
+            return contagens.reshape(-1, tipos), np.rint(somas).astype(np.int64).reshape(-1, tipos)
+
+        def combinar(anterior, novo):
+            return tuple(
+                np.concatenate([velho, np.zeros((len(recente) - len(velho), tipos), np.int64)]) + recente
+                for velho, recente in zip(anterior, novo)
+            )
+
+        return self._acumulado("por_conta_tipo", calcular, combinar)
+
+    def _por_dia(self):
+        tipos = len(self._sinais)
+
+        def calcular(fatia):
+            if fatia.start == fatia.stop:
+                return 0, np.zeros((0, tipos), np.int64), np.zeros((0, tipos), np.int64)
+            dias = (self._instante[fatia] + self._fuso_ns) // NS_POR_DIA
+            primeiro = int(dias.min())
+            chaves = (dias - primeiro) * tipos + self._tipo[fatia]
+            tamanho = (int(dias.max()) - primeiro + 1) * tipos
+            contagens = np.bincount(chaves, minlength=tamanho)
+            somas = np.bincount(chaves, weights=self._centavos[fatia], minlength=tamanho)
+            return primeiro, contagens.reshape(-1, tipos), np.rint(somas).astype(np.int64).reshape(-1, tipos)
+
+        def combinar(anterior, novo):
+            if not len(anterior[1]):
+                return novo
+            if not len(novo[1]):
+                return anterior
+            primeiro = min(anterior[0], novo[0])
+            ultimo = max(anterior[0] + len(anterior[1]), novo[0] + len(novo[1]))
+            resultado = [primeiro]
+            for posicao in (1, 2):
+                total = np.zeros((ultimo - primeiro, tipos), np.int64)
+                for inicio, matriz in ((anterior[0], anterior[posicao]), (novo[0], novo[posicao])):
+                    total[inicio - primeiro:inicio - primeiro + len(matriz)] += matriz
+                resultado.append(total)
+            return tuple(resultado)
+
+        return self._acumulado("por_dia", calcular, combinar)
+
+    # --- Consultas ---
+    def somas_por_conta_tipo(self) -> tuple:
+        """
+        Agrupa os lançamentos por conta e tipo.
+
+        Returns:
+            tuple: (números das contas, contagens[conta, tipo], somas em centavos[conta, tipo]).
+        """
+        contagens, somas = self._por_conta_tipo()
+        return self._numeros_das_contas(), contagens, somas
+
+    def _numeros_das_contas(self) -> np.ndarray:
+        return self._recalculado("numeros", lambda: np.asarray(self._numeros))
+
+    def saldos(self) -> tuple:
+        """
+        Saldo atual de cada conta, somando os lançamentos com o sinal do tipo.
+
+        Returns:
+            tuple: (números das contas, saldos em centavos).
+        """
+        _, somas = self._por_conta_tipo()
+        return self._numeros_das_contas(), self._recalculado("saldos", lambda: somas @ self._sinais)
+
+    def saldos_em(self, instante: int) -> tuple:
+        """
+        Reconstrói o saldo de cada conta em um instante qualquer.
+
+        Args:
+            instante (int): O instante, em ns desde a época; entram os lançamentos até ele, inclusive.
+
+        Returns:
+            tuple: (números das contas, saldos em centavos naquele instante).
+        """
+        def calcular():
+            ate = self._instante <= instante
+            valores = self._centavos[ate] * self._sinais[self._tipo[ate]]
+            saldos = np.bincount(self._conta[ate], weights=valores, minlength=len(self._numeros))
+            return np.rint(saldos).astype(np.int64)
+
+        return self._numeros_das_contas(), self._recalculado(("saldos_em", instante), calcular)
+
+    def totais_diarios(self, tipo: int = None) -> tuple:
+        """
+        Agrupa os lançamentos por dia, de um tipo ou de todos.
+
+        Args:
+            tipo (int): O código do tipo; None soma todos os tipos.
+
+        Returns:
+            tuple: (dias como datetime64[D], contagens, somas em centavos), um dia por posição.
+        """
+        primeiro, contagens, somas = self._por_dia()
+        dias = np.arange(primeiro, primeiro + len(contagens)).astype("datetime64[D]")
+        if tipo is None:
+            return dias, contagens.sum(axis=1), somas.sum(axis=1)
+        return dias, contagens[:, tipo], somas[:, tipo]
+
+    def janela_movel(self, dias: int = 7, tipo: int = None) -> tuple:
+        """
+        Soma móvel dos totais diários: cada dia recebe a soma dele e dos dias - 1 anteriores.
+
+        Args:
+            dias (int): O tamanho da janela, em dias.
+            tipo (int): O código do tipo; None soma todos os tipos.
+
+        Returns:
+            tuple: (dias como datetime64[D], somas da janela em centavos).
+        """
+        calendario, _, somas = self.totais_diarios(tipo)
+        acumulado = np.concatenate([np.zeros(1, np.int64), np.cumsum(somas)])
+        inicio = np.maximum(np.arange(1, len(somas) + 1) - dias, 0)
+        return calendario, acumulado[1:] - acumulado[inicio]
+
+    def maiores(self, tipo: int, quantidade: int = 10) -> list:
+        """
+        As contas com a maior soma no tipo informado (ex.: os maiores sacadores).
+
+        Args:
+            tipo (int): O código do tipo.
+            quantidade (int): Quantas contas retornar.
+
+        Returns:
+            list[tuple[Any, int]]: (número da conta, soma em centavos), da maior para a menor.
+        """
+        def calcular():
+            coluna = somas[:, tipo]
+            primeiros = min(quantidade, len(coluna))
+            if not primeiros:
+                return []
+            candidatas = np.argpartition(coluna, len(coluna) - primeiros)[len(coluna) - primeiros:]
+            ordem = candidatas[np.argsort(coluna[candidatas])[::-1]]
+            return [(self._numeros[indice], int(coluna[indice])) for indice in ordem]
+
+        _, somas = self._por_conta_tipo()
+        return self._recalculado(("maiores", tipo, quantidade), calcular)
+
+    def percentis_saldos(self, percentis=(10, 50, 90, 99), instante: int = None) -> np.ndarray:
+        """
+        Distribuição dos saldos das contas.
+
+        Args:
+            percentis (Sequence[float]): Os percentis desejados (0 a 100).
+            instante (int): Se informado, usa os saldos naquele instante.
+
+        Returns:
+            np.ndarray: O saldo, em centavos, em cada percentil.
+        """
+        def calcular():
+            _, saldos = self.saldos() if instante is None else self.saldos_em(instante)
+            if not len(saldos):
+                return np.zeros(len(percentis), np.int64)
+            return np.rint(np.percentile(saldos, percentis)).astype(np.int64)
+
+        return self._recalculado(("percentis_saldos", tuple(percentis), instante), calcular)
+
+    def percentis_valores(self, tipo: int, percentis=(10, 50, 90, 99)) -> np.ndarray:
+        """
+        Distribuição dos valores dos lançamentos de um tipo.
+
+        Args:
+            tipo (int): O código do tipo.
+            percentis (Sequence[float]): Os percentis desejados (0 a 100).
+
+        Returns:
+            np.ndarray: O valor, em centavos, em cada percentil.
+        """
+        def calcular():
+            valores = self._centavos[self._tipo == tipo]
+            if not len(valores):
+                return np.zeros(len(percentis), np.int64)
+            return np.rint(np.percentile(valores, percentis)).astype(np.int64)
+
+        return self._recalculado(("percentis_valores", tipo, tuple(percentis)), calcular)
+
+
+# --- Benchmark ---
+def benchmark(transacoes: int = 50_000_000, contas: int = 1_000_000, pedaco: int = 5_000_000):
+    """
+    Carrega transacoes lançamentos sintéticos e mede cada consulta com o
+    cache vazio, com o cache cheio e depois de chegar 1% de lançamentos novos.
+    Para comparação, mede os mesmos relatórios com laços sobre dicionários
+    em 1.000.000 de lançamentos.
+    """
+    deposito, saque = 0, 1
+    sinais = (1, -1, -1, 1)
+    gerador = np.random.default_rng(0)
+    agora = time.time_ns()
+    inicio_periodo = agora - 365 * NS_POR_DIA
+
+    def lancamentos(quantidade):
+        return (
+            gerador.integers(0, contas, quantidade, dtype=np.int32),
+            gerador.integers(0, 2, quantidade, dtype=np.uint8),
+            gerador.integers(1, 100_000, quantidade, dtype=np.int64),
+            np.sort(gerador.integers(inicio_periodo, agora, quantidade, dtype=np.int64)),
+        )
+
+    # Referência: os mesmos relatórios feitos com laços sobre dicionários
+    amostra = 1_000_000
+    numeros, tipos, centavos, instantes = lancamentos(amostra)
+    dicionarios = [
+        {"conta": int(numero), "tipo": int(tipo), "valor": int(valor), "instante": int(instante)}
+        for numero, tipo, valor, instante in zip(numeros, tipos, centavos, instantes)
+    ]
+    inicio = time.perf_counter()
+    por_dia, por_conta, sacado = {}, {}, {}
+    for transacao in dicionarios:
+        dia = datetime.fromtimestamp(transacao["instante"] / 1e9).date()
+        por_dia[dia] = por_dia.get(dia, 0) + transacao["valor"]
+        chave = (transacao["conta"], transacao["tipo"])
+        por_conta[chave] = por_conta.get(chave, 0) + transacao["valor"]
+        if transacao["tipo"] == saque:
+            sacado[transacao["conta"]] = sacado.get(transacao["conta"], 0) + transacao["valor"]
+    sorted(sacado.items(), key=lambda item: item[1], reverse=True)[:10]
+    decorrido = time.perf_counter() - inicio
+    print(f"laços sobre dicionários, {amostra:,} lançamentos: {decorrido:.2f} s "
+          f"(~{decorrido * transacoes / amostra:.0f} s estimados para {transacoes:,})")
+    del dicionarios, por_dia, por_conta, sacado
+
+    livro = LivroAnalitico(sinais)
+    inicio = time.perf_counter()
+    for _ in range(transacoes // pedaco):
+        livro.adicionar(*lancamentos(pedaco))
+    livro._consolidar()
+    print(f"carga de {len(livro):,} lançamentos em {contas:,} contas: {time.perf_counter() - inicio:.2f} s")
+
+    consultas = (
+        ("totais por dia", lambda: livro.totais_diarios()),
+        ("somas por conta e tipo", lambda: livro.somas_por_conta_tipo()),
+        ("janela móvel de 7 dias", lambda: livro.janela_movel(7)),
+        ("10 maiores sacadores", lambda: livro.maiores(saque, 10)),
+        ("percentis dos saldos", lambda: livro.percentis_saldos()),
+        ("percentis dos saques", lambda: livro.percentis_valores(saque)),
+        ("saldos há 180 dias", lambda: livro.saldos_em(agora - 180 * NS_POR_DIA)),
+    )
+
+    def medir():
+        tempos = []
+        for _, consulta in consultas:
+            inicio = time.perf_counter()
+            consulta()
+            tempos.append(time.perf_counter() - inicio)
+        return tempos
+
+    frios = medir()
+    quentes = medir()
+    livro.adicionar(*lancamentos(transacoes // 100))
+    incrementais = medir()
+    print("consulta\tcache_vazio_s\tcache_cheio_s\tapos_1%_novos_s")
+    for (nome, _), frio, quente, incremental in zip(consultas, frios, quentes, incrementais):
+        print(f"{nome}\t{frio:.3f}\t{quente:.6f}\t{incremental:.3f}")
+
+    _, saldos = livro.saldos()
+    _, contagens, somas = livro.somas_por_conta_tipo()
+    assert contagens.sum() == len(livro)
+    assert int(saldos.sum()) == int(somas[:, deposito].sum() - somas[:, saque].sum())
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000_000)
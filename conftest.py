@@ -0,0 +1,102 @@
+"""
+Fixtures compartilhadas pelos testes: carregam os scripts da raiz, cujos
+nomes têm espaços e por isso não podem ser importados com import.
+"""
+import importlib.util
+import os
+import sys
+
+import pytest
+
+_RAIZ = os.path.dirname(os.path.abspath(__file__))
+_PASTA_API = os.path.join(_RAIZ, "Desafio dio, desenvolvendo primeira API")
+_MODULOS_API = ("config", "database", "models", "schemas", "main", "routers", "routers.atleta")
+
+
+def carregar_script(arquivo: str, nome: str):
+    """Carrega um script da raiz como o módulo nome, uma vez por sessão."""
+    if nome not in sys.modules:
+        especificacao = importlib.util.spec_from_file_location(nome, os.path.join(_RAIZ, arquivo))
+        modulo = importlib.util.module_from_spec(especificacao)
+        # Registrado antes de executar, para o pickle achar as classes (ex.: nos processos das partições)
+        sys.modules[nome] = modulo
+        especificacao.loader.exec_module(modulo)
+    return sys.modules[nome]
+
+
+@pytest.fixture(scope="session")
+def poo():
+    """O modelo orientado a objetos ("Modelando o sistema bancario em poo com python.py")."""
+    return carregar_script("Modelando o sistema bancario em poo com python.py", "modelando_poo")
+
+
+@pytest.fixture(scope="session")
+def dio01():
+    """O sistema de contas bancárias ("Projeto sistema bancario dio-01.py")."""
+    return carregar_script("Projeto sistema bancario dio-01.py", "projeto_dio01")
+
+
+@pytest.fixture(scope="session")
+def aprimoramento():
+    """O sistema procedural ("Aprimoramento do sistema bancario.py")."""
+    return carregar_script("Aprimoramento do sistema bancario.py", "aprimoramento_sistema")
+
+
+@pytest.fixture
+def cliente(poo):
+    return poo.PessoaFisica("Ana Paula Rodrigues", "15-03-1988", "456.789.012-34", "Rua das Palmeiras, 75")
+
+
+@pytest.fixture
+def entradas(monkeypatch):
+    """Responde aos input() dos scripts com os textos informados, em ordem."""
+    def responder(*respostas):
+        fila = iter(respostas)
+        monkeypatch.setattr("builtins.input", lambda _="": next(fila))
+    return responder
+
+
+@pytest.fixture(scope="module")
+def api(tmp_path_factory):
+    """
+    A API do "Desafio dio, desenvolvendo primeira API" montada numa pasta
+    temporária, com um banco só dela. Alguns arquivos começam com uma linha
+    que é só o caminho deles no projeto (ex.: routers/atleta.py): o arquivo é
+    gravado nesse caminho, sem ela.
+
+    Returns:
+        tuple: (TestClient da aplicação, o módulo routers.atleta).
+    """
+    from fastapi.testclient import TestClient
+
+    pasta = tmp_path_factory.mktemp("api")
+    for nome in os.listdir(_PASTA_API):
+        if not nome.endswith(".py"):
+            continue
+        with open(os.path.join(_PASTA_API, nome), encoding="utf-8") as arquivo:
+            linhas = arquivo.read().splitlines(keepends=True)
+        caminho = nome
+        if linhas and linhas[0].strip().endswith(".py"):
+            caminho = linhas.pop(0).strip()
+        destino = pasta / caminho
+        destino.parent.mkdir(parents=True, exist_ok=True)
+        destino.write_text("".join(linhas), encoding="utf-8")
+    (pasta / "routers" / "__init__.py").touch()
+
+    ambiente = {"DATABASE_ARQUIVO": str(pasta / "atletas.db")}
+    anteriores = {chave: os.environ.get(chave) for chave in ambiente}
+    os.environ.update(ambiente)
+    sys.path.insert(0, str(pasta))
+    try:
+        principal = importlib.import_module("main")
+        with TestClient(principal.app) as cliente:
+            yield cliente, sys.modules["routers.atleta"]
+    finally:
+        sys.path.remove(str(pasta))
+        for nome in _MODULOS_API:
+            sys.modules.pop(nome, None)
+        for chave, valor in anteriores.items():
+            if valor is None:
+                os.environ.pop(chave, None)
+            else:
+                os.environ[chave] = valor
@@ -0,0 +1,345 @@
+"""
+Diário (write-ahead log) em disco, só de acréscimo, compartilhado pelos sistemas bancários.
+
+Cada operação bem-sucedida vira um registro binário: um cabeçalho de tamanho
+fixo seguido do número da conta e de um texto livre, de tamanhos variáveis, e
+do CRC32 do registro. Como os tamanhos variam, o diário só pode ser percorrido
+em ordem, do começo (ou de uma posição conhecida de início de registro).
+Na inicialização, o estado é reconstruído relendo o diário do começo.
+
+Uso: python diario.py  (executa o benchmark de gravação e de releitura)
+"""
+import os
+import struct
+import sys
+import threading
+import time
+import zlib
+from typing import NamedTuple
+
+# Tipos de registro
+ABERTURA = 1
+DEPOSITO = 2
+SAQUE = 3
+TRANSFERENCIA_ENVIADA = 4
+TRANSFERENCIA_RECEBIDA = 5
+USUARIO = 6  # cadastro de um titular: conta é o CPF e texto, os dados em JSON
+
+# Cada registro: cabeçalho, número da conta e texto em UTF-8 e o CRC32 de tudo que vem antes.
+# Cabeçalho: tipo, tamanho da conta, tamanho do texto, centavos, instante (ns)
+_CABECALHO = struct.Struct("<BBHqq")
+_CRC = struct.Struct("<I")
+# Arquivo ao lado do diário (caminho + ".verificado"): até onde ele já foi conferido
+# e o CRC do registro que termina ali, para reconhecer o mesmo arquivo na próxima abertura
+_VERIFICADO = struct.Struct("<q4s")
+TAMANHO_MAXIMO_CONTA = 255
+TAMANHO_MAXIMO_TEXTO = 65_535
+
+
+class Registro(NamedTuple):
+    """Um registro do diário, já decodificado."""
+    tipo: int
+    conta: str
+    centavos: int
+    instante: int
+    texto: str
+
+
+class Diario:
+    """
+    Diário de operações, opcionalmente com gravação em grupo (group commit).
+
+    Por padrão (lote_fsync=1), cada registro é escrito e sincronizado antes
+    de registrar retornar: a operação gravada sobrevive a uma queda. Com
+    lote_fsync=n, os registros ficam em memória até completar o lote e vão
+    ao disco com um único fsync. Não há descarga por tempo: até o lote
+    encher, ou até descarregar, posicao ou fechar, os últimos n - 1 registros
+    existem só em memória, por quanto tempo for, e se perdem em uma queda.
+
+    Ao abrir, um final cortado por uma queda é descartado. Só é conferido o
+    trecho gravado depois da última abertura ou do último fechamento (a
+    posição fica em caminho + ".verificado").
+    """
+    def __init__(self, caminho: str, lote_fsync: int = 1, sincronizar: bool = True):
+        """
+        Abre (ou cria) o diário para acréscimo.
+
+        Args:
+            caminho (str): O arquivo do diário.
+            lote_fsync (int): Quantos registros acumular antes de gravar e sincronizar.
+            sincronizar (bool): Se False, grava sem fsync (mais rápido, menos seguro).
+        """
+        self._caminho = caminho
+        self._caminho_verificado = f"{caminho}.verificado"
+        self._lote_fsync = lote_fsync
+        self._sincronizar = sincronizar
+        self._pendentes = []
+        self._trava = threading.Lock()
+        self._arquivo = open(caminho, "ab")
+        self._descartar_final_incompleto()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
+
+    def _descartar_final_incompleto(self):
+        """
+        Corta do fim do arquivo registros pela metade ou corrompidos deixados
+        por uma queda, conferindo só o que veio depois da posição já verificada.
+        """
+        tamanho = os.fstat(self._arquivo.fileno()).st_size
+        validos = _tamanho_valido(self._caminho, self._posicao_verificada(tamanho))
+        if validos != tamanho:
+            self._arquivo.truncate(validos)
+            self._arquivo.seek(validos)  # tell() não acompanha o truncate sozinho
+        self._marcar_verificado(validos)
+
+    def _posicao_verificada(self, tamanho: int) -> int:
+        """
+        Lê a posição verificada por uma abertura anterior. Se ela não existir
+        ou não bater com o arquivo (ex.: o diário foi trocado ou encurtado), retorna 0.
+        """
+        try:
+            with open(self._caminho_verificado, "rb") as arquivo:
+                posicao, crc = _VERIFICADO.unpack(arquivo.read())
+        except (OSError, struct.error):
+            return 0
+        if not _CRC.size <= posicao <= tamanho:
+            return 0
+        with open(self._caminho, "rb") as arquivo:
+            arquivo.seek(posicao - _CRC.size)
+            if arquivo.read(_CRC.size) != crc:
+                return 0
+        return posicao
+
+    def _marcar_verificado(self, posicao: int):
+        """Guarda a posição até onde o diário é sabidamente íntegro."""
+        if posicao == 0:
+            if os.path.exists(self._caminho_verificado):
+                os.remove(self._caminho_verificado)
+            return
+        with open(self._caminho, "rb") as arquivo:
+            arquivo.seek(posicao - _CRC.size)
+            crc = arquivo.read(_CRC.size)
+        with open(self._caminho_verificado, "wb") as arquivo:
+            arquivo.write(_VERIFICADO.pack(posicao, crc))
+
+    def registrar(self, tipo: int, conta, centavos: int, texto: str = ""):
+        """
+        Acrescenta um registro ao diário.
+
+        Args:
+            tipo (int): O tipo do registro (ABERTURA, DEPOSITO, SAQUE...).
+            conta: O número da conta (até 255 bytes quando convertido em texto).
+            centavos (int): O valor da operação em centavos.
+            texto (str): Texto livre (até 65.535 bytes), ex.: o titular na abertura.
+                Valores maiores lançam ValueError e nada é gravado.
+        """
+        registro = _codificar(tipo, str(conta), centavos, time.time_ns(), texto)
+        with self._trava:
+            self._pendentes.append(registro)
+            if len(self._pendentes) >= self._lote_fsync:
+                self._descarregar()
+
+    def descarregar(self):
+        """Grava e sincroniza os registros pendentes."""
+        with self._trava:
+            self._descarregar()
+
+    def _descarregar(self):
+        if not self._pendentes:
+            return
+        self._arquivo.write(b"".join(self._pendentes))
+        self._pendentes.clear()
+        self._arquivo.flush()
+        if self._sincronizar:
+            os.fsync(self._arquivo.fileno())
+
+    def posicao(self) -> int:
+        """
+        Descarrega os pendentes e retorna o tamanho do diário em bytes.
+        Um instantâneo salvo junto com essa posição só precisa reler o que vier depois dela.
+        """
+        with self._trava:
+            self._descarregar()
+            return self._arquivo.tell()
+
+    def registrar_varios(self, registros):
+        """
+        Acrescenta vários registros juntos: ou todos entram no diário, ou nenhum
+        (ex.: os dois lados de uma transferência).
+
+        Args:
+            registros (Iterable[tuple]): Tuplas (tipo, conta, centavos). Se alguma conta
+                não couber, lança ValueError e nada é gravado.
+        """
+        instante = time.time_ns()
+        codificados = [_codificar(tipo, str(conta), centavos, instante, "") for tipo, conta, centavos in registros]
+        with self._trava:
+            self._pendentes.extend(codificados)
+            if len(self._pendentes) >= self._lote_fsync:
+                self._descarregar()
+
+    def fechar(self):
+        """Descarrega os pendentes, guarda a posição verificada e fecha o arquivo."""
+        with self._trava:
+            self._descarregar()
+            posicao = self._arquivo.tell()
+            self._arquivo.close()
+            self._marcar_verificado(posicao)
+
+
+def _codificar(tipo: int, conta: str, centavos: int, instante: int, texto: str) -> bytes:
+    """Monta um registro completo, com o CRC; lança ValueError se conta ou texto não couberem."""
+    conta, texto = conta.encode(), texto.encode()
+    if len(conta) > TAMANHO_MAXIMO_CONTA or len(texto) > TAMANHO_MAXIMO_TEXTO:
+        raise ValueError(
+            f"Registro não cabe no diário: a conta tem {len(conta)} bytes (máximo {TAMANHO_MAXIMO_CONTA}) "
+            f"e o texto, {len(texto)} (máximo {TAMANHO_MAXIMO_TEXTO})."
+        )
+    dados = _CABECALHO.pack(tipo, len(conta), len(texto), centavos, instante) + conta + texto
+    return dados + _CRC.pack(zlib.crc32(dados))
+
+
+def _tamanho_valido(caminho: str, inicio: int = 0) -> int:
+    """
+    Retorna até onde o arquivo contém registros íntegros. Os registros têm
+    tamanho variável, então o diário é percorrido a partir de inicio, que
+    precisa ser o começo de um registro.
+    """
+    fim = inicio
+    for fim, *_ in _ler_dados(caminho, inicio):
+        pass
+    return fim
+
+
+def _ler_dados(caminho: str, inicio: int = 0, tamanho_bloco: int = 1 << 22):
+    """
+    Percorre os registros válidos a partir do byte inicio (o começo de um registro), lendo em blocos.
+
+    Yields:
+        tuple: (fim, tipo, conta, centavos, instante, texto), com conta e texto em bytes
+            e fim sendo a posição logo depois do registro.
+    """
+    if not os.path.exists(caminho):
+        return
+    ler_cabecalho = _CABECALHO.unpack_from
+    tamanho_cabecalho = _CABECALHO.size
+    tamanho_crc = _CRC.size
+    with open(caminho, "rb") as arquivo:
+        # Uma queda só pode estragar o fim do arquivo (o que ainda não tinha
+        # passado por fsync), então o CRC é conferido apenas no último bloco
+        inicio_final = max(0, os.fstat(arquivo.fileno()).st_size - tamanho_bloco)
+        arquivo.seek(inicio)
+        posicao = inicio  # posição, no arquivo, do primeiro byte de dados
+        dados = b""
+        while bloco := arquivo.read(tamanho_bloco):
+            dados += bloco
+            tamanho = len(dados)
+            conferir = posicao + tamanho > inicio_final
+            atual = 0
+            while atual + tamanho_cabecalho <= tamanho:
+                tipo, tamanho_conta, tamanho_texto, centavos, instante = ler_cabecalho(dados, atual)
+                inicio_conta = atual + tamanho_cabecalho
+                inicio_texto = inicio_conta + tamanho_conta
+                fim_dados = inicio_texto + tamanho_texto
+                fim = fim_dados + tamanho_crc
+                if fim > tamanho:
+                    break  # registro continua no próximo bloco (ou foi cortado por uma queda)
+                if conferir and posicao + atual >= inicio_final and _registro_corrompido(dados, atual, fim_dados):
+                    return  # o diário válido termina aqui
+                atual = fim
+                yield posicao + fim, tipo, dados[inicio_conta:inicio_texto], centavos, instante, dados[inicio_texto:fim_dados]
+            posicao += atual
+            dados = dados[atual:]
+
+
+def _registro_corrompido(dados: bytes, inicio: int, fim_dados: int) -> bool:
+    with memoryview(dados) as visao:
+        return zlib.crc32(visao[inicio:fim_dados]) != _CRC.unpack_from(visao, fim_dados)[0]
+
+
+def reproduzir(caminho: str, inicio: int = 0):
+    """
+    Relê o diário, registro a registro.
+
+    Args:
+        caminho (str): O arquivo do diário.
+        inicio (int): A posição, em bytes, de onde começar (ex.: a de um instantâneo).
+
+    Yields:
+        Registro: Cada registro válido, na ordem em que foi gravado.
+    """
+    for _, tipo, conta, centavos, instante, texto in _ler_dados(caminho, inicio):
+        yield Registro(tipo, conta.decode(), centavos, instante, texto.decode())
+
+
+def reproduzir_com_posicoes(caminho: str, inicio: int = 0):
+    """
+    Como reproduzir, mas junto com cada registro vem a posição logo depois
+    dele: a última posição recebida é até onde a releitura chegou.
+
+    Yields:
+        tuple[int, Registro]: (fim, registro).
+    """
+    for fim, tipo, conta, centavos, instante, texto in _ler_dados(caminho, inicio):
+        yield fim, Registro(tipo, conta.decode(), centavos, instante, texto.decode())
+
+
+def reconstruir_saldos(caminho: str) -> dict:
+    """
+    Soma o diário inteiro e retorna o saldo, em centavos, de cada conta.
+
+    Args:
+        caminho (str): O arquivo do diário.
+
+    Returns:
+        dict: Número da conta (texto) -> saldo em centavos.
+    """
+    saldos = {}
+    sinais = {ABERTURA: 1, DEPOSITO: 1, SAQUE: -1, TRANSFERENCIA_ENVIADA: -1, TRANSFERENCIA_RECEBIDA: 1}
+    for _, tipo, conta, centavos, _, _ in _ler_dados(caminho):
+        if tipo in sinais:  # cadastros de usuários não mexem em saldos
+            saldos[conta] = saldos.get(conta, 0) + sinais[tipo] * centavos
+    return {conta.decode(): saldo for conta, saldo in saldos.items()}
+
+
+# --- Benchmark ---
+def benchmark(registros_replay: int = 10_000_000):
+    """
+    Mede gravações por segundo com e sem fsync em lote e o tempo para
+    reconstruir os saldos de um diário com registros_replay registros.
+    """
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        print("modo\tregistros_por_segundo")
+        for nome, quantidade, lote, sincronizar in (
+            ("fsync a cada registro (padrão)", 2_000, 1, True),
+            ("fsync a cada 64", 50_000, 64, True),
+            ("fsync a cada 1024", 200_000, 1024, True),
+            ("sem fsync", 200_000, 1024, False),
+        ):
+            caminho = os.path.join(diretorio, f"{lote}-{sincronizar}.diario")
+            inicio = time.perf_counter()
+            with Diario(caminho, lote_fsync=lote, sincronizar=sincronizar) as diario:
+                for i in range(quantidade):
+                    diario.registrar(DEPOSITO, i % 100_000, 1_000)
+            print(f"{nome}\t{quantidade / (time.perf_counter() - inicio):,.0f}")
+
+        caminho = os.path.join(diretorio, "replay.diario")
+        modelo = [_codificar(DEPOSITO if i % 3 else SAQUE, str(i), 1_000, time.time_ns(), "") for i in range(100_000)]
+        with open(caminho, "wb") as arquivo:
+            bloco = b"".join(modelo)
+            for _ in range(registros_replay // len(modelo)):
+                arquivo.write(bloco)
+        inicio = time.perf_counter()
+        saldos = reconstruir_saldos(caminho)
+        decorrido = time.perf_counter() - inicio
+        print(f"releitura de {registros_replay:,} registros ({len(saldos):,} contas): {decorrido:.2f} s")
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000)
@@ -0,0 +1,186 @@
+"""
+Tipo monetário exato em centavos inteiros, compartilhado pelos sistemas bancários.
+
+Uso: python dinheiro.py [ciclos]  (executa o benchmark)
+"""
+import sys
+import time
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+
+# hash(Dinheiro) segue a regra de hash numérico do Python: p/q vira p * q⁻¹ módulo este primo
+_MODULO_HASH = sys.hash_info.modulus
+_INVERSO_DE_100 = pow(100, -1, _MODULO_HASH)
+
+
+class Dinheiro:
+    """
+    Representa um valor em reais guardado como um número inteiro de centavos.
+    Soma, subtração e comparação são feitas com inteiros, sem erro de arredondamento.
+    Na igualdade, um Dinheiro só é igual a outro Dinheiro, a um int ou a um Decimal
+    de mesmo valor exato: floats (ex.: 0.1, que não vale exatamente 0,10) nunca são iguais.
+    """
+    __slots__ = ("_centavos",)
+
+    def __new__(cls, valor=0):
+        """
+        Cria um valor monetário.
+
+        Args:
+            valor (Dinheiro | int | float | str | Decimal): O valor em reais.
+                Floats e textos são arredondados para o centavo mais próximo; o que não
+                for um número finito (ex.: "abc", inf ou nan) lança ValueError.
+        """
+        if type(valor) is cls:
+            return valor
+        self = object.__new__(cls)
+        if type(valor) is int:
+            self._centavos = valor * 100
+        else:
+            try:
+                decimal = Decimal(repr(valor) if type(valor) is float else valor)
+            except InvalidOperation:
+                decimal = None
+            if decimal is None or not decimal.is_finite():
+                raise ValueError(f"Valor monetário inválido: {valor!r}")
+            self._centavos = int(decimal.scaleb(2).quantize(Decimal(1), ROUND_HALF_UP))
+        return self
+
+    @classmethod
+    def de_centavos(cls, centavos: int):
+        """
+        Cria um valor monetário diretamente a partir de centavos.
+
+        Args:
+            centavos (int): O valor em centavos.
+        """
+        self = object.__new__(cls)
+        self._centavos = centavos
+        return self
+
+    @property
+    def centavos(self) -> int:
+        """Retorna o valor em centavos."""
+        return self._centavos
+
+    def __add__(self, outro):
+        if type(outro) is not Dinheiro:
+            outro = Dinheiro(outro)
+        novo = object.__new__(Dinheiro)
+        novo._centavos = self._centavos + outro._centavos
+        return novo
+
+    __radd__ = __add__
+
+    def __sub__(self, outro):
+        if type(outro) is not Dinheiro:
+            outro = Dinheiro(outro)
+        novo = object.__new__(Dinheiro)
+        novo._centavos = self._centavos - outro._centavos
+        return novo
+
+    def __rsub__(self, outro):
+        return Dinheiro(outro) - self
+
+    def __mul__(self, fator: int):
+        if type(fator) is not int:
+            return NotImplemented
+        return Dinheiro.de_centavos(self._centavos * fator)
+
+    __rmul__ = __mul__
+
+    def __neg__(self):
+        return Dinheiro.de_centavos(-self._centavos)
+
+    def __abs__(self):
+        return Dinheiro.de_centavos(abs(self._centavos))
+
+    def __bool__(self) -> bool:
+        return self._centavos != 0
+
+    def __eq__(self, outro) -> bool:
+        if type(outro) is Dinheiro:
+            return self._centavos == outro._centavos
+        # Só comparações exatas, para o hash igual ao do número equivalente valer
+        if isinstance(outro, int):
+            return self._centavos == outro * 100
+        if isinstance(outro, Decimal):
+            return Decimal(self._centavos).scaleb(-2) == outro
+        return NotImplemented
+
+    def __lt__(self, outro) -> bool:
+        if type(outro) is not Dinheiro:
+            outro = Dinheiro(outro)
+        return self._centavos < outro._centavos
+
+    def __le__(self, outro) -> bool:
+        if type(outro) is not Dinheiro:
+            outro = Dinheiro(outro)
+        return self._centavos <= outro._centavos
+
+    def __gt__(self, outro) -> bool:
+        if type(outro) is not Dinheiro:
+            outro = Dinheiro(outro)
+        return self._centavos > outro._centavos
+
+    def __ge__(self, outro) -> bool:
+        if type(outro) is not Dinheiro:
+            outro = Dinheiro(outro)
+        return self._centavos >= outro._centavos
+
+    def __hash__(self) -> int:
+        # O mesmo valor de hash(Fraction(centavos, 100)), já que Dinheiro(1) == 1,
+        # calculado com inteiros, sem criar a fração
+        centavos = self._centavos
+        resultado = abs(centavos) % _MODULO_HASH * _INVERSO_DE_100 % _MODULO_HASH
+        if centavos < 0:
+            resultado = -resultado
+        return -2 if resultado == -1 else resultado
+
+    def __float__(self) -> float:
+        return self._centavos / 100
+
+    def __str__(self) -> str:
+        centavos = self._centavos
+        sinal = "-" if centavos < 0 else ""
+        reais, resto = divmod(abs(centavos), 100)
+        return f"{sinal}{reais}.{resto:02d}"
+
+    def __repr__(self) -> str:
+        return f"Dinheiro('{self}')"
+
+    def __format__(self, especificacao: str) -> str:
+        # O formato usado nos extratos (".2f") é montado direto dos centavos
+        if especificacao in ("", ".2f"):
+            return str(self)
+        return format(Decimal(self._centavos).scaleb(-2), especificacao)
+
+    def __reduce__(self):
+        return (Dinheiro.de_centavos, (self._centavos,))
+
+
+# --- Benchmark ---
+def benchmark_ciclos(ciclos: int = 1_000_000):
+    """
+    Mede ciclos de depósito e saque com float, Decimal e Dinheiro.
+
+    Args:
+        ciclos (int): Quantos pares depósito/saque executar.
+    """
+    print("tipo\tsegundos\tsaldo_final")
+    for nome, deposito, saque, saldo in (
+        ("float", 0.10, 0.07, 0.0),
+        ("Decimal", Decimal("0.10"), Decimal("0.07"), Decimal(0)),
+        ("Dinheiro", Dinheiro("0.10"), Dinheiro("0.07"), Dinheiro()),
+        # Referência: a mesma conta feita direto sobre os centavos inteiros
+        ("centavos", Dinheiro("0.10").centavos, Dinheiro("0.07").centavos, 0),
+    ):
+        inicio = time.perf_counter()
+        for _ in range(ciclos):
+            saldo += deposito
+            saldo -= saque
+        decorrido = time.perf_counter() - inicio
+        print(f"{nome}\t{decorrido:.2f}\t{saldo}")
+
+
+if __name__ == "__main__":
+    benchmark_ciclos(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,290 @@
+"""
+Exportação de extratos em fluxo (CSV, JSON Lines ou arquivo colunar binário).
+
+Os lançamentos são lidos dos históricos em lotes de tamanho fixo e cada lote
+é formatado e escrito de uma vez, então a memória usada não depende do
+tamanho dos históricos. Nomes de tipo, valores e datas são formatados a
+partir de tabelas e caches, não linha a linha.
+
+Uso: python exportacao.py [linhas]  (executa o benchmark de exportação)
+"""
+import json
+import multiprocessing
+import os
+import struct
+import sys
+import tempfile
+import threading
+import time
+from array import array
+
+FORMATOS = ("csv", "jsonl", "colunar")
+TAMANHO_LOTE = 65_536
+
+_MAGIA_COLUNAR = b"EXTRATO1"
+_LINHAS_DO_GRUPO = struct.Struct("<I")
+# "HH:MM:SS" de cada segundo do dia, montado uma única vez
+_HORARIOS = [f"{hora:02d}:{minuto:02d}:{segundo:02d}" for hora in range(24) for minuto in range(60) for segundo in range(60)]
+
+
+def lotes_das_contas(contas, tamanho_lote: int = TAMANHO_LOTE):
+    """
+    Percorre os lançamentos de uma ou mais contas em lotes de até tamanho_lote linhas.
+    Cada fatia do histórico é copiada sob a trava da conta.
+
+    Args:
+        contas (Iterable[Conta]): As contas a exportar, na ordem desejada.
+        tamanho_lote (int): O número máximo de linhas por lote.
+
+    Yields:
+        tuple: (números das contas, códigos de tipo, centavos, instantes em ns), em arrays.
+    """
+    lote = _lote_vazio()
+    for conta in contas:
+        inicio = 0
+        while True:
+            espaco = tamanho_lote - len(lote[1])
+            with conta.trava:
+                tipos, centavos, instantes = conta.historico.colunas(inicio, inicio + espaco)
+            if not tipos:
+                break
+            lote[0].extend(array("q", [conta.numero]) * len(tipos))
+            lote[1].extend(tipos)
+            lote[2].extend(centavos)
+            lote[3].extend(instantes)
+            inicio += len(tipos)
+            if len(lote[1]) == tamanho_lote:
+                yield lote
+                lote = _lote_vazio()
+    if lote[1]:
+        yield lote
+
+
+def _lote_vazio() -> tuple:
+    return array("q"), array("B"), array("q"), array("q")
+
+
+class _FormatadorDatas:
+    """Converte instantes em "DD-MM-AAAA HH:MM:SS" locais, calculando a data só na virada do dia."""
+    def __init__(self):
+        self._inicio = self._fim = 0
+        self._data = ""
+
+    def __call__(self, instante: int) -> str:
+        segundo = instante // 1_000_000_000
+        if not self._inicio <= segundo < self._fim:
+            local = time.localtime(segundo)
+            self._inicio = segundo - (local.tm_hour * 3600 + local.tm_min * 60 + local.tm_sec)
+            self._fim = self._inicio + 86_400
+            if time.localtime(self._fim - 1).tm_gmtoff != local.tm_gmtoff:
+                # Dia com mudança de horário: a janela vale só até a próxima hora cheia
+                self._fim = segundo - local.tm_min * 60 - local.tm_sec + 3600
+            self._data = time.strftime("%d-%m-%Y ", local)
+        return self._data + _HORARIOS[segundo - self._inicio]
+
+
+class _FormatadorValores:
+    """Converte centavos em "123.45", guardando os valores já vistos (até um limite)."""
+    def __init__(self, limite: int = 65_536):
+        self._cache = {}
+        self._limite = limite
+
+    def __call__(self, centavos: int) -> str:
+        texto = self._cache.get(centavos)
+        if texto is None:
+            if len(self._cache) >= self._limite:
+                self._cache.clear()
+            reais, resto = divmod(abs(centavos), 100)
+            texto = self._cache[centavos] = f"{'-' if centavos < 0 else ''}{reais}.{resto:02d}"
+        return texto
+
+
+def exportar_csv(lotes, arquivo, nomes_tipo) -> int:
+    """
+    Escreve os lotes como CSV (conta,tipo,valor,data), um write por lote.
+
+    Args:
+        lotes (Iterable[tuple]): Lotes no formato de lotes_das_contas.
+        arquivo (TextIO): Onde escrever.
+        nomes_tipo (Sequence[str]): O nome de cada código de tipo.
+
+    Returns:
+        int: Quantas linhas foram escritas.
+    """
+    nomes = [nome if "," not in nome and '"' not in nome else '"' + nome.replace('"', '""') + '"' for nome in nomes_tipo]
+    data, valor = _FormatadorDatas(), _FormatadorValores()
+    arquivo.write("conta,tipo,valor,data\n")
+    linhas = 0
+    for contas, tipos, centavos, instantes in lotes:
+        arquivo.write("".join([
+            f"{conta},{nomes[tipo]},{valor(quantia)},{data(instante)}\n"
+            for conta, tipo, quantia, instante in zip(contas, tipos, centavos, instantes)
+        ]))
+        linhas += len(tipos)
+    return linhas
+
+
+def exportar_jsonl(lotes, arquivo, nomes_tipo) -> int:
+    """
+    Escreve os lotes como JSON Lines, um objeto por lançamento e um write por lote.
+    O valor sai como número decimal exato (ex.: 10.50).
+
+    Args:
+        lotes (Iterable[tuple]): Lotes no formato de lotes_das_contas.
+        arquivo (TextIO): Onde escrever.
+        nomes_tipo (Sequence[str]): O nome de cada código de tipo.
+
+    Returns:
+        int: Quantas linhas foram escritas.
+    """
+    nomes = [json.dumps(nome, ensure_ascii=False) for nome in nomes_tipo]
+    data, valor = _FormatadorDatas(), _FormatadorValores()
+    linhas = 0
+    for contas, tipos, centavos, instantes in lotes:
+        arquivo.write("".join([
+            f'{{"conta": {conta}, "tipo": {nomes[tipo]}, "valor": {valor(quantia)}, "data": "{data(instante)}"}}\n'
+            for conta, tipo, quantia, instante in zip(contas, tipos, centavos, instantes)
+        ]))
+        linhas += len(tipos)
+    return linhas
+
+
+def exportar_colunar(lotes, arquivo, nomes_tipo) -> int:
+    """
+    Escreve os lotes em um arquivo binário colunar: um cabeçalho com os nomes
+    dos tipos e, para cada lote, um grupo com as colunas conta (int64),
+    tipo (uint8), centavos (int64) e instante em ns (int64), em little-endian.
+    Um grupo vazio marca o fim. Leia com ler_colunar.
+
+    Args:
+        lotes (Iterable[tuple]): Lotes no formato de lotes_das_contas.
+        arquivo (BinaryIO): Onde escrever.
+        nomes_tipo (Sequence[str]): O nome de cada código de tipo.
+
+    Returns:
+        int: Quantas linhas foram escritas.
+    """
+    nomes = json.dumps(list(nomes_tipo)).encode()
+    arquivo.write(_MAGIA_COLUNAR + _LINHAS_DO_GRUPO.pack(len(nomes)) + nomes)
+    linhas = 0
+    for lote in lotes:
+        arquivo.write(_LINHAS_DO_GRUPO.pack(len(lote[1])))
+        for coluna in lote:
+            if sys.byteorder != "little":
+                coluna = array(coluna.typecode, coluna)
+                coluna.byteswap()
+            arquivo.write(coluna)
+        linhas += len(lote[1])
+    arquivo.write(_LINHAS_DO_GRUPO.pack(0))
+    return linhas
+
+
+def ler_colunar(arquivo):
+    """
+    Relê um arquivo escrito por exportar_colunar, um grupo por vez.
+
+    Args:
+        arquivo (BinaryIO): O arquivo aberto para leitura.
+
+    Yields:
+        tuple: (nomes dos tipos, (contas, tipos, centavos, instantes)) de cada grupo.
+    """
+    if arquivo.read(len(_MAGIA_COLUNAR)) != _MAGIA_COLUNAR:
+        raise ValueError("O arquivo não é um extrato colunar.")
+    (tamanho,) = _LINHAS_DO_GRUPO.unpack(arquivo.read(_LINHAS_DO_GRUPO.size))
+    nomes = json.loads(arquivo.read(tamanho))
+    while True:
+        (linhas,) = _LINHAS_DO_GRUPO.unpack(arquivo.read(_LINHAS_DO_GRUPO.size))
+        if not linhas:
+            return
+        lote = _lote_vazio()
+        for coluna in lote:
+            coluna.frombytes(arquivo.read(linhas * coluna.itemsize))
+            if sys.byteorder != "little":
+                coluna.byteswap()
+        yield nomes, lote
+
+
+EXPORTADORES = {"csv": exportar_csv, "jsonl": exportar_jsonl, "colunar": exportar_colunar}
+
+
+def exportar(lotes, caminho: str, formato: str, nomes_tipo) -> int:
+    """
+    Exporta os lotes para um arquivo no formato escolhido.
+
+    Args:
+        lotes (Iterable[tuple]): Lotes no formato de lotes_das_contas.
+        caminho (str): O arquivo de saída.
+        formato (str): "csv", "jsonl" ou "colunar".
+        nomes_tipo (Sequence[str]): O nome de cada código de tipo.
+
+    Returns:
+        int: Quantas linhas foram escritas.
+    """
+    if formato not in EXPORTADORES:
+        raise ValueError(f"Formato desconhecido: {formato}. Use um de {', '.join(FORMATOS)}.")
+    if formato == "colunar":
+        with open(caminho, "wb") as arquivo:
+            return exportar_colunar(lotes, arquivo, nomes_tipo)
+    with open(caminho, "w", encoding="utf-8", newline="") as arquivo:
+        return EXPORTADORES[formato](lotes, arquivo, nomes_tipo)
+
+
+# --- Benchmark ---
+class _ContaSintetica:
+    """
+    Conta mínima para o benchmark: o histórico repete um bloco de colunas
+    pré-montado, então gerar os dados não pesa na medição nem na memória.
+    """
+    def __init__(self, numero: int, linhas: int):
+        self.numero = numero
+        self.trava = threading.RLock()
+        self.historico = self
+        self._linhas = linhas
+        inicio_ns = time.time_ns() - 400 * 86_400 * 1_000_000_000
+        posicoes = range(TAMANHO_LOTE)
+        self._bloco = (
+            array("B", (posicao & 1 for posicao in posicoes)),
+            array("q", (1 + posicao * 7919 % 100_000 for posicao in posicoes)),
+            array("q", (inicio_ns + posicao * 700_000_000 for posicao in posicoes)),
+        )
+
+    def colunas(self, inicio: int = 0, fim: int = None) -> tuple:
+        fim = self._linhas if fim is None else min(fim, self._linhas)
+        colunas = _lote_vazio()[1:]
+        while inicio < fim:
+            deslocamento = inicio % TAMANHO_LOTE
+            parte = min(fim - inicio, TAMANHO_LOTE - deslocamento)
+            for coluna, bloco in zip(colunas, self._bloco):
+                coluna.extend(bloco[deslocamento:deslocamento + parte])
+            inicio += parte
+        return colunas
+
+
+def _medir_exportacao(formato: str, linhas: int, diretorio: str) -> tuple:
+    import resource  # só existe em sistemas Unix; importado aqui para o módulo abrir também no Windows
+
+    conta = _ContaSintetica(1, linhas)
+    caminho = os.path.join(diretorio, f"extrato.{formato}")
+    inicio = time.perf_counter()
+    escritas = exportar(lotes_das_contas([conta]), caminho, formato, ("Depósito", "Saque"))
+    decorrido = time.perf_counter() - inicio
+    return escritas / decorrido, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def benchmark(linhas: int = 5_000_000):
+    """
+    Mede linhas por segundo e o pico de memória (RSS) de cada formato,
+    exportando um histórico de linhas lançamentos e outro 10 vezes menor.
+    Cada medição roda em um processo novo, para o pico de RSS ser só dela.
+    """
+    print("formato\tlinhas\tlinhas_por_segundo\tpico_rss_mb")
+    with tempfile.TemporaryDirectory() as diretorio, multiprocessing.get_context("spawn").Pool(1, maxtasksperchild=1) as processos:
+        for formato in FORMATOS:
+            for quantidade in (linhas // 10, linhas):
+                por_segundo, pico = processos.apply(_medir_exportacao, (formato, quantidade, diretorio))
+                print(f"{formato}\t{quantidade:,}\t{por_segundo:,.0f}\t{pico:.1f}")
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 5_000_000)
@@ -0,0 +1,335 @@
+"""
+Instantâneo em disco para partida rápida: contas, clientes e saldos gravados
+em um arquivo colunar, aberto depois via mmap.
+
+Os saldos e cadastros são lidos direto do arquivo mapeado; os objetos de
+conta e de cliente só são criados quando uma conta é acessada, pelo modelo
+de quem abre o instantâneo (ver ModeloInstantaneo). Os registros do diário
+(diario.py) gravados depois do instantâneo são aplicados por cima.
+
+O histórico das contas não é gravado, só a contagem e a soma dos saques do
+último dia com saques, para que o limite diário continue valendo depois de
+abrir o instantâneo.
+"""
+import bisect
+import itertools
+import mmap
+import os
+import struct
+from array import array
+from typing import Protocol
+
+import diario
+from dinheiro import Dinheiro
+
+_MAGIA = b"POOSNAP1"
+_VERSAO = 2
+# magia, versão, quantidade de seções, de contas, de clientes e posição coberta do diário
+_CABECALHO = struct.Struct("<8sIIqqq")
+_SECAO = struct.Struct("<qq")  # deslocamento e tamanho de cada coluna
+# Colunas do arquivo, na ordem em que são gravadas; textos são (deslocamentos, bytes)
+_COLUNAS = (
+    ("numeros", "q"),
+    ("centavos", "q"),
+    ("tipos", "B"),
+    ("limites", "q"),
+    ("limites_saques", "i"),
+    # Janela de saques do dia: o dia (date.toordinal(), 0 se nenhum), quantos e quanto
+    ("dias_saques", "q"),
+    ("saques_no_dia", "i"),
+    ("centavos_sacados_no_dia", "q"),
+    ("clientes", "i"),
+    ("agencias", "q"), ("agencias_texto", "B"),
+    ("nomes", "q"), ("nomes_texto", "B"),
+    ("nascimentos", "q"), ("nascimentos_texto", "B"),
+    ("cpfs", "q"), ("cpfs_texto", "B"),
+    ("enderecos", "q"), ("enderecos_texto", "B"),
+    # Contas de cada cliente: posições em contas_cliente[inicio_contas_cliente[i]:inicio_contas_cliente[i + 1]]
+    ("inicio_contas_cliente", "q"),
+    ("contas_cliente", "i"),
+)
+
+
+class ModeloInstantaneo(Protocol):
+    """O que o instantâneo precisa saber do modelo de contas."""
+    sinais: dict
+    """Tipo de registro do diário -> 1 se credita e -1 se debita a conta; outros tipos são ignorados."""
+
+    def saques_do_dia(self, conta) -> tuple:
+        """Retorna (dia, quantidade, centavos) dos saques do último dia da conta, ou (None, 0, 0)."""
+
+    def materializar(self, cliente: dict, contas: list) -> list:
+        """
+        Recebe os dados do cliente (nome, data_nascimento, cpf, endereco) e os de
+        cada conta dele (numero, centavos, corrente, limite em centavos,
+        limite_saques, agencia e os saques do dia: dia_saques, saques_no_dia e
+        centavos_sacados_no_dia) e retorna as contas criadas, na mesma ordem.
+        """
+
+    def aplicar(self, conta, tipo: int, centavos: int, instante: int):
+        """Refaz na conta já criada um registro do diário."""
+
+
+def _coluna_texto(textos) -> tuple:
+    """Codifica uma coluna de textos como deslocamentos (n + 1) e um bloco de bytes UTF-8."""
+    deslocamentos = array("q", [0])
+    blocos = []
+    total = 0
+    for texto in textos:
+        codificado = texto.encode()
+        blocos.append(codificado)
+        total += len(codificado)
+        deslocamentos.append(total)
+    return deslocamentos, b"".join(blocos)
+
+
+def salvar(modelo: ModeloInstantaneo, contas, caminho: str, posicao_diario: int = 0) -> int:
+    """
+    Grava contas, clientes e saldos em um arquivo colunar que pode ser
+    aberto com Instantaneo. O arquivo é escrito ao lado e renomeado no fim,
+    então uma queda no meio nunca deixa um instantâneo pela metade.
+
+    Args:
+        modelo (ModeloInstantaneo): Informa os saques do dia de cada conta.
+        contas (Iterable[Conta]): As contas a gravar; os clientes vêm junto. Contas com
+            limite_saques são gravadas como contas correntes.
+        caminho (str): O arquivo do instantâneo.
+        posicao_diario (int): Até onde o diário já está refletido nos saldos (Diario.posicao()).
+
+    Returns:
+        int: Quantas contas foram gravadas.
+    """
+    colunas = {nome: array(codigo) for nome, codigo in _COLUNAS}
+    agencias, clientes, contas_por_cliente = [], [], []
+    indice_cliente = {}
+    for conta in sorted(contas, key=lambda conta: conta.numero):
+        posicao = len(colunas["numeros"])
+        corrente = hasattr(conta, "limite_saques")
+        colunas["numeros"].append(conta.numero)
+        colunas["centavos"].append(conta.saldo.centavos)
+        colunas["tipos"].append(corrente)
+        colunas["limites"].append(conta.limite.centavos if corrente else 0)
+        colunas["limites_saques"].append(conta.limite_saques if corrente else 0)
+        dia, saques, centavos_sacados = modelo.saques_do_dia(conta)
+        colunas["dias_saques"].append(dia.toordinal() if dia else 0)
+        colunas["saques_no_dia"].append(saques)
+        colunas["centavos_sacados_no_dia"].append(centavos_sacados)
+        agencias.append(conta.agencia)
+        indice = indice_cliente.get(id(conta.cliente))
+        if indice is None:
+            indice = indice_cliente[id(conta.cliente)] = len(clientes)
+            clientes.append(conta.cliente)
+            contas_por_cliente.append([])
+        colunas["clientes"].append(indice)
+        contas_por_cliente[indice].append(posicao)
+
+    textos = {
+        "agencias": agencias,
+        "nomes": [getattr(cliente, "nome", "") for cliente in clientes],
+        "nascimentos": [getattr(cliente, "data_nascimento", "") for cliente in clientes],
+        "cpfs": [getattr(cliente, "cpf", "") for cliente in clientes],
+        "enderecos": [cliente.endereco for cliente in clientes],
+    }
+    for nome, valores in textos.items():
+        colunas[nome], colunas[f"{nome}_texto"] = _coluna_texto(valores)
+    colunas["inicio_contas_cliente"] = array("q", itertools.accumulate(map(len, contas_por_cliente), initial=0))
+    colunas["contas_cliente"] = array("i", itertools.chain.from_iterable(contas_por_cliente))
+
+    # Cada coluna começa alinhada em 8 bytes, para ser lida direto do mmap
+    secoes = []
+    deslocamento = _CABECALHO.size + _SECAO.size * len(_COLUNAS)
+    for nome, _ in _COLUNAS:
+        deslocamento += -deslocamento % 8
+        tamanho = len(memoryview(colunas[nome]).cast("B"))
+        secoes.append((deslocamento, tamanho))
+        deslocamento += tamanho
+
+    temporario = f"{caminho}.tmp"
+    with open(temporario, "wb") as arquivo:
+        arquivo.write(_CABECALHO.pack(
+            _MAGIA, _VERSAO, len(_COLUNAS),
+            len(colunas["numeros"]), len(clientes), posicao_diario,
+        ))
+        for secao in secoes:
+            arquivo.write(_SECAO.pack(*secao))
+        for (nome, _), (inicio, _) in zip(_COLUNAS, secoes):
+            arquivo.write(bytes(inicio - arquivo.tell()))
+            arquivo.write(colunas[nome])
+        arquivo.flush()
+        os.fsync(arquivo.fileno())
+    os.replace(temporario, caminho)
+    return len(colunas["numeros"])
+
+
+class Instantaneo:
+    """
+    Livro de contas aberto a partir de um instantâneo em disco, via mmap.
+    Saldos e cadastros são lidos direto do arquivo mapeado; os objetos das
+    contas só são criados, por materializar, quando uma conta é acessada por
+    conta(). Os registros do diário posteriores ao instantâneo são aplicados por cima.
+    """
+    def __init__(self, caminho: str, modelo: ModeloInstantaneo, caminho_diario: str = None):
+        """
+        Mapeia o instantâneo e, se informado, aplica a cauda do diário.
+
+        Args:
+            caminho (str): O arquivo salvo por salvar.
+            modelo (ModeloInstantaneo): Cria as contas e refaz nelas os registros do diário.
+            caminho_diario (str): O diário que continuou sendo gravado depois do instantâneo.
+        """
+        with open(caminho, "rb") as arquivo:
+            self._mapa = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        self._visao = memoryview(self._mapa)
+        magia, versao, quantidade_secoes, quantidade, _, self.posicao_diario = _CABECALHO.unpack_from(self._visao)
+        if magia != _MAGIA or versao != _VERSAO or quantidade_secoes != len(_COLUNAS):
+            self.fechar()
+            raise ValueError(f"{caminho} não é um instantâneo válido.")
+        self._colunas = {}
+        for indice, (nome, codigo) in enumerate(_COLUNAS):
+            inicio, tamanho = _SECAO.unpack_from(self._visao, _CABECALHO.size + _SECAO.size * indice)
+            self._colunas[nome] = self._visao[inicio:inicio + tamanho].cast(codigo)
+        self._quantidade = quantidade
+        self._modelo = modelo
+        self._contas = {}  # contas já materializadas, por número
+        self._ajustes = {}  # número -> centavos vindos do diário, para contas não materializadas
+        self._cauda = {}  # número -> registros do diário ainda não aplicados a um objeto
+        if caminho_diario is not None:
+            self.aplicar_diario(caminho_diario)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
+
+    def __len__(self) -> int:
+        return self._quantidade
+
+    def __contains__(self, numero: int) -> bool:
+        return self._posicao(numero) is not None
+
+    def _posicao(self, numero: int):
+        numeros = self._colunas["numeros"]
+        posicao = bisect.bisect_left(numeros, numero)
+        if posicao < len(numeros) and numeros[posicao] == numero:
+            return posicao
+        return None
+
+    def _texto(self, coluna: str, indice: int) -> str:
+        deslocamentos = self._colunas[coluna]
+        return str(self._colunas[f"{coluna}_texto"][deslocamentos[indice]:deslocamentos[indice + 1]], "utf-8")
+
+    def numeros(self):
+        """Percorre, em ordem, os números das contas do instantâneo."""
+        return iter(self._colunas["numeros"])
+
+    def saldo(self, numero: int) -> Dinheiro:
+        """
+        Retorna o saldo de uma conta sem criar o objeto da conta.
+
+        Args:
+            numero (int): O número da conta.
+
+        Returns:
+            Dinheiro: O saldo, já com os lançamentos do diário aplicados.
+        """
+        conta = self._contas.get(numero)
+        if conta is not None:
+            return conta.saldo
+        posicao = self._posicao(numero)
+        if posicao is None:
+            raise KeyError(numero)
+        return Dinheiro.de_centavos(self._colunas["centavos"][posicao] + self._ajustes.get(numero, 0))
+
+    def titular(self, numero: int) -> str:
+        """Retorna o nome do titular de uma conta sem criar objetos."""
+        posicao = self._posicao(numero)
+        if posicao is None:
+            raise KeyError(numero)
+        return self._texto("nomes", self._colunas["clientes"][posicao])
+
+    def conta(self, numero: int):
+        """
+        Retorna o objeto da conta, criando-o na primeira vez junto com o
+        cliente e as demais contas desse cliente.
+
+        Args:
+            numero (int): O número da conta.
+
+        Returns:
+            Conta | None: A conta, ou None se o número não estiver no instantâneo.
+        """
+        conta = self._contas.get(numero)
+        if conta is None:
+            posicao = self._posicao(numero)
+            if posicao is None:
+                return None
+            self._materializar_cliente(self._colunas["clientes"][posicao])
+            conta = self._contas[numero]
+        return conta
+
+    def _materializar_cliente(self, indice: int):
+        cliente = {
+            "nome": self._texto("nomes", indice),
+            "data_nascimento": self._texto("nascimentos", indice),
+            "cpf": self._texto("cpfs", indice),
+            "endereco": self._texto("enderecos", indice),
+        }
+        inicio_contas = self._colunas["inicio_contas_cliente"]
+        contas = [
+            {
+                "numero": self._colunas["numeros"][posicao],
+                "centavos": self._colunas["centavos"][posicao],
+                "corrente": bool(self._colunas["tipos"][posicao]),
+                "limite": self._colunas["limites"][posicao],
+                "limite_saques": self._colunas["limites_saques"][posicao],
+                "agencia": self._texto("agencias", posicao),
+                "dia_saques": self._colunas["dias_saques"][posicao] or None,
+                "saques_no_dia": self._colunas["saques_no_dia"][posicao],
+                "centavos_sacados_no_dia": self._colunas["centavos_sacados_no_dia"][posicao],
+            }
+            for posicao in self._colunas["contas_cliente"][inicio_contas[indice]:inicio_contas[indice + 1]]
+        ]
+        for conta in self._modelo.materializar(cliente, contas):
+            self._ajustes.pop(conta.numero, None)
+            for tipo, centavos, instante in self._cauda.pop(conta.numero, ()):
+                self._modelo.aplicar(conta, tipo, centavos, instante)
+            self._contas[conta.numero] = conta
+
+    def aplicar_diario(self, caminho: str) -> int:
+        """
+        Aplica os registros do diário gravados depois do instantâneo.
+        Registros de contas que não estão no instantâneo são ignorados.
+        Depois, posicao_diario fica onde a releitura parou: um final
+        corrompido não é pulado, e uma nova chamada recomeça dali.
+
+        Args:
+            caminho (str): O arquivo do diário.
+
+        Returns:
+            int: Quantos registros foram aplicados.
+        """
+        aplicados = 0
+        sinais = self._modelo.sinais
+        for self.posicao_diario, registro in diario.reproduzir_com_posicoes(caminho, self.posicao_diario):
+            sinal = sinais.get(registro.tipo)
+            if sinal is None:
+                continue
+            numero = int(registro.conta)
+            if self._posicao(numero) is None:
+                continue
+            conta = self._contas.get(numero)
+            if conta is not None:
+                self._modelo.aplicar(conta, registro.tipo, registro.centavos, registro.instante)
+            else:
+                self._ajustes[numero] = self._ajustes.get(numero, 0) + sinal * registro.centavos
+                self._cauda.setdefault(numero, []).append((registro.tipo, registro.centavos, registro.instante))
+            aplicados += 1
+        return aplicados
+
+    def fechar(self):
+        """Libera as visões e desfaz o mapeamento do arquivo."""
+        for coluna in getattr(self, "_colunas", {}).values():
+            coluna.release()
+        self._visao.release()
+        self._mapa.close()
@@ -0,0 +1,220 @@
+"""
+Instrumentação das operações bancárias: contadores, histogramas de latência
+e contagem de eventos (ex.: motivos de recusa), ligáveis em tempo de execução.
+
+Desligada, não custa nada: os métodos medidos só são trocados por versões
+instrumentadas em ativar() e voltam a ser os originais em desativar().
+Um método só pode estar sob uma instrumentação por vez: os originais ficam
+num registro do módulo, e ativar() recusa pontos que outra já mediu.
+"""
+import json
+import threading
+import time
+from array import array
+
+# Histograma no estilo HDR: 8 subdivisões por potência de 2 (erro relativo <= 12,5%)
+_BITS_SUBDIVISAO = 3
+_SUBDIVISOES = 1 << _BITS_SUBDIVISAO
+_BALDES = 64 * _SUBDIVISOES
+
+# (classe, nome do método) -> (instrumentação ativa, método original)
+_ORIGINAIS = {}
+_TRAVA_ORIGINAIS = threading.Lock()
+
+
+class HistogramaLatencia:
+    """
+    Histograma de latências em nanossegundos com baldes log-lineares:
+    cada potência de 2 é dividida em 8 baldes iguais, então a precisão
+    relativa é a mesma de 10 ns a 10 s, com um vetor fixo de contadores.
+    """
+    __slots__ = ("_contagens", "contagem", "soma", "maximo")
+
+    def __init__(self):
+        self._contagens = array("q", bytes(8 * _BALDES))
+        self.contagem = 0
+        self.soma = 0
+        self.maximo = 0
+
+    @staticmethod
+    def _balde(valor: int) -> int:
+        if valor < 2 * _SUBDIVISOES:
+            return valor
+        deslocamento = valor.bit_length() - _BITS_SUBDIVISAO - 1
+        return deslocamento * _SUBDIVISOES + (valor >> deslocamento)
+
+    @staticmethod
+    def _limite_inferior(balde: int) -> int:
+        if balde < 2 * _SUBDIVISOES:
+            return balde
+        deslocamento = balde // _SUBDIVISOES - 1
+        return (balde % _SUBDIVISOES + _SUBDIVISOES) << deslocamento
+
+    def registrar(self, nanossegundos: int):
+        """Conta uma medição."""
+        self._contagens[self._balde(nanossegundos)] += 1
+        self.contagem += 1
+        self.soma += nanossegundos
+        if nanossegundos > self.maximo:
+            self.maximo = nanossegundos
+
+    def percentil(self, percentil: float) -> int:
+        """Retorna o limite inferior do balde onde cai o percentil (0 a 100)."""
+        if not self.contagem:
+            return 0
+        alvo = max(1, -(-self.contagem * percentil // 100))
+        acumulado = 0
+        for balde, contagem in enumerate(self._contagens):
+            acumulado += contagem
+            if acumulado >= alvo:
+                return self._limite_inferior(balde)
+        return self.maximo
+
+    def baldes(self) -> list:
+        """Retorna os baldes não vazios como (limite inferior em ns, contagem)."""
+        return [(self._limite_inferior(balde), contagem) for balde, contagem in enumerate(self._contagens) if contagem]
+
+
+class Instrumentacao:
+    """
+    Mede os métodos informados enquanto estiver ativa.
+    Cada ponto é (classe, nome do método) ou (classe, nome do método, classificar),
+    onde classificar(*args) devolve a chave de um evento a contar, ou None.
+    """
+    def __init__(self, pontos, amostragem: int = 0, perfilador=None):
+        """
+        Prepara a instrumentação, ainda desligada.
+
+        Args:
+            pontos (Iterable[tuple]): Os métodos a medir (ver acima).
+            amostragem (int): Se maior que zero, uma a cada amostragem chamadas de
+                cada ponto roda sob o perfilador.
+            perfilador: Um perfilador com enable()/disable(), ex.: cProfile.Profile().
+        """
+        self._pontos = [tuple(ponto) + (None,) * (3 - len(ponto)) for ponto in pontos]
+        self._ativa = False
+        self._amostragem = amostragem
+        self.perfilador = perfilador
+        self._perfilando = False
+        self.latencias = {}
+        self.eventos = {}
+
+    def __enter__(self):
+        self.ativar()
+        return self
+
+    def __exit__(self, *excecao):
+        self.desativar()
+
+    @property
+    def ativa(self) -> bool:
+        """Indica se os métodos estão trocados pelas versões instrumentadas."""
+        return self._ativa
+
+    def ativar(self):
+        """
+        Troca cada método medido pela versão instrumentada.
+
+        Raises:
+            RuntimeError: Se algum dos métodos já estiver sob outra instrumentação.
+        """
+        with _TRAVA_ORIGINAIS:
+            if self._ativa:
+                return
+            for classe, nome, _ in self._pontos:
+                if (classe, nome) in _ORIGINAIS:
+                    raise RuntimeError(f"{classe.__name__}.{nome} já está instrumentado por outra instrumentação")
+            for classe, nome, classificar in self._pontos:
+                original = classe.__dict__[nome]
+                rotulo = f"{classe.__name__}.{nome}"
+                self.latencias.setdefault(rotulo, HistogramaLatencia())
+                _ORIGINAIS[(classe, nome)] = (self, original)
+                setattr(classe, nome, self._instrumentar(original, rotulo, classificar))
+            self._ativa = True
+
+    def desativar(self):
+        """Devolve os métodos originais; os números coletados continuam disponíveis."""
+        with _TRAVA_ORIGINAIS:
+            if not self._ativa:
+                return
+            for classe, nome, _ in self._pontos:
+                _, original = _ORIGINAIS.pop((classe, nome))
+                setattr(classe, nome, original)
+            self._ativa = False
+
+    def zerar(self):
+        """Descarta os números coletados até agora."""
+        self.latencias = {rotulo: HistogramaLatencia() for rotulo in self.latencias}
+        self.eventos = {}
+
+    def _instrumentar(self, original, rotulo: str, classificar):
+        instrumentacao = self
+        relogio = time.perf_counter_ns
+
+        def instrumentado(*args, **kwargs):
+            histograma = instrumentacao.latencias[rotulo]
+            if classificar is not None:
+                chave = classificar(*args, **kwargs)
+                if chave is not None:
+                    instrumentacao.eventos[chave] = instrumentacao.eventos.get(chave, 0) + 1
+            if (
+                instrumentacao._amostragem
+                and histograma.contagem % instrumentacao._amostragem == 0
+                and instrumentacao.perfilador is not None
+                and not instrumentacao._perfilando
+            ):
+                return instrumentacao._amostrar(original, histograma, args, kwargs)
+            inicio = relogio()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                histograma.registrar(relogio() - inicio)
+
+        instrumentado.__name__ = original.__name__
+        instrumentado.__qualname__ = original.__qualname__
+        instrumentado.__doc__ = original.__doc__
+        instrumentado.__wrapped__ = original
+        return instrumentado
+
+    def _amostrar(self, original, histograma: HistogramaLatencia, args, kwargs):
+        """Roda uma chamada sob o perfilador (a latência medida inclui o custo dele)."""
+        self._perfilando = True
+        self.perfilador.enable()
+        inicio = time.perf_counter_ns()
+        try:
+            return original(*args, **kwargs)
+        finally:
+            histograma.registrar(time.perf_counter_ns() - inicio)
+            self.perfilador.disable()
+            self._perfilando = False
+
+    def instantaneo(self) -> dict:
+        """
+        Retorna uma cópia dos números coletados.
+
+        Returns:
+            dict: {"operacoes": {rótulo: chamadas, total, média, p50, p90, p99 e máximo em ns},
+                "eventos": {chave: contagem}}.
+        """
+        operacoes = {}
+        for rotulo, histograma in self.latencias.items():
+            if not histograma.contagem:
+                continue
+            operacoes[rotulo] = {
+                "chamadas": histograma.contagem,
+                "total_ns": histograma.soma,
+                "media_ns": histograma.soma // histograma.contagem,
+                "p50_ns": histograma.percentil(50),
+                "p90_ns": histograma.percentil(90),
+                "p99_ns": histograma.percentil(99),
+                "maximo_ns": histograma.maximo,
+            }
+        return {"operacoes": operacoes, "eventos": dict(self.eventos)}
+
+    def exportar_json(self, arquivo):
+        """Escreve o instantâneo, com os baldes dos histogramas, como JSON."""
+        dados = self.instantaneo()
+        for rotulo, resumo in dados["operacoes"].items():
+            resumo["baldes"] = self.latencias[rotulo].baldes()
+        dados["eventos"] = {str(chave): contagem for chave, contagem in dados["eventos"].items()}
+        json.dump(dados, arquivo, ensure_ascii=False, indent=2)
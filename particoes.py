@@ -0,0 +1,244 @@
+"""
+Livro-razão particionado entre processos, para usar vários núcleos.
+
+Cada processo trabalhador guarda uma partição das contas, criada pelo modelo
+de quem abre o livro (ver ModeloParticao), e executa os comandos recebidos
+por um pipe. Os resultados das operações são códigos inteiros em que 0
+(SUCESSO) indica sucesso.
+"""
+import itertools
+import multiprocessing
+import os
+from array import array
+from typing import Protocol
+
+from dinheiro import Dinheiro
+
+SUCESSO = 0
+
+
+class ModeloParticao(Protocol):
+    """
+    O que o livro precisa saber do modelo de contas. O modelo é enviado por
+    pickle a cada trabalhador, então sua classe precisa ser de nível de módulo.
+    """
+    def nova_particao(self):
+        """
+        Cria, dentro do trabalhador, o estado vazio de uma partição, com os métodos:
+            abrir(numeros) -> int
+            lote(numeros, tipos, centavos) -> array de resultados
+            saldos() -> dict de número para centavos
+            preparar, creditar, confirmar, abortar e estornar: as fases das
+                transferências entre partições (ver LivroRazaoParticionado)
+            transferir(id, origem, destino, centavos): transferência entre
+                duas contas da mesma partição, de uma vez
+        """
+
+    def codificar(self, lancamento) -> tuple:
+        """Converte um lançamento em (código do tipo, centavos); ValueError se a partição não o aceitar."""
+
+
+def _executar(conexao, modelo: ModeloParticao):
+    """
+    Laço do processo trabalhador: executa os comandos recebidos pela conexão.
+    Cada resposta é (True, resultado) ou, se o comando lançou uma exceção,
+    (False, exceção), relançada do lado de quem pediu; o trabalhador segue vivo.
+    """
+    particao = modelo.nova_particao()
+    while True:
+        comando, argumentos = conexao.recv()
+        if comando == "encerrar":
+            break
+        try:
+            resposta = (True, getattr(particao, comando)(*argumentos))
+        except Exception as erro:
+            resposta = (False, erro)
+        conexao.send(resposta)
+    conexao.close()
+
+
+class LivroRazaoParticionado:
+    """
+    Distribui as contas entre processos trabalhadores, um por partição. A
+    conta de número n pertence à partição n % particoes. Os lançamentos são
+    separados por partição e enviados em lote a todas ao mesmo tempo; os
+    resultados voltam na ordem original.
+
+    Transferências entre contas usam um protocolo em duas fases coordenado
+    por este processo:
+        1. preparar (origem): valida o débito e move o valor do saldo para
+           uma reserva. Se recusado, a transferência termina aqui.
+        2. creditar (destino): credita o valor e registra a transferência
+           recebida.
+        3. Se o crédito deu certo, confirmar (origem) encerra a reserva e
+           registra a transferência enviada; senão, abortar (origem) devolve
+           o valor reservado ao saldo.
+        4. Se confirmar falhar depois do crédito, estornar (destino) desfaz o
+           crédito.
+    Enquanto a reserva existe o valor não aparece em nenhum saldo, então a
+    soma dos saldos nunca conta o mesmo dinheiro duas vezes. Confirmar ou
+    abortar uma reserva desconhecida, ou já encerrada, não muda nada. Quando
+    as duas contas estão na mesma partição, as fases rodam numa só chamada.
+    O estado vive em memória: a queda de um trabalhador perde as reservas da
+    sua partição.
+    """
+    def __init__(self, modelo: ModeloParticao, particoes: int = None):
+        """
+        Inicia os processos trabalhadores.
+
+        Args:
+            modelo (ModeloParticao): Cria o estado de cada partição e codifica os lançamentos.
+            particoes (int): Quantidade de partições. Por padrão, os.cpu_count().
+        """
+        self._modelo = modelo
+        self._quantidade = particoes or os.cpu_count() or 1
+        self._ids_transferencia = itertools.count()
+        self._conexoes = []
+        self._processos = []
+        for _ in range(self._quantidade):
+            local, remota = multiprocessing.Pipe()
+            processo = multiprocessing.Process(target=_executar, args=(remota, modelo), daemon=True)
+            processo.start()
+            remota.close()
+            self._conexoes.append(local)
+            self._processos.append(processo)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.encerrar()
+
+    def _particao(self, numero: int) -> int:
+        """Retorna a partição dona do número de conta."""
+        return numero % self._quantidade
+
+    def _pedir(self, particao: int, comando: str, *argumentos):
+        """Envia um comando a uma partição e aguarda a resposta; relança o erro do trabalhador."""
+        self._conexoes[particao].send((comando, argumentos))
+        sucesso, resposta = self._conexoes[particao].recv()
+        if not sucesso:
+            raise resposta
+        return resposta
+
+    def _pedir_a_todas(self, pedidos: list) -> list:
+        """
+        Envia um comando a cada partição e só então recolhe as respostas, em paralelo.
+        Todas as respostas são lidas antes de relançar o primeiro erro, para
+        que as conexões continuem em sincronia.
+        """
+        for conexao, pedido in zip(self._conexoes, pedidos):
+            conexao.send(pedido)
+        respostas = [conexao.recv() for conexao in self._conexoes]
+        for sucesso, resposta in respostas:
+            if not sucesso:
+                raise resposta
+        return [resposta for _, resposta in respostas]
+
+    def abrir_contas(self, numeros) -> int:
+        """
+        Abre contas nas partições donas de cada número. Números já abertos
+        lançam ValueError; a partição que os recebeu não abre nenhuma das
+        suas contas do pedido.
+
+        Args:
+            numeros (Iterable[int]): Os números das novas contas.
+
+        Returns:
+            int: Quantas contas foram abertas.
+        """
+        por_particao = [array("q") for _ in range(self._quantidade)]
+        for numero in numeros:
+            por_particao[self._particao(numero)].append(numero)
+        return sum(self._pedir_a_todas([("abrir", (numeros,)) for numeros in por_particao]))
+
+    def processar(self, lancamentos) -> array:
+        """
+        Aplica lançamentos em lote nas partições, em paralelo.
+
+        Args:
+            lancamentos (Iterable[tuple[int, Transacao]]): Pares (número da conta, lançamento).
+                Se o modelo recusar algum, a ValueError sobe e nada é aplicado.
+
+        Returns:
+            array: Um código de resultado (array 'b') por lançamento, na ordem recebida.
+        """
+        colunas = [(array("q"), array("q"), array("B"), array("q")) for _ in range(self._quantidade)]
+        total = 0
+        for numero, lancamento in lancamentos:
+            # Codificado antes de enviar: um lançamento recusado impede o lote inteiro
+            codigo, valor = self._modelo.codificar(lancamento)
+            posicoes, numeros, tipos, centavos = colunas[self._particao(numero)]
+            posicoes.append(total)
+            numeros.append(numero)
+            tipos.append(codigo)
+            centavos.append(valor)
+            total += 1
+
+        respostas = self._pedir_a_todas([("lote", coluna[1:]) for coluna in colunas])
+        resultados = array("b", bytes(total))
+        for (posicoes, *_), resposta in zip(colunas, respostas):
+            for posicao, resultado in zip(posicoes, resposta):
+                resultados[posicao] = resultado
+        return resultados
+
+    def saldos(self) -> dict:
+        """Retorna o saldo de todas as contas, por número."""
+        saldos = {}
+        for resposta in self._pedir_a_todas([("saldos", ())] * self._quantidade):
+            saldos.update((numero, Dinheiro.de_centavos(centavos)) for numero, centavos in resposta.items())
+        return saldos
+
+    def transferir(self, origem: int, destino: int, valor):
+        """
+        Transfere um valor entre duas contas, usando o protocolo em duas fases.
+
+        Args:
+            origem (int): O número da conta debitada.
+            destino (int): O número da conta creditada.
+            valor (Dinheiro | float): O valor transferido.
+
+        Returns:
+            int: SUCESSO ou o código da recusa, como devolvido pela partição.
+        """
+        centavos = Dinheiro(valor).centavos
+        id_transferencia = next(self._ids_transferencia)
+        particao_origem = self._particao(origem)
+        particao_destino = self._particao(destino)
+        if particao_origem == particao_destino:
+            # As duas contas no mesmo trabalhador: sem as idas e voltas das fases
+            return self._pedir(particao_origem, "transferir", id_transferencia, origem, destino, centavos)
+
+        resultado = self._pedir(particao_origem, "preparar", id_transferencia, origem, centavos)
+        if resultado != SUCESSO:
+            return resultado
+
+        try:
+            resultado = self._pedir(particao_destino, "creditar", id_transferencia, destino, centavos)
+        except BaseException:
+            self._pedir(particao_origem, "abortar", id_transferencia)
+            raise
+        if resultado != SUCESSO:
+            self._pedir(particao_origem, "abortar", id_transferencia)
+            return resultado
+
+        # Se a origem não confirmar, o crédito já feito no destino é estornado:
+        # sem isso, o valor existiria nas duas contas
+        try:
+            resultado = self._pedir(particao_origem, "confirmar", id_transferencia)
+        except BaseException:
+            self._pedir(particao_destino, "estornar", id_transferencia, destino, centavos)
+            raise
+        if resultado != SUCESSO:
+            self._pedir(particao_destino, "estornar", id_transferencia, destino, centavos)
+        return resultado
+
+    def encerrar(self):
+        """Encerra os processos trabalhadores."""
+        for conexao in self._conexoes:
+            conexao.send(("encerrar", ()))
+            conexao.close()
+        for processo in self._processos:
+            processo.join()
+        self._conexoes = []
+        self._processos = []
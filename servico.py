@@ -0,0 +1,146 @@
+"""
+Serviço assíncrono (asyncio) sobre as contas do modelo bancário.
+
+Cada conta tem uma fila própria: as operações de uma conta são atendidas em
+ordem, uma por vez, enquanto contas diferentes avançam intercaladas no mesmo
+laço de eventos. As contas e as operações vêm do modelo de quem cria o
+serviço (ver ModeloServico).
+"""
+import asyncio
+import itertools
+from typing import Protocol
+
+
+class ModeloServico(Protocol):
+    """O que o serviço precisa saber do modelo de contas."""
+    conta_inexistente: object
+    """O resultado devolvido para contas que não existem."""
+
+    def nova_conta(self, cliente, numero: int):
+        """Abre a conta de número numero para o cliente e a retorna."""
+
+    def depositar(self, conta, valor):
+        """Deposita valor na conta e retorna o resultado da operação."""
+
+    def sacar(self, conta, valor):
+        """Saca valor da conta e retorna o resultado da operação."""
+
+    def transferir(self, origem, destino, valor):
+        """Transfere valor entre duas contas e retorna o resultado da operação."""
+
+
+class ServicoBancario:
+    """
+    Fachada assíncrona sobre as contas. A fila de cada conta e a tarefa que
+    a atende só existem enquanto há pedidos pendentes, então contas paradas
+    não ocupam nada além do objeto.
+    """
+    def __init__(self, modelo: ModeloServico, tamanho_fila: int = 1_000):
+        """
+        Cria o serviço sem contas.
+
+        Args:
+            modelo (ModeloServico): Abre as contas e executa as operações sobre elas.
+            tamanho_fila (int): Pedidos pendentes por conta antes de quem pede aguardar.
+        """
+        self._modelo = modelo
+        self._tamanho_fila = tamanho_fila
+        self._contas = {}
+        self._numeros = itertools.count(1)
+        self._filas = {}  # número -> fila de pedidos pendentes
+        self._atendentes = {}  # número -> tarefa que esvazia a fila
+
+    async def abrir_conta(self, cliente, numero: int = None) -> int:
+        """
+        Abre uma conta para o cliente.
+
+        Args:
+            cliente (Cliente): O titular.
+            numero (int): O número desejado; por padrão, o próximo livre.
+
+        Returns:
+            int: O número da conta aberta.
+        """
+        if numero is None:
+            numero = next(self._numeros)
+            while numero in self._contas:
+                numero = next(self._numeros)
+        elif numero in self._contas:
+            raise ValueError(f"Já existe uma conta com o número {numero}.")
+        self._contas[numero] = self._modelo.nova_conta(cliente, numero)
+        return numero
+
+    async def depositar(self, numero: int, valor):
+        """Deposita valor na conta e retorna o resultado da operação."""
+        return await self._pedir(numero, lambda conta: self._modelo.depositar(conta, valor))
+
+    async def sacar(self, numero: int, valor):
+        """Saca valor da conta e retorna o resultado da operação."""
+        return await self._pedir(numero, lambda conta: self._modelo.sacar(conta, valor))
+
+    async def transferir(self, origem: int, destino: int, valor):
+        """
+        Transfere valor entre duas contas. O pedido entra na fila da origem;
+        débito e crédito acontecem juntos, sob as travas das duas contas.
+
+        Returns:
+            O resultado, ou o conta_inexistente do modelo se o destino não existir.
+        """
+        conta_destino = self._contas.get(destino)
+        if conta_destino is None:
+            return self._modelo.conta_inexistente
+        return await self._pedir(origem, lambda conta: self._modelo.transferir(conta, conta_destino, valor))
+
+    async def extrato(self, numero: int) -> dict:
+        """
+        Retorna o saldo e as transações da conta, lidos entre duas operações dela.
+
+        Returns:
+            dict: {"saldo": Dinheiro, "transacoes": list[dict]}, ou None se a conta não existir.
+        """
+        def ler(conta):
+            return {"saldo": conta.saldo, "transacoes": list(conta.historico.transacoes)}
+
+        if numero not in self._contas:
+            return None
+        return await self._pedir(numero, ler)
+
+    async def encerrar(self):
+        """Aguarda o atendimento de todos os pedidos pendentes."""
+        while self._atendentes:
+            await asyncio.gather(*self._atendentes.values())
+
+    async def _pedir(self, numero: int, operacao):
+        """Põe a operação na fila da conta e aguarda o resultado."""
+        if numero not in self._contas:
+            return self._modelo.conta_inexistente
+        fila = self._filas.get(numero)
+        if fila is None:
+            fila = self._filas[numero] = asyncio.Queue(self._tamanho_fila)
+            self._atendentes[numero] = asyncio.create_task(self._atender(numero, fila))
+        futuro = asyncio.get_running_loop().create_future()
+        if fila.full():
+            await fila.put((operacao, futuro))  # fila cheia: quem pede espera a vez
+        else:
+            fila.put_nowait((operacao, futuro))
+        return await futuro
+
+    async def _atender(self, numero: int, fila: asyncio.Queue, rodada: int = 64):
+        """
+        Esvazia a fila da conta em ordem e some quando ela fica vazia. A cada
+        rodada de operações, cede a vez às outras contas.
+        """
+        conta = self._contas[numero]
+        try:
+            while not fila.empty():
+                for _ in range(min(rodada, fila.qsize())):
+                    operacao, futuro = fila.get_nowait()
+                    if not futuro.cancelled():
+                        try:
+                            futuro.set_result(operacao(conta))
+                        except Exception as erro:
+                            futuro.set_exception(erro)
+                await asyncio.sleep(0)
+        finally:
+            del self._filas[numero]
+            del self._atendentes[numero]
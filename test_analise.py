@@ -0,0 +1,86 @@
+"""
+Testes das consultas analíticas (analise.py) sobre as contas do modelo
+("Modelando o sistema bancario em poo com python.py").
+
+Uso: python -m pytest test_analise.py
+"""
+import builtins
+import importlib
+import sys
+from datetime import datetime, timezone
+
+import pytest
+
+np = pytest.importorskip("numpy")
+import analise  # noqa: E402
+
+DIA = analise.NS_POR_DIA
+INICIO = int(datetime(2026, 3, 10, tzinfo=timezone.utc).timestamp()) * 1_000_000_000
+
+
+@pytest.fixture
+def livro(poo):
+    deposito, saque = poo.CODIGO_TIPO[poo.TipoTransacao.DEPOSITO], poo.CODIGO_TIPO[poo.TipoTransacao.SAQUE]
+    livro = analise.LivroAnalitico(poo.SINAL_CODIGO, fuso_segundos=0)
+    livro.adicionar(1, [deposito, saque, saque], [10_000, 2_000, 500], [INICIO, INICIO + 1, INICIO + DIA])
+    livro.adicionar([2, 3], [deposito, deposito], [7_000, 300], [INICIO + DIA, INICIO + 2 * DIA])
+    return livro, deposito, saque
+
+
+def test_saldos_e_somas(livro):
+    livro, deposito, saque = livro
+    numeros, saldos = livro.saldos()
+    assert dict(zip(numeros.tolist(), saldos.tolist())) == {1: 7_500, 2: 7_000, 3: 300}
+    _, contagens, somas = livro.somas_por_conta_tipo()
+    assert contagens[0, saque] == 2 and somas[0, saque] == 2_500
+    assert len(livro) == 5
+
+
+def test_saldos_em_um_instante(livro):
+    livro, _, _ = livro
+    numeros, saldos = livro.saldos_em(INICIO + 1)
+    assert dict(zip(numeros.tolist(), saldos.tolist())) == {1: 8_000, 2: 0, 3: 0}
+
+
+def test_totais_diarios_e_janela(livro):
+    livro, deposito, _ = livro
+    dias, contagens, somas = livro.totais_diarios(deposito)
+    assert dias.astype(str).tolist() == ["2026-03-10", "2026-03-11", "2026-03-12"]
+    assert contagens.tolist() == [1, 1, 1]
+    assert somas.tolist() == [10_000, 7_000, 300]
+    _, janela = livro.janela_movel(2, deposito)
+    assert janela.tolist() == [10_000, 17_000, 7_300]
+
+
+def test_cache_atualizado_com_lancamentos_novos(livro):
+    livro, deposito, saque = livro
+    assert livro.maiores(deposito, 2) == [(1, 10_000), (2, 7_000)]
+    livro.adicionar(3, [deposito], [50_000], [INICIO + 3 * DIA])
+    assert livro.maiores(deposito, 2) == [(3, 50_300), (1, 10_000)]
+    assert livro.percentis_valores(saque, (0, 100)).tolist() == [500, 2_000]
+
+
+def test_atualizar_copia_so_o_que_e_novo(poo, cliente):
+    conta = poo.ContaCorrente(1, cliente)
+    conta.saida = poo.SaidaNula()
+    conta.depositar(100)
+    livro = analise.LivroAnalitico(poo.SINAL_CODIGO)
+    assert livro.atualizar([conta]) == 1
+    conta.sacar(30)
+    assert livro.atualizar([conta]) == 1
+    assert livro.atualizar([conta]) == 0
+    assert livro.saldos()[1].tolist() == [7_000]
+
+
+def test_sem_numpy_a_mensagem_diz_o_que_instalar(monkeypatch):
+    importar = builtins.__import__
+
+    def sem_numpy(nome, *args, **kwargs):
+        if nome == "numpy" or nome.startswith("numpy."):
+            raise ImportError("No module named 'numpy'")
+        return importar(nome, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "__import__", sem_numpy)
+    monkeypatch.delitem(sys.modules, "analise")
+    with pytest.raises(ImportError, match="pip install numpy"):
+        importlib.import_module("analise")
@@ -0,0 +1,66 @@
+"""
+Testes do acesso assíncrono ao banco da API de atletas: as sessões são
+AsyncSession e as requisições simultâneas não travam o loop de eventos.
+
+Uso: python -m pytest test_api_async.py
+"""
+import asyncio
+import inspect
+import sys
+import time
+
+import httpx
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def test_dependencias_entregam_sessoes_assincronas(api):
+    database = sys.modules["database"]
+
+    async def sessoes():
+        return [type(sessao) async for sessao in database.get_db()] + [
+            type(sessao) async for sessao in database.get_db_leitura()
+        ]
+
+    assert inspect.isasyncgenfunction(database.get_db)
+    assert asyncio.run(sessoes()) == [AsyncSession, AsyncSession]
+
+
+def test_cpf_repetido_responde_303(api):
+    cliente, _ = api
+    assert cliente.post("/atletas/", json={"nome": "Gil", "cpf": "70000000001"}).status_code == 201
+    resposta = cliente.post("/atletas/", json={"nome": "Gil", "cpf": "70000000001"})
+    assert resposta.status_code == 303
+    assert "70000000001" in resposta.json()["mensagem"]
+
+
+def test_requisicoes_simultaneas_sem_travar_o_loop(api):
+    principal = sys.modules["main"]
+    quantidade = 100
+
+    async def cenario():
+        atrasos = []
+        parar = asyncio.Event()
+
+        async def relogio():
+            # Mede quanto o loop demora a devolver a vez: com consultas síncronas, a requisição inteira
+            while not parar.is_set():
+                inicio = time.perf_counter()
+                await asyncio.sleep(0)
+                atrasos.append(time.perf_counter() - inicio)
+
+        transporte = httpx.ASGITransport(app=principal.app)
+        async with httpx.AsyncClient(transport=transporte, base_url="http://teste") as cliente:
+            tarefa = asyncio.create_task(relogio())
+            respostas = await asyncio.gather(*(
+                cliente.post("/atletas/", json={"nome": f"Atleta {numero}", "cpf": f"71{numero:09d}"})
+                for numero in range(quantidade)
+            ), *(cliente.get("/atletas/", params={"limit": 5}) for _ in range(quantidade)))
+            parar.set()
+            await tarefa
+            total = (await cliente.get("/atletas/", params={"cpf": "71000000042"})).json()["total"]
+        return respostas, atrasos, total
+
+    respostas, atrasos, total = asyncio.run(cenario())
+    assert [resposta.status_code for resposta in respostas] == [201] * quantidade + [200] * quantidade
+    assert total == 1
+    assert len(atrasos) > quantidade  # o relógio rodou entre as requisições
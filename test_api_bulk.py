@@ -0,0 +1,66 @@
+"""
+Testes das cargas em lote da API de atletas (/atletas/bulk e /atletas/bulk/ndjson).
+
+Uso: python -m pytest test_api_bulk.py
+"""
+import json
+
+
+def _ndjson(cliente, corpo: bytes) -> list:
+    resposta = cliente.post("/atletas/bulk/ndjson", content=corpo, headers={"Content-Type": "application/x-ndjson"})
+    assert resposta.status_code == 200
+    return [json.loads(linha) for linha in resposta.text.splitlines()]
+
+
+def test_linha_longa_demais_volta_invalida(api):
+    cliente, atleta = api
+    longa = json.dumps({"nome": "x" * atleta.TAMANHO_MAXIMO_LINHA, "cpf": "90000000001"}).encode()
+    corpo = b"\n".join([
+        json.dumps({"nome": "Ana", "cpf": "90000000002"}).encode(),
+        longa,
+        json.dumps({"nome": "Bia", "cpf": "90000000003"}).encode(),
+        longa,
+    ])
+
+    *linhas, resumo = _ndjson(cliente, corpo)
+    assert [linha["status"] for linha in linhas] == ["criado", "invalido", "criado", "invalido"]
+    assert linhas[1]["erro"] == f"linha maior que {atleta.TAMANHO_MAXIMO_LINHA} bytes"
+    assert resumo == {"criados": 2, "duplicados": 0, "invalidos": 2}
+
+
+def test_carga_ndjson_informa_cada_linha(api):
+    cliente, _ = api
+    corpo = "\n".join([
+        json.dumps({"nome": "Caio", "cpf": "91000000001"}),
+        "",
+        json.dumps({"nome": "Caio de novo", "cpf": "91000000001"}),
+        "{não é json",
+        json.dumps({"nome": "Duda"}),
+        json.dumps({"nome": "Eva", "cpf": "91000000002"}),
+    ]).encode()
+
+    *linhas, resumo = _ndjson(cliente, corpo)
+    assert [(linha["linha"], linha["status"]) for linha in linhas] == [
+        (1, "criado"), (3, "duplicado"), (4, "invalido"), (5, "invalido"), (6, "criado"),
+    ]
+    assert resumo == {"criados": 2, "duplicados": 1, "invalidos": 2}
+
+
+def test_carga_json(api):
+    cliente, _ = api
+    resposta = cliente.post("/atletas/bulk", json=[
+        {"nome": "Fábio", "cpf": "92000000001"},
+        {"nome": "Fábio", "cpf": "92000000001"},
+        {"cpf": "92000000002"},
+    ])
+    assert resposta.status_code == 200
+    corpo = resposta.json()
+    assert (corpo["criados"], corpo["duplicados"], corpo["invalidos"]) == (1, 1, 1)
+    assert corpo["linhas"][0]["id"] > 0
+    assert corpo["linhas"][2]["erro"].startswith("nome")
+
+
+def test_carga_json_grande_demais(api):
+    cliente, atleta = api
+    corpo = [{"nome": "X", "cpf": str(i)} for i in range(atleta.LIMITE_BULK_JSON + 1)]
+    assert cliente.post("/atletas/bulk", json=corpo).status_code == 422
@@ -0,0 +1,57 @@
+"""
+Testes da busca por nome de GET /atletas (índice de texto FTS5).
+
+Uso: python -m pytest test_api_busca.py
+"""
+import pytest
+
+ATLETAS = [
+    ("João Silva", "80000000001"),
+    ("Maria Silveira", "80000000002"),
+    ("JOANA SOUZA", "80000000003"),
+    ("Ana Paula Silva Santos", "80000000004"),
+    ("Pedro Álvares", "80000000005"),
+]
+
+
+@pytest.fixture(scope="module")
+def cliente(api):
+    cliente, _ = api
+    for nome, cpf in ATLETAS:
+        assert cliente.post("/atletas/", json={"nome": nome, "cpf": cpf}).status_code == 201
+    return cliente
+
+
+def _nomes(cliente, nome: str, **parametros) -> list:
+    resposta = cliente.get("/atletas/", params={"nome": nome, **parametros})
+    assert resposta.status_code == 200, resposta.text
+    pagina = resposta.json()
+    assert pagina["total"] == len(pagina["items"])
+    return [atleta["nome"] for atleta in pagina["items"]]
+
+
+def test_sem_diferenciar_maiusculas_e_acentos(cliente):
+    assert _nomes(cliente, "joao") == ["João Silva"]
+    assert _nomes(cliente, "ALVARES") == ["Pedro Álvares"]
+    assert _nomes(cliente, "souza") == ["JOANA SOUZA"]
+
+
+def test_comeco_de_palavra(cliente):
+    assert sorted(_nomes(cliente, "silv")) == ["Ana Paula Silva Santos", "João Silva", "Maria Silveira"]
+    assert sorted(_nomes(cliente, "jo")) == ["JOANA SOUZA", "João Silva"]
+    assert _nomes(cliente, "ilva") == []  # só começos de palavra
+
+
+def test_todas_as_palavras_e_relevancia(cliente):
+    assert _nomes(cliente, "silva ana") == ["Ana Paula Silva Santos"]
+    # O nome mais curto, onde "silva" pesa mais, vem primeiro (BM25)
+    assert _nomes(cliente, "silva") == ["João Silva", "Ana Paula Silva Santos"]
+    assert _nomes(cliente, "silva", cpf="80000000004") == ["Ana Paula Silva Santos"]
+
+
+def test_texto_sem_palavras_e_sintaxe_do_fts(api, cliente):
+    _, atleta = api
+    assert _nomes(cliente, "!!!") == []
+    assert _nomes(cliente, 'silva" OR "maria') == []
+    assert _nomes(cliente, "NEAR(silva") == []
+    assert atleta.termos_de_busca('João "da" Silva*') == '"João"* "da"* "Silva"*'
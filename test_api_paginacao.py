@@ -0,0 +1,67 @@
+"""
+Testes da paginação de GET /atletas: LIMIT/OFFSET, cursor (keyset) e contagens.
+
+Uso: python -m pytest test_api_paginacao.py
+"""
+import pytest
+
+QUANTIDADE = 25
+
+
+@pytest.fixture(scope="module")
+def cliente(api):
+    cliente, _ = api
+    resposta = cliente.post("/atletas/bulk", json=[
+        {"nome": f"Atleta {numero}", "cpf": f"{numero:011d}"} for numero in range(QUANTIDADE)
+    ])
+    assert resposta.json()["criados"] == QUANTIDADE
+    return cliente
+
+
+def _pagina(cliente, **parametros) -> dict:
+    resposta = cliente.get("/atletas/", params=parametros)
+    assert resposta.status_code == 200, resposta.text
+    return resposta.json()
+
+
+def test_primeira_pagina_por_offset(cliente):
+    pagina = _pagina(cliente, limit=10, offset=5)
+    assert [atleta["cpf"] for atleta in pagina["items"]] == [f"{numero:011d}" for numero in range(5, 15)]
+    assert (pagina["total"], pagina["total_estimado"], pagina["offset"]) == (QUANTIDADE, False, 5)
+    assert pagina["proximo_cursor"]
+
+
+def test_cursor_percorre_todos_sem_repetir(cliente):
+    vistos, parametros = [], {"limit": 10, "contagem": "nenhuma"}
+    while True:
+        pagina = _pagina(cliente, **parametros)
+        assert pagina["total"] is None
+        assert pagina["offset"] is None or "cursor" not in parametros
+        vistos += [atleta["cpf"] for atleta in pagina["items"]]
+        if not pagina["proximo_cursor"]:
+            break
+        parametros["cursor"] = pagina["proximo_cursor"]
+    assert vistos == [f"{numero:011d}" for numero in range(QUANTIDADE)]
+
+
+def test_contagens(api, cliente):
+    _, atleta = api
+    assert _pagina(cliente, limit=1)["total"] == QUANTIDADE
+    # A contagem exata fica guardada por VALIDADE_CONTAGEM segundos...
+    atleta._contagens[(None, None)] = (7, atleta._contagens[(None, None)][1])
+    assert _pagina(cliente, limit=1)["total"] == 7
+    # ...e um cadastro a descarta
+    cliente.post("/atletas/", json={"nome": "Atleta extra", "cpf": "99999999999"})
+    assert _pagina(cliente, limit=1)["total"] == QUANTIDADE + 1
+    # A estimada lê MAX(id), sem percorrer a tabela
+    estimada = _pagina(cliente, limit=1, contagem="estimada")
+    assert (estimada["total"], estimada["total_estimado"]) == (QUANTIDADE + 1, True)
+    assert _pagina(cliente, cpf="00000000003")["total"] == 1
+
+
+def test_parametros_invalidos(api, cliente):
+    _, atleta = api
+    assert cliente.get("/atletas/", params={"cursor": "não é cursor"}).status_code == 400
+    assert cliente.get("/atletas/", params={"cursor": _pagina(cliente, limit=1)["proximo_cursor"], "nome": "Atleta"}).status_code == 400
+    assert cliente.get("/atletas/", params={"offset": atleta.OFFSET_MAXIMO + 1}).status_code == 422
+    assert cliente.get("/atletas/", params={"limit": 0}).status_code == 422
@@ -0,0 +1,59 @@
+"""
+Testes do perfil de produção do SQLite da API de atletas (config.py e
+database.py): pragmas, pools de escrita e de leitura e o benchmark_sqlite.py.
+
+Uso: python -m pytest test_api_sqlite.py
+"""
+import asyncio
+import os
+import subprocess
+import sys
+
+import pytest
+from sqlalchemy import exc, text
+
+_PASTA_API = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Desafio dio, desenvolvendo primeira API")
+
+
+@pytest.fixture
+def database(api):
+    return sys.modules["database"]
+
+
+def test_pragmas_do_perfil(database):
+    assert database.pragmas()[0] == "PRAGMA journal_mode = wal"
+    leitura = database.pragmas(somente_leitura=True)
+    assert leitura[-1] == "PRAGMA query_only = ON"
+    assert not any("journal_mode" in comando for comando in leitura)
+
+
+def test_pools_dimensionados(database):
+    assert database.async_engine.pool.size() == database.settings.POOL_ESCRITA
+    assert database.async_engine.pool._max_overflow == 0
+    assert database.async_engine_leitura.pool.size() == database.settings.POOL_LEITURA
+
+
+def test_sessoes_aplicam_os_pragmas(database):
+    async def cenario():
+        async with database.AsyncSessionLocal() as db:
+            modo = (await db.execute(text("PRAGMA journal_mode"))).scalar()
+            sincronismo = (await db.execute(text("PRAGMA synchronous"))).scalar()
+        async with database.AsyncSessionLeitura() as db:
+            assert (await db.execute(text("PRAGMA query_only"))).scalar() == 1
+            with pytest.raises(exc.OperationalError):
+                await db.execute(text("DELETE FROM atletas"))
+        return modo, sincronismo
+
+    assert asyncio.run(cenario()) == ("wal", 1)  # synchronous = normal
+
+
+def test_benchmark_roda_com_os_motores_da_api(tmp_path):
+    ambiente = dict(os.environ, DATABASE_ARQUIVO=str(tmp_path / "sem_uso.db"))
+    resultado = subprocess.run(
+        [sys.executable, "benchmark_sqlite.py", "500", "2", "0.3"],
+        cwd=_PASTA_API, env=ambiente, capture_output=True, text=True, timeout=120,
+    )
+    assert resultado.returncode == 0, resultado.stderr
+    linhas = resultado.stdout.splitlines()
+    assert [linha.split("\t")[0] for linha in linhas[2:]] == ["padrão", "produção"]
+    assert all(linha.split("\t")[-1] == "0" for linha in linhas[2:])
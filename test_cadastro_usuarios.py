@@ -0,0 +1,62 @@
+"""
+Testes do cadastro de usuários e contas indexado por CPF
+("Aprimoramento do sistema bancario.py").
+
+Uso: python -m pytest test_cadastro_usuarios.py
+"""
+import pytest
+
+
+@pytest.fixture
+def usuarios(aprimoramento):
+    usuarios = {}
+    aprimoramento.importar_usuarios([
+        {"nome": "Ana", "data_nascimento": "01-01-1990", "cpf": "111.222.333-44", "endereco": "-"},
+        {"nome": "Bia", "data_nascimento": "02-02-1992", "cpf": "55566677788", "endereco": "-"},
+    ], usuarios)
+    return usuarios
+
+
+def test_cpf_normalizado(aprimoramento, usuarios):
+    assert aprimoramento.normalizar_cpf("111.222.333-44") == "11122233344"
+    assert aprimoramento.filtrar_usuario("11122233344", usuarios)["nome"] == "Ana"
+    assert aprimoramento.filtrar_usuario("555.666.777-88", usuarios)["nome"] == "Bia"
+    assert aprimoramento.filtrar_usuario("000", usuarios) is None
+
+
+def test_importacao_ignora_cpf_repetido(aprimoramento, usuarios):
+    importados = aprimoramento.importar_usuarios([
+        {"nome": "Outra Ana", "data_nascimento": "-", "cpf": "11122233344", "endereco": "-"},
+        {"nome": "Caio", "data_nascimento": "-", "cpf": "999.888.777-66", "endereco": "-"},
+    ], usuarios)
+    assert importados == 1
+    assert usuarios["11122233344"]["nome"] == "Ana"
+    assert usuarios["99988877766"]["cpf"] == "99988877766"
+
+
+def test_criar_usuario_recusa_cpf_existente(aprimoramento, usuarios, entradas, capsys):
+    entradas("111.222.33344")
+    assert aprimoramento.criar_usuario(usuarios) is None
+    assert "Já existe usuário" in capsys.readouterr().out
+
+    entradas("123.456.789-00", "Duda", "03-03-1993", "Rua A, 1")
+    assert aprimoramento.criar_usuario(usuarios)["cpf"] == "12345678900"
+    assert len(usuarios) == 3
+
+
+def test_contas_pelo_indice_do_titular(aprimoramento, usuarios, entradas, capsys):
+    contas = [{"agencia": "0001", "numero_conta": 1, "usuario": usuarios["11122233344"]}]
+    contas_por_usuario = aprimoramento.indexar_contas(contas)
+
+    entradas("555.666.777-88")
+    assert aprimoramento.criar_conta("0001", 2, usuarios, contas, contas_por_usuario)
+    entradas("000.000.000-00")
+    assert not aprimoramento.criar_conta("0001", 3, usuarios, contas, contas_por_usuario)
+    assert [conta["numero_conta"] for conta in contas_por_usuario["55566677788"]] == [2]
+
+    capsys.readouterr()
+    aprimoramento.listar_contas(contas, "55566677788", contas_por_usuario)
+    saida = capsys.readouterr().out
+    assert "Bia" in saida and "Ana" not in saida
+    aprimoramento.listar_contas(contas, "99999999999", contas_por_usuario)
+    assert "Nenhuma conta cadastrada" in capsys.readouterr().out
@@ -0,0 +1,76 @@
+"""
+Testes das contas sob threads: a trava de cada conta serializa as alterações
+e o saldo é lido sem travar ("Modelando o sistema bancario em poo com python.py").
+
+Uso: python -m pytest test_concorrencia.py
+"""
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def trocas_frequentes():
+    # Força trocas de thread no meio das operações, onde uma corrida apareceria
+    intervalo = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(intervalo)
+
+
+def test_saques_simultaneos_nao_estouram_o_saldo(poo, cliente):
+    conta = poo.ContaCorrente(1, cliente, limite_saques=10**9)
+    conta.saida = poo.SaidaNula()
+    conta.depositar(100)
+
+    def sacar(_):
+        return sum(conta.sacar(1) for _ in range(50))
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        aceitos = sum(executor.map(sacar, range(8)))
+    assert aceitos == 100
+    assert conta.saldo == poo.Dinheiro(0)
+    assert conta.historico.contagem(poo.TipoTransacao.SAQUE) == 100
+
+
+def test_limite_diario_vale_entre_threads(poo, cliente):
+    conta = poo.ContaCorrente(1, cliente, limite_saques=5)
+    conta.saida = poo.SaidaNula()
+    conta.depositar(1_000)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        aceitos = sum(executor.map(lambda _: conta.sacar(1), range(64)))
+    assert aceitos == 5
+    assert conta.saldo == poo.Dinheiro(995)
+
+
+def test_saldo_bate_com_o_historico(poo, cliente):
+    contas = [poo.ContaCorrente(numero, cliente, limite_saques=10**9) for numero in range(4)]
+    for conta in contas:
+        conta.saida = poo.SaidaNula()
+    transacoes = (poo.Deposito(10), poo.Saque(7), poo.Saque(15))
+
+    def trabalhar(semente):
+        for i in range(500):
+            transacoes[(semente + i) % 3].registrar(contas[(semente * i) % 4])
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(trabalhar, range(8)))
+    for conta in contas:
+        historico = conta.historico
+        assert conta.saldo >= 0
+        assert conta.saldo == historico.soma(poo.TipoTransacao.DEPOSITO) - historico.soma(poo.TipoTransacao.SAQUE)
+
+
+def test_saldo_lido_sem_esperar_a_trava(poo, cliente):
+    conta = poo.ContaCorrente(1, cliente)
+    conta.saida = poo.SaidaNula()
+    conta.depositar(10)
+    lido = []
+    with conta.trava:
+        leitor = threading.Thread(target=lambda: lido.append(conta.saldo))
+        leitor.start()
+        leitor.join(timeout=5)
+    assert lido == [poo.Dinheiro(10)]
@@ -0,0 +1,71 @@
+"""
+Testes do estado por conta (EstadoConta) no sistema procedural, pelo menu
+de main() e pela releitura do diário ("Aprimoramento do sistema bancario.py").
+
+Uso: python -m pytest test_contas_aprimoramento.py
+"""
+import pytest
+
+
+@pytest.fixture
+def diario_temporario(aprimoramento, monkeypatch, tmp_path):
+    caminho = str(tmp_path / "sistema_bancario.diario")
+    monkeypatch.setattr(aprimoramento, "CAMINHO_DIARIO", caminho)
+    return caminho
+
+
+def test_cada_conta_tem_o_seu_saldo(aprimoramento, diario_temporario, entradas, capsys):
+    entradas(
+        "d", "1", "100",
+        "d", "2", "40",
+        "s", "1", "30",
+        "s", "9",  # conta inexistente
+        "e", "1",
+        "e", "2",
+        "q",
+    )
+    aprimoramento.main()
+    saida = capsys.readouterr().out
+    assert "Conta não encontrada!" in saida
+    extrato_1, extrato_2 = saida.split("EXTRATO")[1:]
+    assert "Saldo:\t\tR$ 70.00" in extrato_1 and "Saque:\t\tR$ 30.00" in extrato_1
+    assert "Saldo:\t\tR$ 40.00" in extrato_2 and "Saque" not in extrato_2.split("Saldo")[0]
+
+
+def test_limite_de_saques_por_conta(aprimoramento, diario_temporario, entradas, capsys):
+    entradas(
+        "d", "1", "100", "d", "2", "100",
+        *("s", "1", "1") * 4,
+        "s", "2", "1",
+        "q",
+    )
+    aprimoramento.main()
+    saida = capsys.readouterr().out
+    assert saida.count("Número máximo de saques excedido") == 1
+    assert saida.count("Saque realizado com sucesso!") == 4
+
+
+def test_estado_volta_do_diario(aprimoramento, diario_temporario, entradas, capsys):
+    entradas(
+        "nu", "123.456.789-00", "Duda", "03-03-1993", "Rua A, 1",
+        "nc", "12345678900",
+        "d", "4", "80",
+        "s", "4", "5",
+        "q",
+    )
+    aprimoramento.main()
+
+    usuarios, contas, estados = {}, [], {}
+    contas_por_usuario = {}
+    aprimoramento.restaurar_do_diario(diario_temporario, "0001", usuarios, contas, contas_por_usuario, estados)
+    assert usuarios["12345678900"]["nome"] == "Duda"
+    assert [conta["numero_conta"] for conta in contas_por_usuario["12345678900"]] == [4]
+    estado = estados[4]
+    assert estado.saldo == aprimoramento.Dinheiro(75)
+    assert estado.numero_saques == 1
+    assert [rotulo for rotulo, _ in estado.extrato] == ["Depósito:\t", "Saque:\t\t"]
+
+    capsys.readouterr()
+    entradas("e", "4", "q")
+    aprimoramento.main()
+    assert "Saldo:\t\tR$ 75.00" in capsys.readouterr().out
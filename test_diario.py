@@ -0,0 +1,199 @@
+"""
+Testes do diário em disco (diario.py) e da ordem diário-antes-do-saldo nas
+contas do modelo ("Modelando o sistema bancario em poo com python.py").
+
+Uso: python -m pytest test_diario.py
+"""
+import os
+
+import pytest
+
+import diario
+
+
+@pytest.fixture
+def caminho(tmp_path):
+    return str(tmp_path / "contas.diario")
+
+
+class _DiarioComFalha:
+    """Diário em memória que grava falhas_depois registros e então passa a lançar OSError."""
+    def __init__(self, falhas_depois: int = 0):
+        self.registros = []
+        self._falhas_depois = falhas_depois
+
+    def registrar(self, tipo, conta, centavos, texto=""):
+        if len(self.registros) >= self._falhas_depois:
+            raise OSError("disco cheio")
+        self.registros.append((tipo, conta, centavos))
+
+    def registrar_varios(self, registros):
+        registros = list(registros)
+        if len(self.registros) + len(registros) > self._falhas_depois:
+            raise OSError("disco cheio")
+        self.registros.extend(registros)
+
+
+def test_reproduz_os_registros_em_ordem(caminho):
+    with diario.Diario(caminho) as registro:
+        registro.registrar(diario.ABERTURA, 1, 0, "Ana")
+        registro.registrar(diario.DEPOSITO, 1, 10_000)
+        registro.registrar(diario.SAQUE, 1, 2_550)
+        registro.registrar(diario.DEPOSITO, "ç" * 100, 1, "texto " * 1_000)
+
+    registros = list(diario.reproduzir(caminho))
+    assert [(r.tipo, r.conta, r.centavos) for r in registros[:3]] == [
+        (diario.ABERTURA, "1", 0), (diario.DEPOSITO, "1", 10_000), (diario.SAQUE, "1", 2_550),
+    ]
+    assert registros[0].texto == "Ana"
+    assert registros[3].conta == "ç" * 100 and len(registros[3].texto) == 6_000
+    assert diario.reconstruir_saldos(caminho) == {"1": 7_450, "ç" * 100: 1}
+
+
+def test_reproduz_a_partir_de_uma_posicao(caminho):
+    with diario.Diario(caminho) as registro:
+        registro.registrar(diario.DEPOSITO, 1, 100)
+        posicao = registro.posicao()
+        registro.registrar(diario.DEPOSITO, 2, 200)
+
+    assert [r.conta for r in diario.reproduzir(caminho, posicao)] == ["2"]
+    assert [fim for fim, _ in diario.reproduzir_com_posicoes(caminho)] == [posicao, os.path.getsize(caminho)]
+
+
+def test_registro_grande_demais_nao_e_gravado(caminho):
+    with diario.Diario(caminho) as registro:
+        with pytest.raises(ValueError):
+            registro.registrar(diario.USUARIO, 1, 0, "x" * (diario.TAMANHO_MAXIMO_TEXTO + 1))
+        with pytest.raises(ValueError):
+            registro.registrar_varios([(diario.DEPOSITO, 1, 100), (diario.DEPOSITO, "9" * 300, 100)])
+    assert list(diario.reproduzir(caminho)) == []
+
+
+@pytest.mark.parametrize("final", [
+    b"\x02\x01\x00",  # cabeçalho cortado
+    b"\x02\x01\x00\x00" + bytes(16) + b"1",  # registro sem o CRC
+    b"\x02\x01\x00\x00" + bytes(16) + b"1" + b"\xff" * 4,  # CRC errado
+])
+def test_final_corrompido_e_descartado_ao_abrir(caminho, final):
+    with diario.Diario(caminho) as registro:
+        registro.registrar(diario.DEPOSITO, 1, 100)
+    valido = os.path.getsize(caminho)
+    with open(caminho, "ab") as arquivo:
+        arquivo.write(final)
+
+    assert diario.reconstruir_saldos(caminho) == {"1": 100}
+    with diario.Diario(caminho) as registro:
+        assert registro.posicao() == valido
+        registro.registrar(diario.DEPOSITO, 1, 50)
+    assert diario.reconstruir_saldos(caminho) == {"1": 150}
+
+
+def test_reabertura_confere_so_o_que_veio_depois(caminho):
+    with diario.Diario(caminho) as registro:
+        registro.registrar(diario.DEPOSITO, 1, 100)
+        inicio_segundo = registro.posicao()
+        registro.registrar(diario.DEPOSITO, 1, 100)
+    verificado = os.path.getsize(caminho)
+    # Estraga o CRC do primeiro registro: uma conferência desde o começo cortaria tudo a partir dele
+    with open(caminho, "r+b") as arquivo:
+        arquivo.seek(inicio_segundo - 1)
+        arquivo.write(b"\x00")
+    with open(caminho, "ab") as arquivo:
+        arquivo.write(b"\x02\x01\x00")  # queda no meio do próximo registro
+
+    with diario.Diario(caminho) as registro:
+        assert registro.posicao() == verificado
+
+
+def test_posicao_verificada_de_outro_arquivo_e_ignorada(caminho):
+    with diario.Diario(caminho) as registro:
+        registro.registrar(diario.DEPOSITO, 1, 100)
+        registro.registrar(diario.DEPOSITO, 1, 100)
+    # O diário é trocado por outro; a posição guardada não bate com ele
+    os.replace(caminho, caminho + ".antigo")
+    with diario.Diario(caminho) as registro:
+        registro.registrar(diario.DEPOSITO, 2, 7)
+        registro.registrar(diario.DEPOSITO, 2, 7)
+        registro.registrar(diario.DEPOSITO, 2, 7)
+    with open(caminho, "ab") as arquivo:
+        arquivo.write(b"\x02")
+
+    with diario.Diario(caminho):
+        pass
+    assert diario.reconstruir_saldos(caminho) == {"2": 21}
+
+
+def test_lote_fsync_guarda_em_memoria_ate_descarregar(caminho):
+    with diario.Diario(caminho, lote_fsync=3) as registro:
+        registro.registrar(diario.DEPOSITO, 1, 100)
+        registro.registrar(diario.DEPOSITO, 1, 100)
+        assert os.path.getsize(caminho) == 0
+        registro.registrar(diario.DEPOSITO, 1, 100)
+        assert os.path.getsize(caminho) > 0
+
+
+def test_saque_e_deposito_so_mudam_a_conta_depois_do_diario(poo, cliente):
+    conta = poo.ContaCorrente(1, cliente, limite_saques=3)
+    conta.saida = poo.SaidaNula()
+    conta.depositar(100)
+    conta.diario = _DiarioComFalha()
+
+    with pytest.raises(OSError):
+        conta.depositar(50)
+    with pytest.raises(OSError):
+        conta.sacar(10)
+    assert conta.saldo == poo.Dinheiro(100)
+    assert len(conta.historico.transacoes) == 1
+    assert conta.historico.contagem_do_dia(poo.TipoTransacao.SAQUE) == 0
+
+
+def test_lote_fica_so_com_o_que_foi_gravado(poo, cliente):
+    conta = poo.ContaCorrente(1, cliente, limite_saques=10)
+    conta.saida = poo.SaidaNula()
+    conta.depositar(100)
+    conta.diario = _DiarioComFalha(falhas_depois=2)
+
+    with pytest.raises(OSError):
+        conta.aplicar_lote([poo.Saque(10), poo.Deposito(5), poo.Saque(20)])
+    assert conta.saldo == poo.Dinheiro(95)
+    assert len(conta.historico.transacoes) == 3
+    assert [registro[2] for registro in conta.diario.registros] == [1_000, 500]
+
+
+def test_transferencia_so_muda_os_saldos_depois_do_diario(poo, cliente):
+    origem = poo.ContaCorrente(1, cliente)
+    destino = poo.ContaCorrente(2, cliente)
+    for conta in (origem, destino):
+        conta.saida = poo.SaidaNula()
+    origem.depositar(100)
+    origem.diario = destino.diario = _DiarioComFalha(falhas_depois=1)
+
+    with pytest.raises(OSError):
+        poo.Transferencia(30, destino).registrar(origem)
+    assert (origem.saldo, destino.saldo) == (poo.Dinheiro(100), poo.Dinheiro(0))
+    assert origem.diario.registros == []  # os dois lados entram juntos, ou nenhum
+
+
+def test_transferencia_gravada_no_diario_compartilhado(poo, cliente, caminho):
+    origem = poo.ContaCorrente(1, cliente)
+    destino = poo.ContaCorrente(2, cliente)
+    with diario.Diario(caminho) as registro:
+        for conta in (origem, destino):
+            conta.saida = poo.SaidaNula()
+            conta.diario = registro
+        origem.depositar(100)
+        poo.Transferencia(30, destino).registrar(origem)
+    assert diario.reconstruir_saldos(caminho) == {"1": 7_000, "2": 3_000}
+
+
+def test_conta_dio01_so_muda_depois_do_diario(dio01, monkeypatch):
+    conta = dio01.ContaBancaria("1", "Ana", 100)
+    monkeypatch.setattr(dio01.ContaBancaria, "diario", _DiarioComFalha())
+
+    with pytest.raises(OSError):
+        conta.depositar(50)
+    with pytest.raises(OSError):
+        conta.sacar(10)
+    assert conta.saldo == dio01.Dinheiro(100)
+    assert conta.extrato == []
+    assert conta.saques_diarios == 0
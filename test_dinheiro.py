@@ -0,0 +1,88 @@
+"""
+Testes do tipo monetário Dinheiro (dinheiro.py).
+
+Uso: python -m pytest test_dinheiro.py
+"""
+import pickle
+import random
+from decimal import Decimal
+from fractions import Fraction
+
+import pytest
+
+from dinheiro import Dinheiro
+
+
+def test_sem_deriva_em_sequencias_aleatorias():
+    # Propriedade: o saldo em Dinheiro é sempre a soma exata dos centavos
+    gerador = random.Random(0)
+    for _ in range(50):
+        saldo = Dinheiro()
+        referencia = 0
+        for _ in range(2_000):
+            centavos = gerador.randint(-1_000_000, 1_000_000)
+            saldo += Dinheiro(centavos / 100)
+            referencia += centavos
+        assert saldo.centavos == referencia
+
+
+def test_soma_de_dez_centavos_e_exata():
+    saldo = Dinheiro()
+    for _ in range(10):
+        saldo += Dinheiro(0.1)
+    assert saldo == 1
+    assert saldo.centavos == 100
+
+
+@pytest.mark.parametrize("valor, centavos", [
+    (0.125, 13),  # metade: arredonda para cima
+    (2.675, 268),  # o texto do float ("2.675"), não o binário 2.67499...
+    ("-0.125", -13),
+    ("19.999", 2000),
+    (Decimal("0.005"), 1),
+    (7, 700),
+])
+def test_arredondamento_para_o_centavo(valor, centavos):
+    assert Dinheiro(valor).centavos == centavos
+
+
+@pytest.mark.parametrize("valor", ["abc", "", float("inf"), float("-inf"), float("nan"), "NaN"])
+def test_valores_invalidos(valor):
+    with pytest.raises(ValueError):
+        Dinheiro(valor)
+
+
+def test_igualdade_so_com_valores_exatos():
+    assert Dinheiro(5) == 5
+    assert Dinheiro("0.10") == Decimal("0.1")
+    assert Dinheiro("0.11") != Decimal("0.105")
+    assert Dinheiro(0.1) != 0.1
+    assert Dinheiro("0.10") != "0.10"
+
+
+@pytest.mark.parametrize("centavos", [0, 1, -1, 10, 50, 100, -100, 12_345, -99_999, 10**20 + 7, -(10**20)])
+def test_hash_igual_ao_do_numero_equivalente(centavos):
+    valor = Dinheiro.de_centavos(centavos)
+    assert hash(valor) == hash(Fraction(centavos, 100)) == hash(Decimal(centavos).scaleb(-2))
+    if centavos % 100 == 0:
+        assert hash(valor) == hash(centavos // 100)
+
+
+def test_chaves_de_dicionario_e_conjuntos():
+    contagem = {Dinheiro(1): "um real"}
+    assert contagem[1] == "um real"
+    assert contagem[Dinheiro("1.00")] == "um real"
+    assert len({Dinheiro(0.1), Dinheiro("0.10"), Dinheiro.de_centavos(10)}) == 1
+
+
+def test_comparacoes_e_aritmetica():
+    assert Dinheiro("10.00") - 0.01 == Dinheiro("9.99")
+    assert 3 * Dinheiro("0.10") == Dinheiro("0.30")
+    assert Dinheiro("0.01") > 0
+    assert -Dinheiro(2) < Dinheiro(-1)
+    assert f"{Dinheiro('1234.5'):.2f}" == "1234.50"
+    assert f"{Dinheiro('1234.5'):,.2f}" == "1,234.50"
+
+
+def test_pickle_preserva_o_valor():
+    assert pickle.loads(pickle.dumps(Dinheiro("-42.07"))) == Dinheiro("-42.07")
@@ -0,0 +1,79 @@
+"""
+Testes da exportação de extratos em fluxo (exportacao.py e
+exportar_extratos do modelo "Modelando o sistema bancario em poo com python.py").
+
+Uso: python -m pytest test_exportacao.py
+"""
+import csv
+import json
+from array import array
+from io import StringIO
+
+import pytest
+
+import exportacao
+
+
+@pytest.fixture(params=["Historico", "HistoricoColunar"])
+def contas(request, poo, cliente):
+    contas = [poo.ContaCorrente(numero, cliente, limite_saques=10) for numero in (1, 2)]
+    for conta in contas:
+        conta.classe_historico = getattr(poo, request.param)
+        conta.saida = poo.SaidaNula()
+    contas[0].depositar("150.25")
+    contas[0].sacar("0.05")
+    poo.Transferencia(10, contas[1]).registrar(contas[0])
+    contas[1].depositar(1)
+    return contas
+
+
+def test_csv_igual_ao_historico(poo, contas, tmp_path):
+    caminho = str(tmp_path / "extrato.csv")
+    assert poo.exportar_extratos(contas, caminho) == 5
+    with open(caminho, encoding="utf-8", newline="") as arquivo:
+        linhas = list(csv.DictReader(arquivo))
+    esperado = [
+        (str(conta.numero), transacao["tipo"], f"{transacao['valor']:.2f}", transacao["data"])
+        for conta in contas for transacao in conta.historico.transacoes
+    ]
+    assert [(linha["conta"], linha["tipo"], linha["valor"], linha["data"]) for linha in linhas] == esperado
+
+
+def test_jsonl_com_valores_exatos(poo, contas, tmp_path):
+    caminho = str(tmp_path / "extrato.jsonl")
+    poo.exportar_extratos(contas[:1], caminho, "jsonl")
+    with open(caminho, encoding="utf-8") as arquivo:
+        linhas = [json.loads(linha, parse_float=str) for linha in arquivo]
+    assert [(linha["tipo"], linha["valor"]) for linha in linhas] == [
+        ("Depósito", "150.25"), ("Saque", "0.05"), ("Transferência enviada", "10.00"),
+    ]
+
+
+def test_colunar_relido_em_grupos(poo, contas, tmp_path):
+    caminho = str(tmp_path / "extrato.col")
+    assert poo.exportar_extratos(contas, caminho, "colunar", tamanho_lote=2) == 5
+    with open(caminho, "rb") as arquivo:
+        grupos = list(exportacao.ler_colunar(arquivo))
+    assert [len(lote[1]) for _, lote in grupos] == [2, 2, 1]
+    nomes = grupos[0][0]
+    assert nomes == [tipo.value for tipo in poo.TIPOS_TRANSACAO]
+    assert sum((lote[2] for _, lote in grupos), array("q")) == array("q", [15_025, 5, 1_000, 1_000, 100])
+    assert [conta for _, lote in grupos for conta in lote[0]] == [1, 1, 1, 2, 2]
+
+
+def test_lotes_de_tamanho_fixo(contas):
+    tamanhos = [len(lote[1]) for lote in exportacao.lotes_das_contas(contas, 3)]
+    assert tamanhos == [3, 2]
+    assert list(exportacao.lotes_das_contas([], 3)) == []
+
+
+def test_nomes_com_virgula_e_valores_negativos():
+    lote = (array("q", [7]), array("B", [0]), array("q", [-1_005]), array("q", [0]))
+    arquivo = StringIO()
+    exportacao.exportar_csv([lote], arquivo, ['Ajuste, "manual"'])
+    assert arquivo.getvalue().splitlines()[1].startswith('7,"Ajuste, ""manual""",-10.05,')
+
+
+def test_formato_desconhecido(poo, contas, tmp_path):
+    with pytest.raises(ValueError):
+        poo.exportar_extratos(contas, str(tmp_path / "extrato.xml"), "xml")
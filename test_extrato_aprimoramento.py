@@ -0,0 +1,54 @@
+"""
+Testes do extrato em lista de lançamentos e da impressão paginada
+("Aprimoramento do sistema bancario.py").
+
+Uso: python -m pytest test_extrato_aprimoramento.py
+"""
+from io import StringIO
+
+
+class _ArquivoContador(StringIO):
+    """Conta quantas vezes write foi chamado."""
+    escritas = 0
+
+    def write(self, texto):
+        self.escritas += 1
+        return super().write(texto)
+
+
+def test_lancamentos_entram_na_mesma_lista(aprimoramento):
+    extrato = []
+    saldo, mesmo = aprimoramento.depositar(aprimoramento.Dinheiro(), 100, extrato)
+    saldo, mesmo, saques = aprimoramento.sacar(
+        saldo=saldo, valor=30, extrato=mesmo, limite=500, numero_saques=0, limite_saques=3,
+    )
+    assert mesmo is extrato
+    assert extrato == [("Depósito:\t", aprimoramento.Dinheiro(100)), ("Saque:\t\t", aprimoramento.Dinheiro(30))]
+    assert (saldo, saques) == (aprimoramento.Dinheiro(70), 1)
+
+
+def test_recusas_nao_entram_no_extrato(aprimoramento):
+    extrato = []
+    aprimoramento.depositar(aprimoramento.Dinheiro(), -5, extrato)
+    aprimoramento.depositar(aprimoramento.Dinheiro(), float("nan"), extrato)
+    _, _, saques = aprimoramento.sacar(
+        saldo=aprimoramento.Dinheiro(10), valor=20, extrato=extrato, limite=500, numero_saques=0, limite_saques=3,
+    )
+    assert extrato == [] and saques == 0
+
+
+def test_extrato_escrito_em_paginas(aprimoramento):
+    extrato = [("Depósito:\t", aprimoramento.Dinheiro(i)) for i in range(1, 11)]
+    arquivo = _ArquivoContador()
+    aprimoramento.exibir_extrato(aprimoramento.Dinheiro(55), extrato=extrato, arquivo=arquivo, tamanho_pagina=4)
+    texto = arquivo.getvalue()
+    assert texto.count("Depósito:\tR$ ") == 10
+    assert "Depósito:\tR$ 10.00\n" in texto
+    assert texto.endswith("\nSaldo:\t\tR$ 55.00\n-----------------------------------------\n")
+    assert arquivo.escritas == 1 + 3 + 3  # cabeçalho, uma por página, e quebra, saldo e rodapé
+    assert [pagina.count("\n") for pagina in aprimoramento.paginar_extrato(extrato, 4)] == [4, 4, 2]
+
+
+def test_extrato_vazio(aprimoramento, capsys):
+    aprimoramento.exibir_extrato(aprimoramento.Dinheiro(), extrato=[])
+    assert "Não foram realizadas movimentações." in capsys.readouterr().out
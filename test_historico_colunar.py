@@ -0,0 +1,77 @@
+"""
+Testes do HistoricoColunar: as mesmas transações, contagens e colunas do
+Historico de dicionários ("Modelando o sistema bancario em poo com python.py").
+
+Uso: python -m pytest test_historico_colunar.py
+"""
+import time
+from array import array
+
+import pytest
+
+
+@pytest.fixture
+def historicos(poo):
+    instante = time.time_ns()
+    historicos = (poo.Historico(), poo.HistoricoColunar())
+    for historico in historicos:
+        historico.adicionar_lancamento(poo.TipoTransacao.DEPOSITO, poo.Dinheiro("150.25"), instante=instante)
+        historico.adicionar_lancamento(poo.TipoTransacao.SAQUE, poo.Dinheiro("42.10"), instante=instante)
+        historico.adicionar_lancamento(poo.TipoTransacao.TRANSFERENCIA_ENVIADA, poo.Dinheiro(5), vinculo=7, instante=instante)
+    return historicos
+
+
+def test_visao_igual_a_lista_de_dicionarios(poo, historicos):
+    dicionarios, colunar = historicos
+    assert len(colunar.transacoes) == 3
+    assert list(colunar.transacoes) == dicionarios.transacoes
+    assert colunar.transacoes[-1] == {
+        "tipo": "Transferência enviada",
+        "valor": poo.Dinheiro(5),
+        "data": dicionarios.transacoes[0]["data"],
+        "transferencia": 7,
+    }
+    assert colunar.transacoes[1:] == dicionarios.transacoes[1:]
+    with pytest.raises(IndexError):
+        colunar.transacoes[3]
+
+
+def test_colunas_tipadas(poo, historicos):
+    dicionarios, colunar = historicos
+    tipos, centavos, instantes = colunar.colunas()
+    assert (tipos.typecode, centavos.typecode, instantes.typecode) == ("B", "q", "q")
+    assert centavos == array("q", [15_025, 4_210, 500])
+    codigos = poo.CODIGO_TIPO
+    assert list(tipos) == [
+        codigos[poo.TipoTransacao.DEPOSITO], codigos[poo.TipoTransacao.SAQUE], codigos[poo.TipoTransacao.TRANSFERENCIA_ENVIADA],
+    ]
+    # O Historico exporta no mesmo formato, com as datas truncadas no segundo
+    assert dicionarios.colunas()[:2] == (tipos, centavos)
+    assert dicionarios.colunas()[2][0] == instantes[0] // 1_000_000_000 * 1_000_000_000
+    assert colunar.colunas(1, 2)[1] == array("q", [4_210])
+
+
+def test_contagens_e_janela_do_dia(poo, historicos):
+    for historico in historicos:
+        assert historico.contagem(poo.TipoTransacao.SAQUE) == 1
+        assert historico.soma(poo.TipoTransacao.DEPOSITO) == poo.Dinheiro("150.25")
+        assert historico.contagem_do_dia(poo.TipoTransacao.SAQUE) == 1
+
+
+def test_lote_com_o_mesmo_instante(poo):
+    historico = poo.HistoricoColunar()
+    historico.adicionar_transacoes([poo.Deposito(10), poo.Saque(3), poo.Deposito(1)])
+    _, centavos, instantes = historico.colunas()
+    assert centavos == array("q", [1_000, 300, 100])
+    assert len(set(instantes)) == 1
+    assert historico.soma(poo.TipoTransacao.DEPOSITO) == poo.Dinheiro(11)
+
+
+def test_conta_com_historico_colunar(poo, cliente):
+    conta = poo.ContaCorrente(1, cliente)
+    conta.classe_historico = poo.HistoricoColunar
+    conta.saida = poo.SaidaNula()
+    conta.depositar(100)
+    conta.sacar(30)
+    assert isinstance(conta.historico, poo.HistoricoColunar)
+    assert [transacao["tipo"] for transacao in conta.historico.transacoes] == ["Depósito", "Saque"]
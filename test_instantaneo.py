@@ -0,0 +1,109 @@
+"""
+Testes do instantâneo em disco (instantaneo.py) com as contas do modelo
+("Modelando o sistema bancario em poo com python.py").
+
+Uso: python -m pytest test_instantaneo.py
+"""
+import os
+
+import pytest
+
+import diario
+
+
+@pytest.fixture
+def contas(poo, cliente):
+    outro = poo.PessoaFisica("Bruno Lima", "02-07-1990", "111.222.333-44", "Av. Central, 10")
+    contas = [
+        poo.ContaCorrente(1, cliente, limite=500, limite_saques=3),
+        poo.ContaCorrente(2, cliente, limite=500, limite_saques=3),
+        poo.Conta(3, outro),
+    ]
+    for conta in contas:
+        conta.saida = poo.SaidaNula()
+        conta.cliente.adicionar_conta(conta)
+        conta.depositar(1_000)
+    return contas
+
+
+def test_restaura_saldos_e_cadastros(poo, contas, tmp_path):
+    caminho = str(tmp_path / "contas.snap")
+    assert poo.salvar_instantaneo(contas, caminho) == 3
+
+    with poo.abrir_instantaneo(caminho) as livro:
+        assert len(livro) == 3
+        assert list(livro.numeros()) == [1, 2, 3]
+        assert livro.saldo(2) == poo.Dinheiro(1_000)
+        assert livro.titular(3) == "Bruno Lima"
+        assert 4 not in livro
+        assert livro.conta(4) is None
+
+        conta = livro.conta(1)
+        assert isinstance(conta, poo.ContaCorrente)
+        assert conta.limite == poo.Dinheiro(500)
+        assert conta.cliente.cpf == "456.789.012-34"
+        assert [outra.numero for outra in conta.cliente.contas] == [1, 2]
+        assert type(livro.conta(3)) is poo.Conta
+
+
+def test_limite_diario_de_saques_sobrevive_ao_instantaneo(poo, contas, tmp_path):
+    caminho = str(tmp_path / "contas.snap")
+    conta = contas[0]
+    assert conta.sacar(10) and conta.sacar(10)
+    poo.salvar_instantaneo(contas, caminho)
+
+    with poo.abrir_instantaneo(caminho) as livro:
+        restaurada = livro.conta(1)
+        restaurada.saida = poo.SaidaNula()
+        assert restaurada.historico.contagem_do_dia(poo.TipoTransacao.SAQUE) == 2
+        assert restaurada.historico.soma_do_dia(poo.TipoTransacao.SAQUE) == poo.Dinheiro(20)
+        assert [restaurada.sacar(10) for _ in range(2)] == [True, False]
+
+
+def test_cauda_do_diario_aplicada_por_cima(poo, contas, tmp_path):
+    caminho = str(tmp_path / "contas.snap")
+    caminho_diario = str(tmp_path / "contas.diario")
+    with diario.Diario(caminho_diario, sincronizar=False) as registro:
+        registro.registrar(diario.DEPOSITO, 1, 999)  # já refletido no instantâneo
+        posicao = registro.posicao()
+        poo.salvar_instantaneo(contas, caminho, posicao)
+        registro.registrar(diario.DEPOSITO, 1, 5_000)
+        registro.registrar(diario.SAQUE, 2, 2_500)
+        registro.registrar(diario.SAQUE, 2, 2_500)
+        registro.registrar(diario.DEPOSITO, 99, 100)  # conta fora do instantâneo
+
+    with poo.abrir_instantaneo(caminho, caminho_diario) as livro:
+        assert livro.posicao_diario == os.path.getsize(caminho_diario)
+        assert livro.saldo(1) == poo.Dinheiro(1_050)
+        assert livro.saldo(2) == poo.Dinheiro(950)
+        conta = livro.conta(2)
+        assert conta.saldo == poo.Dinheiro(950)
+        assert conta.historico.contagem_do_dia(poo.TipoTransacao.SAQUE) == 2
+
+
+def test_final_corrompido_nao_avanca_a_posicao(poo, contas, tmp_path):
+    caminho = str(tmp_path / "contas.snap")
+    caminho_diario = str(tmp_path / "contas.diario")
+    with diario.Diario(caminho_diario, sincronizar=False) as registro:
+        poo.salvar_instantaneo(contas, caminho, registro.posicao())
+        registro.registrar(diario.DEPOSITO, 1, 5_000)
+        valido = registro.posicao()
+    with open(caminho_diario, "ab") as arquivo:
+        arquivo.write(b"\x02\x01\x00" + bytes(10))  # registro cortado no meio por uma queda
+
+    with poo.abrir_instantaneo(caminho, caminho_diario) as livro:
+        assert livro.posicao_diario == valido
+        assert livro.saldo(1) == poo.Dinheiro(1_050)
+
+        # O diário reaberto descarta o final cortado e continua dali
+        with diario.Diario(caminho_diario, sincronizar=False) as registro:
+            registro.registrar(diario.DEPOSITO, 1, 1_000)
+        assert livro.aplicar_diario(caminho_diario) == 1
+        assert livro.saldo(1) == poo.Dinheiro(1_060)
+
+
+def test_arquivo_invalido(poo, tmp_path):
+    caminho = tmp_path / "lixo.snap"
+    caminho.write_bytes(bytes(256))
+    with pytest.raises(ValueError):
+        poo.abrir_instantaneo(str(caminho))
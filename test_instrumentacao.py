@@ -0,0 +1,69 @@
+"""
+Testes da instrumentação (instrumentacao.py) sobre os caminhos quentes do modelo
+("Modelando o sistema bancario em poo com python.py").
+
+Uso: python -m pytest test_instrumentacao.py
+"""
+import json
+from io import StringIO
+
+import pytest
+
+import instrumentacao
+
+
+@pytest.fixture
+def conta(poo, cliente):
+    conta = poo.ContaCorrente(1, cliente, limite=100, limite_saques=10)
+    conta.saida = poo.SaidaNula()
+    return conta
+
+
+def test_mede_operacoes_e_conta_recusas(poo, conta):
+    with poo.nova_instrumentacao() as medicao:
+        conta.depositar(50)
+        conta.sacar(10)
+        conta.sacar(500)
+    dados = medicao.instantaneo()
+    assert dados["operacoes"]["Conta.depositar"]["chamadas"] == 1
+    assert dados["operacoes"]["Conta.sacar"]["chamadas"] == 2
+    assert sum(dados["eventos"].values()) == 1
+
+    arquivo = StringIO()
+    medicao.exportar_json(arquivo)
+    assert json.loads(arquivo.getvalue())["operacoes"]["Conta.sacar"]["baldes"]
+
+
+def test_desativar_devolve_os_originais(poo, conta):
+    original = poo.Conta.__dict__["sacar"]
+    medicao = poo.nova_instrumentacao()
+    medicao.ativar()
+    medicao.ativar()  # repetir na mesma instrumentação não empilha
+    assert poo.Conta.__dict__["sacar"].__wrapped__ is original
+    medicao.desativar()
+    medicao.desativar()
+    assert poo.Conta.__dict__["sacar"] is original
+    assert not medicao.ativa
+
+
+def test_segunda_instrumentacao_e_recusada(poo):
+    original = poo.Conta.__dict__["sacar"]
+    with poo.nova_instrumentacao():
+        outra = instrumentacao.Instrumentacao([(poo.Conta, "depositar"), (poo.Conta, "sacar")])
+        with pytest.raises(RuntimeError):
+            outra.ativar()
+        assert not outra.ativa
+    assert poo.Conta.__dict__["sacar"] is original
+    with outra:  # liberados os pontos, a outra pode ativar
+        assert poo.Conta.__dict__["sacar"].__wrapped__ is original
+    assert poo.Conta.__dict__["sacar"] is original
+
+
+def test_histograma_percentis():
+    histograma = instrumentacao.HistogramaLatencia()
+    for valor in range(1, 1_001):
+        histograma.registrar(valor * 1_000)
+    assert histograma.contagem == 1_000 and histograma.maximo == 1_000_000
+    assert 450_000 <= histograma.percentil(50) <= 500_000
+    assert 870_000 <= histograma.percentil(99) <= 990_000
+    assert instrumentacao.HistogramaLatencia().percentil(50) == 0
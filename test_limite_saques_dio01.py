@@ -0,0 +1,167 @@
+"""
+Testes da virada do limite diário de saques de ContaBancaria
+("Projeto sistema bancario dio-01.py"), com um relógio falso injetado.
+
+Uso: python -m pytest test_limite_saques_dio01.py
+"""
+import importlib.util
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import pytest
+
+_CAMINHO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Projeto sistema bancario dio-01.py")
+_especificacao = importlib.util.spec_from_file_location("projeto_dio01", _CAMINHO)
+dio01 = importlib.util.module_from_spec(_especificacao)
+sys.modules["projeto_dio01"] = dio01
+_especificacao.loader.exec_module(dio01)
+
+try:
+    SAO_PAULO = ZoneInfo("America/Sao_Paulo")
+except ZoneInfoNotFoundError:
+    SAO_PAULO = None
+precisa_do_fuso = pytest.mark.skipif(SAO_PAULO is None, reason="base de fusos (tzdata) indisponível")
+
+
+class Relogio:
+    """Relógio falso: devolve o instante em agora, ajustado pelo teste."""
+    def __init__(self, agora: datetime):
+        self.agora = agora
+
+    def __call__(self) -> float:
+        return self.agora.timestamp()
+
+
+def _conta(relogio, saldo=1_000, **opcoes):
+    return dio01.ContaBancaria("1", "Titular", saldo, relogio=relogio, **opcoes)
+
+
+def _sacar_ate_o_limite(conta):
+    for _ in range(dio01.ContaBancaria.LIMITE_SAQUES_DIARIOS):
+        conta.sacar(10)
+
+
+@precisa_do_fuso
+def test_limite_atingido_recusa_saque_no_mesmo_dia(capsys):
+    relogio = Relogio(datetime(2026, 3, 10, 9, 0, tzinfo=SAO_PAULO))
+    conta = _conta(relogio)
+    _sacar_ate_o_limite(conta)
+    relogio.agora = datetime(2026, 3, 10, 23, 59, 59, tzinfo=SAO_PAULO)
+
+    conta.sacar(10)
+
+    assert conta.saldo == 970
+    assert conta.saques_diarios == 3
+    assert "limite de 3 saques diários" in capsys.readouterr().out
+
+
+@precisa_do_fuso
+def test_limite_zera_a_meia_noite_de_sao_paulo():
+    relogio = Relogio(datetime(2026, 3, 10, 23, 0, tzinfo=SAO_PAULO))
+    conta = _conta(relogio)
+    _sacar_ate_o_limite(conta)
+    relogio.agora = datetime(2026, 3, 11, 0, 0, tzinfo=SAO_PAULO)
+
+    assert conta.saques_diarios == 0
+    conta.sacar(10)
+
+    assert conta.saldo == 960
+    assert conta.saques_diarios == 1
+
+
+@precisa_do_fuso
+def test_meia_noite_utc_nao_vira_o_dia():
+    # 21h30 em São Paulo já é 00h30 do dia seguinte em UTC
+    relogio = Relogio(datetime(2026, 3, 10, 20, 0, tzinfo=SAO_PAULO))
+    conta = _conta(relogio)
+    _sacar_ate_o_limite(conta)
+    relogio.agora = datetime(2026, 3, 10, 21, 30, tzinfo=SAO_PAULO)
+    assert relogio.agora.astimezone(timezone.utc).day == 11
+
+    conta.sacar(10)
+
+    assert conta.saldo == 970
+    assert conta.saques_diarios == 3
+
+
+@precisa_do_fuso
+def test_dia_de_23_horas_no_inicio_do_horario_de_verao():
+    # Em 04/11/2018 os relógios pularam de 00h00 para 01h00 em São Paulo
+    relogio = Relogio(datetime(2018, 11, 3, 23, 30, tzinfo=SAO_PAULO))
+    conta = _conta(relogio)
+    _sacar_ate_o_limite(conta)
+    relogio.agora = datetime(2018, 11, 4, 1, 30, tzinfo=SAO_PAULO)
+
+    conta.sacar(10)
+
+    assert conta.saldo == 960
+    assert conta.saques_diarios == 1
+
+
+def test_ler_o_contador_nao_altera_a_conta():
+    relogio = Relogio(datetime(2026, 3, 10, 23, 0, tzinfo=timezone.utc))
+    conta = _conta(relogio, fuso_horario=timezone.utc)
+    _sacar_ate_o_limite(conta)
+    relogio.agora += timedelta(hours=2)
+
+    assert conta.saques_diarios == 0
+    # A janela e o contador guardados só mudam na próxima operação, sob a trava
+    assert conta._saques_no_dia == 3
+    relogio.agora -= timedelta(hours=2)
+    assert conta.saques_diarios == 3
+
+
+def test_fuso_horario_injetado():
+    relogio = Relogio(datetime(2026, 3, 10, 23, 0, tzinfo=timezone.utc))
+    conta = _conta(relogio, fuso_horario=timezone.utc)
+    _sacar_ate_o_limite(conta)
+    relogio.agora = datetime(2026, 3, 11, 0, 0, tzinfo=timezone.utc)
+
+    conta.sacar(10)
+
+    assert conta.saques_diarios == 1
+
+
+def test_fuso_padrao_sem_base_de_fusos(monkeypatch):
+    def sem_tzdata(nome):
+        raise ZoneInfoNotFoundError(nome)
+
+    monkeypatch.setattr(dio01, "ZoneInfo", sem_tzdata)
+    dio01.fuso_horario_padrao.cache_clear()
+    try:
+        fuso = dio01.fuso_horario_padrao()
+        assert fuso.utcoffset(None) == timedelta(hours=-3)
+    finally:
+        dio01.fuso_horario_padrao.cache_clear()
+
+
+def test_saques_reaplicados_de_hoje_contam_no_limite():
+    relogio = Relogio(datetime(2026, 3, 10, 15, 0, tzinfo=timezone.utc))
+    conta = _conta(relogio, fuso_horario=timezone.utc)
+
+    conta.reaplicar_saque(10, datetime(2026, 3, 9, 23, 0, tzinfo=timezone.utc).timestamp())
+    for hora in (8, 9):
+        conta.reaplicar_saque(10, datetime(2026, 3, 10, hora, 0, tzinfo=timezone.utc).timestamp())
+
+    assert conta.saldo == 970
+    assert conta.saques_diarios == 2
+    assert conta.extrato == ["Saque de R$10.00"] * 3
+
+
+def test_restaurar_do_diario_refaz_contas_e_limite(tmp_path):
+    caminho = str(tmp_path / "contas.diario")
+    with dio01.diario.Diario(caminho) as registro:
+        registro.registrar(dio01.diario.ABERTURA, "7", 50_000, "Ana")
+        registro.registrar(dio01.diario.DEPOSITO, "7", 10_000)
+        for _ in range(dio01.ContaBancaria.LIMITE_SAQUES_DIARIOS):
+            registro.registrar(dio01.diario.SAQUE, "7", 1_000)
+
+    contas = dio01.RegistroAgencia()
+    dio01.restaurar_do_diario(caminho, contas)
+    conta = contas.encontrar("7")
+
+    assert conta.titular == "Ana"
+    assert conta.saldo == 570
+    assert conta.saques_diarios == dio01.ContaBancaria.LIMITE_SAQUES_DIARIOS
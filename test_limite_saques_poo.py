@@ -0,0 +1,56 @@
+"""
+Testes do limite diário de saques da ContaCorrente e dos contadores do
+Historico ("Modelando o sistema bancario em poo com python.py").
+
+Uso: python -m pytest test_limite_saques_poo.py
+"""
+import pytest
+
+
+@pytest.fixture
+def conta(poo, cliente):
+    conta = poo.ContaCorrente(1, cliente, limite=500, limite_saques=3)
+    conta.saida = poo.SaidaNula()
+    conta.depositar(1_000)
+    return conta
+
+
+def test_saque_direto_conta_no_limite_diario(poo, conta):
+    assert [conta.sacar(10) for _ in range(5)] == [True, True, True, False, False]
+    assert conta.saldo == poo.Dinheiro("970.00")
+    assert conta.historico.contagem_do_dia(poo.TipoTransacao.SAQUE) == 3
+
+
+def test_saque_por_transacao_nao_conta_duas_vezes(poo, conta):
+    for _ in range(3):
+        poo.Saque(10).registrar(conta)
+
+    assert conta.historico.contagem(poo.TipoTransacao.SAQUE) == 3
+    assert len(conta.historico.transacoes) == 4  # o depósito inicial e os três saques
+    assert not conta.sacar(10)
+
+
+def test_saque_recusado_nao_conta(poo, conta):
+    assert not conta.sacar(600)  # acima do limite por saque
+    assert not conta.sacar(0)
+
+    assert conta.historico.contagem_do_dia(poo.TipoTransacao.SAQUE) == 0
+    assert [conta.sacar(10) for _ in range(3)] == [True, True, True]
+
+
+def test_contadores_por_tipo(poo, conta):
+    conta.depositar(50)
+    conta.sacar(20)
+
+    assert conta.historico.contagem(poo.TipoTransacao.DEPOSITO) == 2
+    assert conta.historico.soma(poo.TipoTransacao.DEPOSITO) == poo.Dinheiro("1050.00")
+    assert conta.historico.soma_do_dia(poo.TipoTransacao.SAQUE) == poo.Dinheiro("20.00")
+
+
+def test_limite_vale_com_historico_colunar(poo, cliente):
+    conta = poo.ContaCorrente(2, cliente, limite_saques=2)
+    conta.classe_historico = poo.HistoricoColunar
+    conta.saida = poo.SaidaNula()
+    conta.depositar(100)
+
+    assert [conta.sacar(10) for _ in range(3)] == [True, True, False]
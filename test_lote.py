@@ -0,0 +1,64 @@
+"""
+Testes do processamento em lote (Conta.aplicar_lote e processar_lote) do
+modelo ("Modelando o sistema bancario em poo com python.py").
+
+Uso: python -m pytest test_lote.py
+"""
+from contextlib import redirect_stdout
+from io import StringIO
+
+import pytest
+
+
+@pytest.fixture
+def conta(poo, cliente):
+    conta = poo.ContaCorrente(1, cliente, limite=100, limite_saques=2)
+    conta.saida = poo.SaidaNula()
+    conta.depositar(150)
+    return conta
+
+
+def test_cada_transacao_validada_contra_as_anteriores(poo, conta):
+    resultados = conta.aplicar_lote([
+        poo.Saque(100),
+        poo.Saque(60),  # o saldo restante é 50
+        poo.Saque(200),  # acima do limite por saque
+        poo.Deposito(0),
+        poo.Deposito(20),
+        poo.Saque(50),
+        poo.Saque(10),  # terceiro saque do dia
+        poo.Transferencia(10, conta),
+    ])
+    R = poo.ResultadoOperacao
+    assert list(resultados) == [
+        R.SUCESSO, R.SALDO_INSUFICIENTE, R.LIMITE_EXCEDIDO, R.VALOR_INVALIDO,
+        R.SUCESSO, R.SUCESSO, R.SAQUES_EXCEDIDOS, R.VALOR_INVALIDO,
+    ]
+    assert resultados.typecode == "b"
+    assert conta.saldo == poo.Dinheiro(20)
+    assert len(conta.historico.transacoes) == 4  # o depósito inicial e as três aceitas
+    assert conta.historico.contagem_do_dia(poo.TipoTransacao.SAQUE) == 2
+
+
+def test_lote_nao_escreve_no_console(poo, cliente):
+    conta = poo.ContaCorrente(2, cliente)
+    saida = StringIO()
+    with redirect_stdout(saida):
+        conta.aplicar_lote([poo.Deposito(10), poo.Saque(1_000)])
+    assert saida.getvalue() == ""
+
+
+def test_processar_lote_devolve_na_ordem_recebida(poo, cliente, conta):
+    outra = poo.ContaCorrente(2, cliente)
+    outra.saida = poo.SaidaNula()
+    resultados = poo.processar_lote([
+        (conta, poo.Saque(50)),
+        (outra, poo.Saque(1)),
+        (outra, poo.Deposito(5)),
+        (conta, poo.Deposito(1)),
+        (outra, poo.Saque(1)),
+    ])
+    R = poo.ResultadoOperacao
+    assert list(resultados) == [R.SUCESSO, R.SALDO_INSUFICIENTE, R.SUCESSO, R.SUCESSO, R.SUCESSO]
+    assert (conta.saldo, outra.saldo) == (poo.Dinheiro(101), poo.Dinheiro(4))
+    assert list(poo.processar_lote([])) == []
@@ -0,0 +1,54 @@
+"""
+Testes das contas compactas do modelo ("Modelando o sistema bancario em poo
+com python.py"): slots, configuração compartilhada e importações sob demanda.
+
+Uso: python -m pytest test_memoria_contas.py
+"""
+import subprocess
+import sys
+
+import pytest
+
+
+def test_objetos_sem_dicionario_por_instancia(poo, cliente):
+    conta = poo.ContaCorrente(1, cliente)
+    for objeto in (cliente, poo.Saque(10), poo.Historico(), conta.produto):
+        assert not hasattr(objeto, "__dict__")
+    with pytest.raises(AttributeError):
+        cliente.apelido = "Ana"
+    # O __dict__ da conta só ganha conteúdo quando saida ou diario são trocados nela
+    assert vars(conta) == {}
+    conta.saida = poo.SaidaNula()
+    assert vars(conta) == {"saida": conta.saida}
+
+
+def test_configuracao_e_agencia_compartilhadas(poo, cliente):
+    primeira = poo.ContaCorrente(1, cliente, limite=500, limite_saques=3)
+    segunda = poo.ContaCorrente.nova_conta(cliente=cliente, numero=2, limite=500.0, limite_saques=3)
+    assert primeira.produto is segunda.produto
+    assert primeira.agencia is segunda.agencia is poo.AGENCIA_PADRAO
+
+    segunda.limite = 800
+    assert segunda.limite == poo.Dinheiro(800) and segunda.limite_saques == 3
+    assert primeira.limite == poo.Dinheiro(500)
+    assert primeira.produto is poo.ProdutoConta(500, 3)
+
+
+def test_historico_criado_no_primeiro_uso(poo, cliente):
+    conta = poo.ContaCorrente(1, cliente)
+    conta.saida = poo.SaidaNula()
+    assert conta._historico is None
+    conta.depositar(10)
+    assert len(conta.historico.transacoes) == 1
+
+
+def test_modulos_de_apoio_so_carregam_quando_usados():
+    codigo = (
+        "import importlib.util, sys\n"
+        "spec = importlib.util.spec_from_file_location('poo', 'Modelando o sistema bancario em poo com python.py')\n"
+        "spec.loader.exec_module(importlib.util.module_from_spec(spec))\n"
+        "print(sorted(set(sys.argv[1:]) & set(sys.modules)))\n"
+    )
+    apoio = ["asyncio", "cProfile", "tracemalloc", "exportacao", "instantaneo", "instrumentacao", "particoes", "servico"]
+    saida = subprocess.run([sys.executable, "-c", codigo, *apoio], capture_output=True, text=True, check=True)
+    assert saida.stdout.strip() == "[]"
@@ -0,0 +1,137 @@
+"""
+Testes do livro-razão particionado (particoes.py) e das partições do modelo
+("Modelando o sistema bancario em poo com python.py").
+
+Uso: python -m pytest test_particoes.py
+"""
+import pytest
+
+from particoes import LivroRazaoParticionado
+
+
+class _ConfirmacaoComFalha:
+    """Modelo cujas partições falham ao confirmar (o caminho da compensação)."""
+    def __init__(self, modelo, falha):
+        self._modelo = modelo
+        self._falha = falha  # uma exceção a lançar, ou o código de resultado devolvido
+
+    def nova_particao(self):
+        particao = self._modelo.nova_particao()
+
+        def confirmar(id_transferencia):
+            particao.abortar(id_transferencia)
+            if isinstance(self._falha, Exception):
+                raise self._falha
+            return self._falha
+
+        particao.confirmar = confirmar
+        return particao
+
+    def codificar(self, lancamento):
+        return self._modelo.codificar(lancamento)
+
+
+@pytest.fixture
+def particao(poo):
+    particao = poo._Particao(poo.Dinheiro(500), 3)
+    particao.abrir([1, 2])
+    particao.creditar(-1, 1, 10_000)
+    return particao
+
+
+@pytest.fixture
+def livro(poo):
+    with poo.novo_livro_particionado(2) as livro:
+        livro.abrir_contas(range(4))
+        livro.processar([(numero, poo.Deposito(100)) for numero in range(4)])
+        yield livro
+
+
+def test_confirmar_e_abortar_sao_idempotentes(poo, particao):
+    assert particao.preparar(7, 1, 2_500) == poo.ResultadoOperacao.SUCESSO
+    assert particao.confirmar(7) == poo.ResultadoOperacao.SUCESSO
+    assert particao.confirmar(7) == poo.ResultadoOperacao.CONTA_INEXISTENTE
+    assert particao.abortar(7) == poo.ResultadoOperacao.CONTA_INEXISTENTE
+    assert particao.saldos()[1] == 7_500
+
+
+def test_abortar_devolve_a_reserva_uma_vez(poo, particao):
+    particao.preparar(8, 1, 2_500)
+    assert particao.abortar(8) == poo.ResultadoOperacao.SUCESSO
+    assert particao.abortar(8) == poo.ResultadoOperacao.CONTA_INEXISTENTE
+    assert particao.saldos()[1] == 10_000
+
+
+def test_reserva_desconhecida(poo, particao):
+    assert particao.confirmar(99) == poo.ResultadoOperacao.CONTA_INEXISTENTE
+    assert particao.abortar(99) == poo.ResultadoOperacao.CONTA_INEXISTENTE
+
+
+def test_transferencia_local_em_uma_chamada(poo, particao):
+    assert particao.transferir(9, 1, 2, 4_000) == poo.ResultadoOperacao.SUCESSO
+    assert particao.saldos() == {1: 6_000, 2: 4_000}
+    assert particao.transferir(10, 1, 3, 1_000) == poo.ResultadoOperacao.CONTA_INEXISTENTE
+    assert particao.transferir(11, 2, 1, 50_000) == poo.ResultadoOperacao.SALDO_INSUFICIENTE
+    assert particao.saldos() == {1: 6_000, 2: 4_000}
+
+
+def test_estorno_desfaz_o_credito(poo, particao):
+    particao.creditar(12, 2, 3_000)
+    assert particao.estornar(12, 2, 3_000) == poo.ResultadoOperacao.SUCESSO
+    assert particao.saldos()[2] == 0
+    assert particao.estornar(12, 5, 3_000) == poo.ResultadoOperacao.CONTA_INEXISTENTE
+
+
+def test_transferencia_entre_particoes(poo, livro):
+    # 0 e 1 ficam em partições diferentes; 0 e 2, na mesma
+    assert livro.transferir(0, 1, 30) == poo.ResultadoOperacao.SUCESSO
+    assert livro.transferir(0, 2, 20) == poo.ResultadoOperacao.SUCESSO
+    saldos = livro.saldos()
+    assert saldos[0] == poo.Dinheiro(50)
+    assert saldos[1] == poo.Dinheiro(130)
+    assert saldos[2] == poo.Dinheiro(120)
+    assert sum(saldos.values(), poo.Dinheiro()) == poo.Dinheiro(400)
+
+
+def test_transferencia_recusada_nao_move_dinheiro(poo, livro):
+    assert livro.transferir(0, 1, 1_000) == poo.ResultadoOperacao.SALDO_INSUFICIENTE
+    assert livro.transferir(0, 9, 10) == poo.ResultadoOperacao.CONTA_INEXISTENTE
+    assert livro.transferir(9, 0, 10) == poo.ResultadoOperacao.CONTA_INEXISTENTE
+    assert set(livro.saldos().values()) == {poo.Dinheiro(100)}
+
+
+def test_lote_devolve_codigos_na_ordem(poo, livro):
+    resultados = livro.processar([
+        (0, poo.Saque(10)),
+        (1, poo.Saque(1_000)),
+        (3, poo.Saque(-1)),
+        (9, poo.Deposito(10)),
+        (2, poo.Deposito(-5)),
+    ])
+    assert list(resultados) == [
+        poo.ResultadoOperacao.SUCESSO,
+        poo.ResultadoOperacao.LIMITE_EXCEDIDO,
+        poo.ResultadoOperacao.VALOR_INVALIDO,
+        poo.ResultadoOperacao.CONTA_INEXISTENTE,
+        poo.ResultadoOperacao.VALOR_INVALIDO,
+    ]
+
+
+def test_numero_repetido_sobe_do_trabalhador(livro):
+    with pytest.raises(ValueError):
+        livro.abrir_contas([0])
+
+
+@pytest.mark.parametrize("erro", [False, True])
+def test_confirmacao_falha_estorna_o_destino(poo, erro):
+    falha = RuntimeError("falha ao confirmar") if erro else poo.ResultadoOperacao.CONTA_INEXISTENTE
+    modelo = _ConfirmacaoComFalha(poo._ModeloParticionado(poo.Dinheiro(500), 3), falha)
+    with LivroRazaoParticionado(modelo, 2) as livro:
+        livro.abrir_contas([0, 1])
+        livro.processar([(0, poo.Deposito(100))])
+        if erro:
+            with pytest.raises(RuntimeError):
+                livro.transferir(0, 1, 30)
+        else:
+            assert livro.transferir(0, 1, 30) == poo.ResultadoOperacao.CONTA_INEXISTENTE
+        assert livro.saldos() == {0: poo.Dinheiro(100), 1: poo.Dinheiro(0)}
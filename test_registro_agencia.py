@@ -0,0 +1,48 @@
+"""
+Testes do RegistroAgencia: contas indexadas pelo número, sem repetição,
+com listagem por intervalo e por prefixo ("Projeto sistema bancario dio-01.py").
+
+Uso: python -m pytest test_registro_agencia.py
+"""
+import pytest
+
+
+@pytest.fixture
+def registro(dio01):
+    return dio01.RegistroAgencia(
+        dio01.ContaBancaria(numero, f"Titular {numero}") for numero in ("105", "2", "10", "100", "11", "1")
+    )
+
+
+def _numeros(contas) -> list:
+    return [conta.numero_conta for conta in contas]
+
+
+def test_busca_pelo_numero(dio01, registro):
+    assert len(registro) == 6
+    assert "100" in registro and "3" not in registro
+    assert registro.encontrar("11").titular == "Titular 11"
+    assert registro.encontrar("3") is None
+    assert dio01.encontrar_conta(registro, "2") is registro.encontrar("2")
+
+
+def test_numero_repetido_e_recusado(dio01, registro):
+    with pytest.raises(ValueError):
+        registro.adicionar(dio01.ContaBancaria("10", "Outro titular"))
+    assert len(registro) == 6
+    assert registro.encontrar("10").titular == "Titular 10"
+    with pytest.raises(ValueError):
+        dio01.RegistroAgencia([dio01.ContaBancaria("7", "A"), dio01.ContaBancaria("7", "B")])
+
+
+def test_listagens_em_ordem(dio01, registro):
+    assert _numeros(registro) == ["1", "10", "100", "105", "11", "2"]
+    assert _numeros(registro.listar_intervalo("10", "11")) == ["10", "100", "105"]
+    assert _numeros(registro.listar_intervalo(fim="10")) == ["1"]
+    assert _numeros(registro.listar_prefixo("10")) == ["10", "100", "105"]
+    assert _numeros(registro.listar_prefixo("3")) == []
+    assert _numeros(registro.listar_prefixo("")) == _numeros(registro)
+
+    # Uma conta nova fora de ordem entra no lugar certo na próxima listagem
+    registro.adicionar(dio01.ContaBancaria("0", "Titular 0"))
+    assert _numeros(registro.listar_intervalo(fim="10")) == ["0", "1"]
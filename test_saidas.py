@@ -0,0 +1,80 @@
+"""
+Testes das saídas de eventos das contas (SaidaConsole, SaidaBuffer e
+SaidaNula) do modelo ("Modelando o sistema bancario em poo com python.py").
+
+Uso: python -m pytest test_saidas.py
+"""
+from contextlib import redirect_stdout
+from io import StringIO
+
+import pytest
+
+
+class _SaidaColetora:
+    """Guarda os eventos recebidos, para conferir o que as contas emitem."""
+    def __init__(self):
+        self.eventos = []
+
+    def emitir(self, conta, tipo, resultado, valor):
+        self.eventos.append((conta.numero, tipo, resultado, valor))
+
+
+@pytest.fixture
+def conta(poo, cliente):
+    return poo.ContaCorrente(1, cliente, limite=100, limite_saques=1)
+
+
+def test_contas_emitem_resultados_estruturados(poo, conta):
+    conta.saida = coletora = _SaidaColetora()
+    assert conta.depositar(200)
+    assert not conta.depositar(-1)
+    assert not conta.sacar(150)
+    assert conta.sacar(50)
+    assert not conta.sacar(10)
+    assert not conta.sacar(1_000)
+    T, R = poo.TipoTransacao, poo.ResultadoOperacao
+    assert [(tipo, resultado) for _, tipo, resultado, _ in coletora.eventos] == [
+        (T.DEPOSITO, R.SUCESSO),
+        (T.DEPOSITO, R.VALOR_INVALIDO),
+        (T.SAQUE, R.LIMITE_EXCEDIDO),
+        (T.SAQUE, R.SUCESSO),
+        (T.SAQUE, R.SAQUES_EXCEDIDOS),
+        (T.SAQUE, R.LIMITE_EXCEDIDO),
+    ]
+    assert coletora.eventos[3][3] == poo.Dinheiro(50)
+
+
+def test_console_mantem_as_mensagens(poo, conta):
+    conta.saida = poo.SaidaConsole()
+    saida = StringIO()
+    with redirect_stdout(saida):
+        conta.depositar(10)
+        conta.sacar(500)
+        conta.sacar(50)
+    assert saida.getvalue() == (
+        "\n✅ Depósito realizado com sucesso! ✅\n"
+        "\n❌ Operação falhou! O valor do saque (R$ 500.00) excede o limite de R$ 100.00. ❌\n"
+        "\n❌ Operação falhou! Saldo insuficiente. ❌\n"
+    )
+
+
+def test_buffer_escreve_em_bloco(poo, conta):
+    arquivo = StringIO()
+    conta.saida = poo.SaidaBuffer(arquivo, capacidade=3)
+    conta.depositar(10)
+    conta.depositar(10)
+    assert arquivo.getvalue() == ""
+    conta.depositar(10)
+    assert arquivo.getvalue().count("Depósito realizado com sucesso") == 3
+    conta.sacar(500)
+    conta.saida.descarregar()
+    assert "excede o limite" in arquivo.getvalue()
+
+
+def test_saida_nula_nao_escreve_nada(poo, conta):
+    conta.saida = poo.SaidaNula()
+    saida = StringIO()
+    with redirect_stdout(saida):
+        assert conta.depositar(10)
+        assert not conta.sacar(500)
+    assert saida.getvalue() == ""
@@ -0,0 +1,91 @@
+"""
+Testes do serviço assíncrono (servico.py) sobre o modelo de contas
+("Modelando o sistema bancario em poo com python.py").
+
+Uso: python -m pytest test_servico.py
+"""
+import asyncio
+from io import StringIO
+
+import pytest
+
+
+def test_operacoes_devolvem_os_resultados(poo, cliente):
+    async def cenario():
+        banco = poo.novo_servico(limite=500, limite_saques=2)
+        numero = await banco.abrir_conta(cliente)
+        resultados = [
+            await banco.depositar(numero, 1_000),
+            await banco.sacar(numero, 600),
+            await banco.sacar(numero, 100),
+            await banco.sacar(numero, 100),
+            await banco.sacar(numero, 100),
+            await banco.depositar(numero, -1),
+            await banco.sacar(99, 10),
+        ]
+        return resultados, await banco.extrato(numero)
+
+    resultados, extrato = asyncio.run(cenario())
+    assert resultados == [
+        poo.ResultadoOperacao.SUCESSO,
+        poo.ResultadoOperacao.LIMITE_EXCEDIDO,
+        poo.ResultadoOperacao.SUCESSO,
+        poo.ResultadoOperacao.SUCESSO,
+        poo.ResultadoOperacao.SAQUES_EXCEDIDOS,
+        poo.ResultadoOperacao.VALOR_INVALIDO,
+        poo.ResultadoOperacao.CONTA_INEXISTENTE,
+    ]
+    assert extrato["saldo"] == poo.Dinheiro(800)
+    assert len(extrato["transacoes"]) == 3
+
+
+def test_transferencias_concorrentes_preservam_o_total(poo, cliente):
+    async def cenario():
+        banco = poo.novo_servico(limite_saques=10**9)
+        numeros = [await banco.abrir_conta(cliente) for _ in range(4)]
+        await asyncio.gather(*(banco.depositar(numero, 100) for numero in numeros))
+        await asyncio.gather(*(
+            banco.transferir(numeros[i % 4], numeros[(i + 1) % 4], 7) for i in range(200)
+        ))
+        await banco.encerrar()
+        return [(await banco.extrato(numero))["saldo"] for numero in numeros]
+
+    saldos = asyncio.run(cenario())
+    assert sum(saldos, poo.Dinheiro()) == poo.Dinheiro(400)
+    assert all(saldo >= 0 for saldo in saldos)
+
+
+def test_transferencia_para_conta_inexistente(poo, cliente):
+    async def cenario():
+        banco = poo.novo_servico()
+        numero = await banco.abrir_conta(cliente)
+        await banco.depositar(numero, 50)
+        return await banco.transferir(numero, 99, 10), await banco.extrato(numero)
+
+    resultado, extrato = asyncio.run(cenario())
+    assert resultado == poo.ResultadoOperacao.CONTA_INEXISTENTE
+    assert extrato["saldo"] == poo.Dinheiro(50)
+
+
+def test_numero_repetido(poo, cliente):
+    async def cenario():
+        banco = poo.novo_servico()
+        await banco.abrir_conta(cliente, 5)
+        await banco.abrir_conta(cliente, 5)
+
+    with pytest.raises(ValueError):
+        asyncio.run(cenario())
+
+
+def test_eventos_seguem_para_a_saida_escolhida(poo, cliente):
+    arquivo = StringIO()
+    saida = poo.SaidaBuffer(arquivo)
+
+    async def cenario():
+        banco = poo.novo_servico(saida=saida)
+        numero = await banco.abrir_conta(cliente)
+        await banco.depositar(numero, 10)
+
+    asyncio.run(cenario())
+    saida.descarregar()
+    assert "Depósito realizado com sucesso" in arquivo.getvalue()
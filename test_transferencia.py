@@ -0,0 +1,88 @@
+"""
+Testes da Transferencia entre contas: atômica, com lançamentos ligados nos
+dois históricos e sem impasse entre transferências cruzadas
+("Modelando o sistema bancario em poo com python.py").
+
+Uso: python -m pytest test_transferencia.py
+"""
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+
+class _SaidaColetora:
+    """Guarda o resultado de cada evento recebido."""
+    def __init__(self):
+        self.resultados = []
+
+    def emitir(self, conta, tipo, resultado, valor):
+        self.resultados.append(resultado)
+
+
+@pytest.fixture
+def contas(poo, cliente):
+    contas = [poo.ContaCorrente(numero, cliente, limite=50, limite_saques=1) for numero in range(3)]
+    for conta in contas:
+        conta.saida = poo.SaidaNula()
+        conta.depositar(100)
+    return contas
+
+
+def test_debita_e_credita_com_lancamentos_ligados(poo, cliente, contas):
+    origem, destino, _ = contas
+    transferencia = poo.Transferencia(80, destino)
+    cliente.realizar_transacao(origem, transferencia)
+
+    assert (origem.saldo, destino.saldo) == (poo.Dinheiro(20), poo.Dinheiro(180))
+    enviada, recebida = origem.historico.transacoes[-1], destino.historico.transacoes[-1]
+    assert enviada["tipo"] == poo.TipoTransacao.TRANSFERENCIA_ENVIADA.value
+    assert recebida["tipo"] == poo.TipoTransacao.TRANSFERENCIA_RECEBIDA.value
+    assert enviada["transferencia"] == recebida["transferencia"] == transferencia.id
+    # Só as regras da Conta: acima do limite por saque e sem contar como saque do dia
+    assert origem.historico.contagem_do_dia(poo.TipoTransacao.SAQUE) == 0
+    assert poo.Transferencia(1, destino).id == transferencia.id + 1
+
+
+@pytest.mark.parametrize("valor, esperado", [(500, "SALDO_INSUFICIENTE"), (0, "VALOR_INVALIDO")])
+def test_recusada_nao_muda_nenhuma_conta(poo, contas, valor, esperado):
+    origem, destino, _ = contas
+    origem.saida = coletora = _SaidaColetora()
+    poo.Transferencia(valor, destino).registrar(origem)
+    assert coletora.resultados == [poo.ResultadoOperacao[esperado]]
+    assert (origem.saldo, destino.saldo) == (poo.Dinheiro(100), poo.Dinheiro(100))
+    assert len(origem.historico.transacoes) == len(destino.historico.transacoes) == 1
+
+
+def test_para_a_propria_conta_e_invalida(poo, contas):
+    conta = contas[0]
+    poo.Transferencia(10, conta).registrar(conta)
+    assert conta.saldo == poo.Dinheiro(100)
+    assert len(conta.historico.transacoes) == 1
+
+
+def test_cruzadas_sem_impasse_e_sem_perder_dinheiro(poo, contas):
+    intervalo = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        def trabalhar(semente):
+            for i in range(400):
+                origem = contas[(semente + i) % 3]
+                destino = contas[(semente + 2 * i + 1) % 3]
+                if origem is not destino:
+                    poo.Transferencia(7, destino).registrar(origem)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futuros = [executor.submit(trabalhar, semente) for semente in range(8)]
+            for futuro in futuros:
+                futuro.result(timeout=60)  # um impasse estouraria o tempo
+    finally:
+        sys.setswitchinterval(intervalo)
+    assert sum((conta.saldo for conta in contas), poo.Dinheiro()) == poo.Dinheiro(300)
+    assert all(conta.saldo >= 0 for conta in contas)
+
+
+def test_ordem_de_travamento_global(poo, contas):
+    primeira, segunda, _ = contas
+    ordem = sorted((segunda, primeira), key=poo._ordem_travamento)
+    assert ordem == sorted((primeira, segunda), key=poo._ordem_travamento) == [primeira, segunda]